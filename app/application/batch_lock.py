@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+
+
+class BatchLock:
+    """
+    Reentrant lock an OrderService batch holds while it runs.
+
+    Besides `acquire`/`release` (and the context manager), the holder can call `yield_to_waiters`
+    between two commits of a long batch: every thread already waiting for the lock then gets it,
+    one at a time, before the holder takes it back at the same reentrancy depth. A large batch
+    committed in chunks therefore delays a small one by one chunk, not by the whole batch.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._owner: int | None = None
+        self._depth = 0
+        self._waiting = 0
+        # Times the lock went to a thread that had to wait for it.
+        self._handovers = 0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        me = threading.get_ident()
+        with self._cond:
+            if self._owner == me:
+                self._depth += 1
+                return True
+            if self._owner is not None:
+                if not blocking:
+                    return False
+                self._waiting += 1
+                try:
+                    if not self._cond.wait_for(lambda: self._owner is None, None if timeout < 0 else timeout):
+                        return False
+                finally:
+                    self._waiting -= 1
+                self._handovers += 1
+            self._owner, self._depth = me, 1
+            return True
+
+    def release(self) -> None:
+        with self._cond:
+            if self._owner != threading.get_ident():
+                raise RuntimeError("cannot release un-acquired lock")
+            self._depth -= 1
+            if self._depth == 0:
+                self._owner = None
+                self._cond.notify_all()
+
+    def yield_to_waiters(self) -> None:
+        """Let the threads waiting for the lock right now run first; the caller must hold the lock."""
+        with self._cond:
+            if self._owner != threading.get_ident():
+                raise RuntimeError("cannot yield un-acquired lock")
+            if not self._waiting:
+                return
+            depth, served = self._depth, self._handovers + self._waiting
+            self._owner, self._depth = None, 0
+            self._cond.notify_all()
+            # Waiters that give up (timeout) leave early, so stop when nobody is left either.
+            self._cond.wait_for(lambda: self._owner is None and (self._handovers >= served or not self._waiting))
+            self._owner, self._depth = threading.get_ident(), depth
+
+    def __enter__(self) -> BatchLock:
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.release()
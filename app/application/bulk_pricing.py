@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from app.domain.money import Money
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# Below this many amounts, converting to and from an array costs more than it saves.
+NUMPY_MIN_AMOUNTS = 64
+_INT64_MAX = 2**63 - 1
+
+
+def scale_half_even(cents: Sequence[int], numerator: int, denominator: int) -> list[int]:
+    """
+    Money.scale over a whole sequence: multiply every amount by numerator/denominator and round
+    half to even on the cent.
+
+    With NumPy installed the amounts are scaled in one vectorized pass over int64 arrays, using the
+    same floor division and tie rule as Money.scale; without it, or when a product would not fit in
+    int64, every amount goes through Money.scale. Both give the same result.
+
+    Args:
+        cents: Amounts in integer cents.
+        numerator: Positive rate numerator (e.g. 116 for +16%).
+        denominator: Positive rate denominator (e.g. 100).
+
+    Returns:
+        list[int]: The scaled amounts in cents, in the same order.
+    """
+    if np is None or len(cents) < NUMPY_MIN_AMOUNTS:
+        return [int(Money(amount).scale(numerator, denominator)) for amount in cents]
+    bound = _INT64_MAX // numerator
+    if max(cents) > bound or min(cents) < -bound:
+        return [int(Money(amount).scale(numerator, denominator)) for amount in cents]
+    quotient, remainder = np.divmod(np.asarray(cents, dtype=np.int64) * numerator, denominator)
+    twice = 2 * remainder
+    quotient += (twice > denominator) | ((twice == denominator) & (quotient % 2 == 1))
+    return quotient.tolist()
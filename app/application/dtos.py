@@ -1,12 +1,83 @@
 from datetime import datetime
+from typing import NamedTuple
 
 from pydantic import BaseModel
 
+from app.domain.entities import Event, RepairOrder
+
 
 class CommandDTO(BaseModel):
     op: str
     ts: datetime
     data: dict
+    # Client-chosen key that makes retries of the command return its original result.
+    idempotency_key: str | None = None
+
+
+class Command:
+    """
+    Lightweight command used by the fast decoding path.
+
+    Same attributes as CommandDTO, but no validation on construction: callers pass an already
+    parsed `ts` (see json_controller.decode_commands).
+    """
+
+    __slots__ = ("op", "ts", "data", "idempotency_key")
+
+    def __init__(self, op: str, ts: datetime, data: dict, idempotency_key: str | None = None) -> None:
+        self.op = op
+        self.ts = ts
+        self.data = data
+        self.idempotency_key = idempotency_key
+
+
+class ErrorView:
+    """Error produced by a handler; converted to ErrorViewDTO or a plain dict at the edges."""
+
+    __slots__ = ("op", "order_id", "code", "message")
+
+    def __init__(self, op: str, order_id: str, code: str, message: str) -> None:
+        self.op = op
+        self.order_id = order_id
+        self.code = code
+        self.message = message
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ErrorView):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"ErrorView(op={self.op!r}, order_id={self.order_id!r}, code={self.code!r}, message={self.message!r})"
+
+    def to_dict(self) -> dict:
+        return {"op": self.op, "order_id": self.order_id, "code": self.code, "message": self.message}
+
+
+class RejectedCommand:
+    """
+    A command that failed validation (see validate_commands). It keeps its place in the batch, and
+    the service reports its `error` when its turn comes, unless the handler's order checks (missing
+    or cancelled order) report something first. It carries no idempotency key, so a corrected retry
+    under the same key still runs.
+    """
+
+    __slots__ = ("op", "ts", "data", "idempotency_key", "error")
+
+    def __init__(self, op: str, ts: datetime | None, error: ErrorView) -> None:
+        self.op = op
+        self.ts = ts
+        self.data = {"order_id": error.order_id}
+        self.idempotency_key = None
+        self.error = error
+
+
+class BatchResult(NamedTuple):
+    """Domain-level outcome of a batch: touched orders, their events and the errors raised."""
+
+    orders: list[RepairOrder]
+    events: list[Event]
+    errors: list[ErrorView]
 
 
 class OrderViewDTO(BaseModel):
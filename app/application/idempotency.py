@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+from app.application.dtos import Command, CommandDTO, ErrorView
+from app.domain.errors import ErrorCode
+
+# (op, order_id, errors) of a command that ran under an idempotency key.
+CommandRecord = tuple[str, str, list[ErrorView]]
+
+
+class IdempotencyKeyReusedError(ValueError):
+    """A batch idempotency key was sent again with a different batch."""
+
+    def __init__(self, key: str) -> None:
+        super().__init__(f"La clave de idempotencia '{key}' ya se usó con otro lote.")
+        self.key = key
+
+
+def batch_fingerprint(payload: dict) -> str:
+    """Digest of a batch payload, recorded with its idempotency key to tell retries from reuse."""
+    canonical = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Results recorded under client-supplied idempotency keys, bounded by age and by size.
+
+    Every entry expires `ttl_seconds` after it was recorded and has a weight (the number of items
+    it holds); once the total weight exceeds `max_items` the oldest entries are dropped. Since all
+    entries live equally long, recording order is also expiry order, so both bounds evict from the
+    front of a single ordered dict and lookups and records stay O(1).
+    """
+
+    def __init__(
+        self, ttl_seconds: float = 86400, max_items: int = 100_000, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max_items = max_items
+        self._clock = clock
+        # key -> (expires at, weight, value)
+        self._entries: OrderedDict[Hashable, tuple[float, int, object]] = OrderedDict()
+        self._items = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> object | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= self._clock():
+                self._evict()
+                return None
+            return entry[2]
+
+    def put(self, key: Hashable, value: object, weight: int = 1) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._items -= old[1]
+            self._entries[key] = (self._clock() + self._ttl, weight, value)
+            self._items += weight
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = self._entries
+        now = self._clock()
+        while entries:
+            key, (expires_at, weight, _) = next(iter(entries.items()))
+            if expires_at > now and self._items <= self._max_items:
+                break
+            del entries[key]
+            self._items -= weight
+
+
+class KeyedCommands:
+    """
+    Idempotency bookkeeping of one batch.
+
+    Commands that carry an `idempotency_key` already recorded (in the store or earlier in the same
+    batch) are replayed: their original errors are reported and their handler is not run. The keys
+    of the commands that do run are kept pending and reach the store only on `commit()`, so a batch
+    that is rolled back can be retried as a whole.
+    """
+
+    def __init__(self, store: IdempotencyStore) -> None:
+        self._store = store
+        self._pending: dict[str, CommandRecord] = {}
+
+    def replay(self, cmd: Command | CommandDTO, order_id: str) -> list[ErrorView] | None:
+        """
+        Returns:
+            list[ErrorView] | None: The errors to report instead of running the command, or None
+                when it has to run.
+        """
+        key = cmd.idempotency_key
+        if key is None:
+            return None
+        record = self._pending.get(key)
+        if record is None:
+            record = self._store.get(("command", key))
+            if record is None:
+                return None
+        op, recorded_order_id, errors = record
+        if op != cmd.op or recorded_order_id != order_id:
+            return [
+                ErrorView(
+                    op=cmd.op,
+                    order_id=order_id,
+                    code=ErrorCode.INVALID_OPERATION.value,
+                    message=f"La clave de idempotencia '{key}' ya se usó en otro comando.",
+                )
+            ]
+        return errors
+
+    def ran(self, cmd: Command | CommandDTO, order_id: str, errors: list[ErrorView]) -> None:
+        if cmd.idempotency_key is not None:
+            self._pending[cmd.idempotency_key] = (cmd.op, order_id, errors)
+
+    def commit(self) -> None:
+        for key, record in self._pending.items():
+            self._store.put(("command", key), record, weight=1 + len(record[2]))
+        self._pending.clear()
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from collections.abc import Iterable
+
+from app.application.dtos import CommandDTO, ErrorView, RejectedCommand
+from app.application.use_cases.base import CommandHandler
+from app.domain.entities import Event, RepairOrder
+from app.domain.ports import EventRepositoryPort, OrderRepositoryPort
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit.
+DEFAULT_BUCKETS: tuple[float, ...] = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, buckets: int) -> None:
+        self.counts = [0] * (buckets + 1)
+        self.total = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    """
+    Collects handler, error and repository metrics and renders them in Prometheus text format.
+
+    OrderService only touches the registry when one is passed in: without it neither handlers nor
+    repositories are wrapped, so disabled instrumentation costs nothing on the hot path.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._commands: dict[str, Histogram] = {}
+        self._errors: dict[str, int] = {}
+        self._repository_calls: dict[tuple[str, str], Histogram] = {}
+
+    def observe_command(self, op: str, seconds: float) -> None:
+        self._observe(self._commands, op, seconds)
+
+    def observe_repository_call(self, repository: str, method: str, seconds: float) -> None:
+        self._observe(self._repository_calls, (repository, method), seconds)
+
+    def count_errors(self, errors: Iterable[ErrorView]) -> None:
+        with self._lock:
+            for error in errors:
+                self._errors[error.code] = self._errors.get(error.code, 0) + 1
+
+    def _observe(self, histograms: dict, key, seconds: float) -> None:
+        with self._lock:
+            histogram = histograms.get(key)
+            if histogram is None:
+                histogram = histograms[key] = Histogram(len(self._buckets))
+            histogram.counts[bisect.bisect_left(self._buckets, seconds)] += 1
+            histogram.total += seconds
+            histogram.count += 1
+
+    def render_prometheus(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            lines += [
+                "# HELP repair_orders_commands_total Commands dispatched, by op.",
+                "# TYPE repair_orders_commands_total counter",
+            ]
+            for op, histogram in sorted(self._commands.items()):
+                lines.append(f'repair_orders_commands_total{{op="{op}"}} {histogram.count}')
+            lines += [
+                "# HELP repair_orders_command_duration_seconds Handler latency, by op.",
+                "# TYPE repair_orders_command_duration_seconds histogram",
+            ]
+            for op, histogram in sorted(self._commands.items()):
+                lines += self._histogram_lines("repair_orders_command_duration_seconds", f'op="{op}"', histogram)
+
+            lines += [
+                "# HELP repair_orders_errors_total Errors reported to clients, by code.",
+                "# TYPE repair_orders_errors_total counter",
+            ]
+            lines += [f'repair_orders_errors_total{{code="{code}"}} {n}' for code, n in sorted(self._errors.items())]
+
+            lines += [
+                "# HELP repair_orders_repository_calls_total Repository calls, by repository and method.",
+                "# TYPE repair_orders_repository_calls_total counter",
+            ]
+            for (repository, method), histogram in sorted(self._repository_calls.items()):
+                labels = f'repository="{repository}",method="{method}"'
+                lines.append(f"repair_orders_repository_calls_total{{{labels}}} {histogram.count}")
+            lines += [
+                "# HELP repair_orders_repository_duration_seconds Repository call latency.",
+                "# TYPE repair_orders_repository_duration_seconds histogram",
+            ]
+            for (repository, method), histogram in sorted(self._repository_calls.items()):
+                labels = f'repository="{repository}",method="{method}"'
+                lines += self._histogram_lines("repair_orders_repository_duration_seconds", labels, histogram)
+        return "\n".join(lines) + "\n"
+
+    def _histogram_lines(self, name: str, labels: str, histogram: Histogram) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self._buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.total}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return lines
+
+
+class InstrumentedHandler:
+    __slots__ = ("_handler", "_op", "_metrics")
+
+    def __init__(self, handler: CommandHandler, op: str, metrics: MetricsRegistry) -> None:
+        self._handler = handler
+        self._op = op
+        self._metrics = metrics
+
+    def handle(self, cmd: CommandDTO, errors: list[ErrorView]) -> None:
+        started = time.perf_counter()
+        try:
+            self._handler.handle(cmd, errors)
+        finally:
+            self._metrics.observe_command(self._op, time.perf_counter() - started)
+
+    def reject(self, cmd: RejectedCommand, errors: list[ErrorView]) -> None:
+        self._handler.reject(cmd, errors)
+
+
+class InstrumentedOrderRepository(OrderRepositoryPort):
+    def __init__(self, inner: OrderRepositoryPort, metrics: MetricsRegistry) -> None:
+        self._inner = inner
+        self._metrics = metrics
+
+    def get_by_id(self, order_id: str) -> RepairOrder | None:
+        started = time.perf_counter()
+        try:
+            return self._inner.get_by_id(order_id)
+        finally:
+            self._metrics.observe_repository_call("orders", "get_by_id", time.perf_counter() - started)
+
+    def save(self, order: RepairOrder) -> RepairOrder:
+        started = time.perf_counter()
+        try:
+            return self._inner.save(order)
+        finally:
+            self._metrics.observe_repository_call("orders", "save", time.perf_counter() - started)
+
+
+class InstrumentedEventRepository(EventRepositoryPort):
+    def __init__(self, inner: EventRepositoryPort, metrics: MetricsRegistry) -> None:
+        self._inner = inner
+        self._metrics = metrics
+
+    def append(self, event: Event) -> None:
+        started = time.perf_counter()
+        try:
+            self._inner.append(event)
+        finally:
+            self._metrics.observe_repository_call("events", "append", time.perf_counter() - started)
+
+    def get_by_order_id(self, order_id: str) -> list[Event]:
+        started = time.perf_counter()
+        try:
+            return self._inner.get_by_order_id(order_id)
+        finally:
+            self._metrics.observe_repository_call("events", "get_by_order_id", time.perf_counter() - started)
+
+    def get_by_order_ids(self, order_ids: Iterable[str]) -> list[Event]:
+        started = time.perf_counter()
+        try:
+            return self._inner.get_by_order_ids(order_ids)
+        finally:
+            self._metrics.observe_repository_call("events", "get_by_order_ids", time.perf_counter() - started)
+
+    def get_all(self) -> list[Event]:
+        started = time.perf_counter()
+        try:
+            return self._inner.get_all()
+        finally:
+            self._metrics.observe_repository_call("events", "get_all", time.perf_counter() - started)
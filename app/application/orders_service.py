@@ -1,6 +1,34 @@
 from __future__ import annotations
 
-from app.application.dtos import CommandDTO, ErrorViewDTO, EventViewDTO, OrderViewDTO, ResultDTO
+import heapq
+import time
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import TypeVar
+from concurrent.futures import ThreadPoolExecutor
+
+from app.application.batch_lock import BatchLock
+from app.application.dtos import (
+    BatchResult,
+    Command,
+    CommandDTO,
+    ErrorView,
+    ErrorViewDTO,
+    EventViewDTO,
+    OrderViewDTO,
+    RejectedCommand,
+    ResultDTO,
+)
+from app.application.idempotency import IdempotencyKeyReusedError, IdempotencyStore, KeyedCommands
+from app.application.instrumentation import (
+    InstrumentedEventRepository,
+    InstrumentedHandler,
+    InstrumentedOrderRepository,
+    MetricsRegistry,
+)
+from app.application.unit_of_work import UnitOfWork
+from app.application.view_cache import ViewCache
+from app.application.use_cases.base import CommandHandler
 from app.application.use_cases.create_order import CreateOrderHandler
 from app.application.use_cases.add_service import AddServiceHandler
 from app.application.use_cases.set_state_diagnosed import SetStateDiagnosedHandler
@@ -11,75 +39,554 @@ from app.application.use_cases.try_complete import TryCompleteHandler
 from app.application.use_cases.reauthorize import ReauthorizeHandler
 from app.application.use_cases.deliver import DeliverHandler
 from app.application.use_cases.cancel import CancelHandler
+from app.domain.entities import Event, OrderStatus, RepairOrder
 from app.domain.errors import ErrorCode
-from app.domain.ports import OrderRepositoryPort, EventRepositoryPort
+from app.domain.money import Money
+from app.domain.transitions import TRANSITION_RULES, TransitionTable
+from app.domain.ports import (
+    ChangeJournalPort,
+    EventRepositoryPort,
+    OrderQueryPort,
+    OrderRepositoryPort,
+    TransactionPort,
+)
+
+HANDLER_TYPES: dict[str, type[CommandHandler]] = {
+    "CREATE_ORDER": CreateOrderHandler,
+    "ADD_SERVICE": AddServiceHandler,
+    "SET_STATE_DIAGNOSED": SetStateDiagnosedHandler,
+    "AUTHORIZE": AuthorizeHandler,
+    "SET_STATE_IN_PROGRESS": SetStateInProgressHandler,
+    "SET_REAL_COST": SetRealCostHandler,
+    "TRY_COMPLETE": TryCompleteHandler,
+    "REAUTHORIZE": ReauthorizeHandler,
+    "DELIVER": DeliverHandler,
+    "CANCEL": CancelHandler,
+}
+
+# (position in the batch, errors raised by that command, events it appended)
+CommandOutcome = tuple[int, list[ErrorView], list[Event]]
+
+T = TypeVar("T")
+
+
+class BatchDeadlineExceeded(TimeoutError):
+    """The batch ran past its deadline; nothing since the last commit or checkpoint was kept."""
 
 
 class OrderService:
-    def __init__(self, orders_repo: OrderRepositoryPort, events_repo: EventRepositoryPort) -> None:
+    def __init__(
+        self,
+        orders_repo: OrderRepositoryPort,
+        events_repo: EventRepositoryPort,
+        transaction: TransactionPort | None = None,
+        checkpoint_every: int | None = None,
+        workers: int | None = None,
+        instrumentation: MetricsRegistry | None = None,
+        journal: ChangeJournalPort | None = None,
+        view_cache: ViewCache | None = None,
+        idempotency: IdempotencyStore | None = None,
+    ) -> None:
+        """
+        Args:
+            orders_repo: Order repository the batches are committed to.
+            events_repo: Event repository the batches are committed to.
+            transaction: Optional transaction wrapping each commit.
+            checkpoint_every: Commit every N commands instead of once per batch; a failure then only
+                rolls back the commands since the last checkpoint. Between two chunks the batch lock
+                goes to the batches waiting for it, so they are not held up by the whole batch.
+                Ignored in parallel mode.
+            workers: When greater than 1, each batch is split by order_id and the orders are
+                processed on a pool of that many threads (see `_dispatch_parallel`).
+            instrumentation: Registry that receives handler timings, error codes and repository
+                call timings. When None nothing is wrapped.
+            journal: Change journal every commit is recorded in before reaching the repositories.
+            view_cache: Cache the drivers render this service's committed orders and events through.
+            idempotency: Store of the results recorded under idempotency keys; when None, the keys of
+                commands and batches are ignored.
+        """
+        # Queries go straight to the repository: the instrumentation only wraps the write side.
+        self._query_repo = orders_repo if isinstance(orders_repo, OrderQueryPort) else None
+        if instrumentation is not None:
+            orders_repo = InstrumentedOrderRepository(orders_repo, instrumentation)
+            events_repo = InstrumentedEventRepository(events_repo, instrumentation)
+        self._instrumentation = instrumentation
+        self._view_cache = view_cache
+        self._idempotency = idempotency
         self._orders_repo = orders_repo
         self._events_repo = events_repo
+        self._uow = UnitOfWork(orders_repo, events_repo, transaction, journal)
+        self._checkpoint_every = checkpoint_every
+        self._workers = workers
+        # Handlers read, mutate and save orders in separate steps, so a shared service runs one
+        # batch (or one checkpointed chunk of a batch) at a time.
+        self._lock = BatchLock()
 
-        self._handlers: dict = {
-            "CREATE_ORDER": CreateOrderHandler(orders_repo, events_repo),
-            "ADD_SERVICE": AddServiceHandler(orders_repo, events_repo),
-            "SET_STATE_DIAGNOSED": SetStateDiagnosedHandler(orders_repo, events_repo),
-            "AUTHORIZE": AuthorizeHandler(orders_repo, events_repo),
-            "SET_STATE_IN_PROGRESS": SetStateInProgressHandler(orders_repo, events_repo),
-            "SET_REAL_COST": SetRealCostHandler(orders_repo, events_repo),
-            "TRY_COMPLETE": TryCompleteHandler(orders_repo, events_repo),
-            "REAUTHORIZE": ReauthorizeHandler(orders_repo, events_repo),
-            "DELIVER": DeliverHandler(orders_repo, events_repo),
-            "CANCEL": CancelHandler(orders_repo, events_repo),
+        self._transitions = TransitionTable(TRANSITION_RULES)
+        self._handlers = self._build_handlers(self._uow)
+
+    def _build_handlers(self, uow: UnitOfWork, instrument: bool = True) -> dict[str, CommandHandler]:
+        handlers = {
+            op: handler_type(uow.orders, uow.events, self._transitions) for op, handler_type in HANDLER_TYPES.items()
         }
+        if instrument and self._instrumentation is not None:
+            handlers = {op: InstrumentedHandler(h, op, self._instrumentation) for op, h in handlers.items()}
+        return handlers
 
-    def execute(self, commands: list[CommandDTO]) -> ResultDTO:
+    def execute(self, commands: list[CommandDTO], dry_run: bool = False, deadline: float | None = None) -> ResultDTO:
         """
         Execute repair order commands and build a response view.
 
         Args:
             commands: Ordered list of command DTOs to be processed in sequence.
+            dry_run: Simulate the batch (see `simulate`) instead of committing it.
+            deadline: `time.monotonic()` value after which the batch is abandoned between two
+                commands, raising BatchDeadlineExceeded.
 
         Returns:
             ResultDTO: Response view with orders, events and errors.
         """
-        errors: list[ErrorViewDTO] = []
-        order_ids: set[str] = set()
-        for cmd in commands:
-            handler = self._handlers.get(cmd.op)
+        if dry_run:
+            orders, events, errors = self.simulate(commands, deadline)
+            return ResultDTO(
+                orders=[_order_view(order) for order in orders],
+                events=[_event_view(event) for event in events],
+                errors=[ErrorViewDTO(**error.to_dict()) for error in errors],
+            )
+        errors: list[ErrorView] = []
+        with self._lock:
+            order_ids = self.dispatch(commands, errors, deadline)
+            return ResultDTO(
+                orders=self.build_order_views(order_ids),
+                events=self.build_event_views(order_ids),
+                errors=[ErrorViewDTO(**error.to_dict()) for error in errors],
+            )
+
+    def execute_raw(
+        self,
+        commands: Iterable[CommandDTO],
+        dry_run: bool = False,
+        deadline: float | None = None,
+        errors: list[ErrorView] | None = None,
+        idempotency_key: str | None = None,
+        fingerprint: str | None = None,
+    ) -> BatchResult:
+        """
+        Execute commands like `execute`, but return domain objects instead of pydantic views.
+
+        The returned orders are committed snapshots: later batches work on copies, so they can be
+        serialized after the service lock has been released. Pass `errors` to watch the errors
+        while the batch runs; they are appended to it and it is returned in the result.
+
+        With an `idempotency_key` (and an idempotency store), the result of the first committed
+        batch with that key is recorded, along with the batch `fingerprint` (see batch_fingerprint),
+        and returned again, without running anything, to every later batch with the same key and
+        fingerprint.
+
+        Raises:
+            IdempotencyKeyReusedError: If the key was recorded for a batch with another fingerprint.
+        """
+        store = self._idempotency if idempotency_key is not None else None
+        with self._lock:
+            if store is not None:
+                recorded = store.get(("batch", idempotency_key))
+                if recorded is not None:
+                    recorded_fingerprint, recorded_result = recorded
+                    if recorded_fingerprint != fingerprint:
+                        raise IdempotencyKeyReusedError(idempotency_key)
+                    return recorded_result
+            if dry_run:
+                return self.simulate(commands, deadline)
+            if errors is None:
+                errors = []
+            order_ids = self.dispatch(commands, errors, deadline)
+            result = BatchResult(orders=self.load_orders(order_ids), events=self.load_events(order_ids), errors=errors)
+            if store is not None:
+                weight = 1 + len(result.orders) + len(result.events) + len(result.errors)
+                store.put(("batch", idempotency_key), (fingerprint, result), weight=weight)
+            return result
+
+    def simulate(self, commands: Iterable[CommandDTO], deadline: float | None = None) -> BatchResult:
+        """
+        Run a batch without committing anything and return what a real run would return.
+
+        The handlers work on a private unit of work, whose identity map and event buffer act as
+        copy-on-write overlays of the repositories: only the orders the batch touches are copied,
+        and everything is discarded at the end. Metrics, the transaction and the journal are not
+        involved.
+        """
+        errors: list[ErrorView] = []
+        order_ids: dict[str, None] = {}
+        uow = UnitOfWork(self._orders_repo, self._events_repo)
+        handlers = self._build_handlers(uow, instrument=False)
+        # Never committed: keys seen in the store or earlier in the batch are replayed, nothing is recorded.
+        keyed = KeyedCommands(self._idempotency) if self._idempotency is not None else None
+        with self._lock:
+            try:
+                for cmd in _until(commands, deadline):
+                    order_id: str = cmd.data.get("order_id", "")
+                    if order_id:
+                        order_ids[order_id] = None
+                    if keyed is not None and cmd.idempotency_key is not None:
+                        _run_keyed(handlers, cmd, order_id, errors, keyed)
+                    else:
+                        _run_command(handlers, cmd, order_id, errors)
+                orders = [uow.orders.get_by_id(order_id) for order_id in order_ids]
+                events = uow.events.get_by_order_ids(order_ids)
+            finally:
+                uow.rollback()
+        return BatchResult(orders=[order for order in orders if order], events=events, errors=errors)
+
+    def dispatch(
+        self, commands: Iterable[CommandDTO], errors: list[ErrorView], deadline: float | None = None
+    ) -> dict[str, None]:
+        """
+        Run commands through their handlers without building any view.
+
+        Args:
+            commands: Commands to be processed in sequence; may be any iterable, including a generator.
+            errors: List the handlers append their errors to.
+            deadline: See `execute`. Checked before every command; when it has passed, the
+                uncommitted work is rolled back and BatchDeadlineExceeded is raised.
+
+        Returns:
+            dict[str, None]: Ids of the orders referenced by the commands, in order of first appearance.
+        """
+        order_ids: dict[str, None] = {}
+        errors_before = len(errors)
+        commands = _until(commands, deadline)
+        keyed = KeyedCommands(self._idempotency) if self._idempotency is not None else None
+        with self._lock:
+            if self._workers and self._workers > 1:
+                self._dispatch_parallel(commands, errors, order_ids, self._workers, deadline, keyed)
+            else:
+                self._uow.begin()
+                try:
+                    self._run(commands, errors, order_ids, keyed)
+                except BaseException:
+                    self._uow.rollback()
+                    raise
+                self._uow.commit()
+            if keyed is not None:
+                keyed.commit()
+        if self._instrumentation is not None:
+            self._instrumentation.count_errors(errors[errors_before:])
+        return order_ids
+
+    @property
+    def view_cache(self) -> ViewCache | None:
+        return self._view_cache
+
+    def try_lock(self) -> bool:
+        """
+        Take the batch lock only if no other batch holds it; release it with `unlock()`.
+
+        The lock is reentrant, so a caller holding it can still call `execute_raw` and friends.
+        """
+        return self._lock.acquire(blocking=False)
+
+    def unlock(self) -> None:
+        self._lock.release()
+
+    def snapshot_due(self) -> bool:
+        """Whether the next commit also writes a snapshot of the whole store to the journal."""
+        return self._uow.snapshot_due()
+
+    def _run(
+        self,
+        commands: Iterable[CommandDTO],
+        errors: list[ErrorView],
+        order_ids: dict[str, None],
+        keyed: KeyedCommands | None = None,
+    ) -> None:
+        handlers = self._handlers
+        checkpoint_every = self._checkpoint_every
+        for position, cmd in enumerate(commands):
+            if checkpoint_every and position and position % checkpoint_every == 0:
+                self._uow.commit()
+                if keyed is not None:
+                    keyed.commit()
+                self._lock.yield_to_waiters()
+                self._uow.begin()
             order_id: str = cmd.data.get("order_id", "")
             if order_id:
-                order_ids.add(order_id)
-            if handler is None:
-                errors.append(
-                    ErrorViewDTO(
-                        op=cmd.op,
-                        order_id=order_id,
-                        code=ErrorCode.INVALID_OPERATION.value,
-                        message=f"Operación desconocida: {cmd.op}",
-                    )
-                )
-                continue
-
-            handler.handle(cmd, errors)
-        order_views: list[OrderViewDTO] = []
-        for order_id in order_ids:
-            order = self._orders_repo.get_by_id(order_id)
-            if not order:
-                continue
-            order_views.append(
-                OrderViewDTO(
-                    order_id=order.order_id,
-                    status=order.status.value,
-                    customer=order.customer,
-                    vehicle=order.vehicle,
-                    subtotal_estimated=order.subtotal_estimated,
-                    authorized_amount=order.authorized_amount,
-                    real_total=order.real_total,
-                )
+                order_ids[order_id] = None
+            if keyed is not None and cmd.idempotency_key is not None:
+                _run_keyed(handlers, cmd, order_id, errors, keyed)
+            else:
+                _run_command(handlers, cmd, order_id, errors)
+
+    def _dispatch_parallel(
+        self,
+        commands: Iterable[CommandDTO],
+        errors: list[ErrorView],
+        order_ids: dict[str, None],
+        workers: int,
+        deadline: float | None = None,
+        keyed: KeyedCommands | None = None,
+    ) -> None:
+        """
+        Run a batch with the orders spread over a thread pool.
+
+        Orders are assigned round-robin to `workers` partitions; each partition runs its commands in
+        batch order against its own unit of work, so no order is ever touched by two threads. Every
+        command's errors and events, and every staged order, are tagged with their batch position, and
+        the partitions are merged back by position before a single commit, which yields the same
+        errors, event order and stored state (creation order included) as a sequential run. If a
+        partition fails, nothing is committed and the failure of the earliest command is raised.
+
+        Commands replayed from their idempotency key never reach a partition: their recorded errors
+        are merged in at their position, and keys repeated within the batch are resolved once the
+        first command with the key has run.
+        """
+        partitions: list[list[tuple[int, CommandDTO]]] = [[] for _ in range(workers)]
+        partition_of_order: dict[str, int] = {}
+        replays: list[CommandOutcome] = []
+        first_of_key: dict[str, tuple[int, CommandDTO, str]] = {}
+        repeats: list[tuple[int, CommandDTO, str]] = []
+        for position, cmd in enumerate(commands):
+            order_id: str = cmd.data.get("order_id", "")
+            if order_id:
+                order_ids[order_id] = None
+            if keyed is not None and cmd.idempotency_key is not None:
+                if cmd.idempotency_key in first_of_key:
+                    repeats.append((position, cmd, order_id))
+                    continue
+                replayed = keyed.replay(cmd, order_id)
+                if replayed is not None:
+                    replays.append((position, replayed, []))
+                    continue
+                first_of_key[cmd.idempotency_key] = (position, cmd, order_id)
+            partition = partition_of_order.get(order_id)
+            if partition is None:
+                partition = partition_of_order[order_id] = len(partition_of_order) % workers
+            partitions[partition].append((position, cmd))
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            runs = list(pool.map(self._run_isolated_partition, [_until(p, deadline) for p in partitions if p]))
+
+        failures = [(failure[0], failure[1]) for _, _, failure in runs if failure is not None]
+        if failures:
+            raise min(failures, key=lambda f: f[0])[1]
+
+        if first_of_key:
+            errors_at = {position: cmd_errors for outcomes, _, _ in runs for position, cmd_errors, _ in outcomes}
+            for position, cmd, order_id in first_of_key.values():
+                keyed.ran(cmd, order_id, errors_at[position])
+            for position, cmd, order_id in repeats:
+                replays.append((position, keyed.replay(cmd, order_id), []))
+            replays.sort(key=lambda outcome: outcome[0])
+
+        self._uow.begin()
+        try:
+            # Orders are saved in the order a sequential run first staged them, so new orders get
+            # the same creation sequence whatever the number of workers.
+            for _, order in heapq.merge(*(staged for _, staged, _ in runs), key=lambda saved: saved[0]):
+                self._uow.orders.save(order)
+            for _, cmd_errors, cmd_events in heapq.merge(*(outcomes for outcomes, _, _ in runs), replays):
+                errors.extend(cmd_errors)
+                for event in cmd_events:
+                    self._uow.events.append(event)
+        except BaseException:
+            self._uow.rollback()
+            raise
+        self._uow.commit()
+
+    def authorize_many(self, order_ids: Iterable[str], ts: datetime, deadline: float | None = None) -> BatchResult:
+        """
+        Authorize many orders in one commit, with their amounts computed in one vectorized pass
+        (see AuthorizeHandler.handle_many).
+
+        The result is the one of a batch with an AUTHORIZE command per id, in the same order.
+
+        Args:
+            order_ids: Orders to authorize; repeated or unknown ids get the usual AUTHORIZE errors.
+            ts: Timestamp of the AUTHORIZE commands.
+            deadline: See `execute`. Checked before every order; when it has passed, nothing is committed.
+
+        Raises:
+            BatchDeadlineExceeded: If the deadline passed before every order was checked.
+        """
+        commands = [Command("AUTHORIZE", ts, {"order_id": order_id}) for order_id in order_ids]
+        touched = {cmd.data["order_id"]: None for cmd in commands if cmd.data["order_id"]}
+        errors: list[ErrorView] = []
+        with self._lock:
+            handler = AuthorizeHandler(self._uow.orders, self._uow.events, self._transitions)
+            self._uow.begin()
+            try:
+                handler.handle_many(_until(commands, deadline), errors)
+            except BaseException:
+                self._uow.rollback()
+                raise
+            self._uow.commit()
+            if self._instrumentation is not None:
+                self._instrumentation.count_errors(errors)
+            return BatchResult(orders=self.load_orders(touched), events=self.load_events(touched), errors=errors)
+
+    def execute_positioned(
+        self, commands: list[tuple[int, CommandDTO]]
+    ) -> tuple[list[CommandOutcome], tuple[int, BaseException] | None]:
+        """
+        Run commands that belong to a larger batch split elsewhere (e.g. across processes).
+
+        Args:
+            commands: (position in the original batch, command) pairs, in batch order.
+
+        Returns:
+            tuple: Errors and events of every command, tagged with its position, and the
+                (position, exception) of the failing command, if any. The commands are committed
+                only when nothing failed; otherwise they are rolled back.
+        """
+        with self._lock:
+            self._uow.begin()
+            outcomes, _, failure = self._run_partition(commands, self._uow, self._handlers)
+            if failure is not None:
+                self._uow.rollback()
+                return outcomes, failure
+            self._uow.commit()
+        return outcomes, None
+
+    def _run_isolated_partition(
+        self, commands: Iterable[tuple[int, CommandDTO]]
+    ) -> tuple[list[CommandOutcome], list[tuple[int, RepairOrder]], tuple[int, BaseException] | None]:
+        """
+        Returns:
+            tuple: The command outcomes, the staged orders tagged with the position of the command
+                that first saved them (in position order), and the failure, if any.
+        """
+        uow = UnitOfWork(self._orders_repo, self._events_repo)
+        staged_at: dict[str, int] = {}
+        outcomes, _, failure = self._run_partition(commands, uow, self._build_handlers(uow), staged_at)
+        return outcomes, [(staged_at[order.order_id], order) for order in uow.staged_orders()], failure
+
+    @staticmethod
+    def _run_partition(
+        commands: Iterable[tuple[int, CommandDTO]],
+        uow: UnitOfWork,
+        handlers: dict[str, CommandHandler],
+        staged_at: dict[str, int] | None = None,
+    ) -> tuple[list[CommandOutcome], UnitOfWork, tuple[int, BaseException] | None]:
+        # Handlers only save the order of their command, so staged_at gets, for every staged order,
+        # the position of the command that saved it first.
+        staged_events = uow.staged_events()
+        outcomes: list[CommandOutcome] = []
+        for position, cmd in commands:
+            cmd_errors: list[ErrorView] = []
+            events_before = len(staged_events)
+            order_id = cmd.data.get("order_id", "")
+            try:
+                _run_command(handlers, cmd, order_id, cmd_errors)
+            except Exception as exc:
+                return outcomes, uow, (position, exc)
+            outcomes.append((position, cmd_errors, staged_events[events_before:]))
+            if staged_at is not None and order_id not in staged_at and uow.is_staged(order_id):
+                staged_at[order_id] = position
+        return outcomes, uow, None
+
+    def load_orders(self, order_ids: Iterable[str]) -> list[RepairOrder]:
+        with self._lock:
+            orders = [self._orders_repo.get_by_id(order_id) for order_id in order_ids]
+        return [order for order in orders if order]
+
+    def load_events(self, order_ids: Iterable[str]) -> list[Event]:
+        with self._lock:
+            return self._events_repo.get_by_order_ids(order_ids)
+
+    def find_orders(
+        self,
+        status: OrderStatus | None = None,
+        customer: str | None = None,
+        vehicle: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+    ) -> tuple[list[RepairOrder], str | None]:
+        """
+        Committed orders matching every given filter, in creation order (see OrderQueryPort.find).
+
+        Raises:
+            NotImplementedError: If the order repository does not support queries.
+            ValueError: If the cursor is not valid.
+        """
+        if self._query_repo is None:
+            raise NotImplementedError("El repositorio de órdenes no admite consultas.")
+        with self._lock:
+            return self._query_repo.find(status, customer, vehicle, cursor, limit)
+
+    def build_order_views(self, order_ids: Iterable[str]) -> list[OrderViewDTO]:
+        return [_order_view(order) for order in self.load_orders(order_ids)]
+
+    def build_event_views(self, order_ids: Iterable[str]) -> list[EventViewDTO]:
+        return [_event_view(event) for event in self.load_events(order_ids)]
+
+
+def _until(items: Iterable[T], deadline: float | None) -> Iterable[T]:
+    if deadline is None:
+        return items
+    return _checking_deadline(items, deadline)
+
+
+def _checking_deadline(items: Iterable[T], deadline: float) -> Iterator[T]:
+    monotonic = time.monotonic
+    for item in items:
+        if monotonic() > deadline:
+            raise BatchDeadlineExceeded("Se superó el tiempo límite del lote.")
+        yield item
+
+
+def _run_command(handlers: dict[str, CommandHandler], cmd: CommandDTO, order_id: str, errors: list[ErrorView]) -> None:
+    handler = handlers.get(cmd.op)
+    if type(cmd) is RejectedCommand:
+        # Undecodable NDJSON lines may not even have a known op.
+        if handler is None:
+            errors.append(cmd.error)
+        else:
+            handler.reject(cmd, errors)
+        return
+    if handler is None:
+        errors.append(
+            ErrorView(
+                op=cmd.op,
+                order_id=order_id,
+                code=ErrorCode.INVALID_OPERATION.value,
+                message=f"Operación desconocida: {cmd.op}",
             )
-        event_views: list[EventViewDTO] = []
-        for event in self._events_repo.get_all():
-            if event.order_id in order_ids:
-                event_views.append(EventViewDTO(order_id=event.order_id, type=event.type.value))
-        return ResultDTO(orders=order_views, events=event_views, errors=errors)
+        )
+        return
+
+    handler.handle(cmd, errors)
+
+
+def _run_keyed(
+    handlers: dict[str, CommandHandler],
+    cmd: CommandDTO,
+    order_id: str,
+    errors: list[ErrorView],
+    keyed: KeyedCommands,
+) -> None:
+    replayed = keyed.replay(cmd, order_id)
+    if replayed is not None:
+        errors.extend(replayed)
+        return
+    errors_before = len(errors)
+    _run_command(handlers, cmd, order_id, errors)
+    keyed.ran(cmd, order_id, errors[errors_before:])
+
+
+def _order_view(order: RepairOrder) -> OrderViewDTO:
+    return OrderViewDTO(
+        order_id=order.order_id,
+        status=order.status.value,
+        customer=order.customer,
+        vehicle=order.vehicle,
+        subtotal_estimated=order.subtotal_estimated.to_float(),
+        authorized_amount=_amount_view(order.authorized_amount),
+        real_total=_amount_view(order.real_total),
+    )
+
+
+def _event_view(event: Event) -> EventViewDTO:
+    return EventViewDTO(order_id=event.order_id, type=event.type.value)
+
+
+def _amount_view(amount: Money | None) -> float | None:
+    return None if amount is None else amount.to_float()
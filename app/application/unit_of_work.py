@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Iterable
+
+from app.domain.entities import Event, RepairOrder
+from app.domain.ports import ChangeJournalPort, EventRepositoryPort, OrderRepositoryPort, TransactionPort
+
+
+class UnitOfWork:
+    """
+    Stages the changes of one OrderService batch in front of the repositories.
+
+    Orders are loaded once into an identity map (as private copies, so a rollback never leaves
+    half-applied mutations behind), `save()` only marks them dirty and appended events are buffered.
+    `commit()` bumps the version of every dirty order and writes it exactly once, then the new
+    events in append order, inside the optional transaction, after handing them to the optional
+    change journal.
+    """
+
+    def __init__(
+        self,
+        orders_repo: OrderRepositoryPort,
+        events_repo: EventRepositoryPort,
+        transaction: TransactionPort | None = None,
+        journal: ChangeJournalPort | None = None,
+    ) -> None:
+        self._orders_repo = orders_repo
+        self._events_repo = events_repo
+        self._transaction = transaction
+        self._journal = journal
+        self._identity_map: dict[str, RepairOrder | None] = {}
+        self._dirty: dict[str, RepairOrder] = {}
+        self._new_events: list[Event] = []
+
+        self.orders = TrackedOrderRepository(self)
+        self.events = TrackedEventRepository(self)
+
+    def begin(self) -> None:
+        if self._transaction is not None:
+            self._transaction.begin()
+
+    def commit(self) -> None:
+        try:
+            for order in self._dirty.values():
+                order.version += 1
+            if self._journal is not None and (self._dirty or self._new_events):
+                self._journal.record(list(self._dirty.values()), list(self._new_events))
+            for order in self._dirty.values():
+                self._orders_repo.save(order)
+            for event in self._new_events:
+                self._events_repo.append(event)
+        except BaseException:
+            self.rollback()
+            raise
+        if self._transaction is not None:
+            self._transaction.commit()
+        self._clear()
+
+    def rollback(self) -> None:
+        if self._transaction is not None:
+            self._transaction.rollback()
+        self._clear()
+
+    def snapshot_due(self) -> bool:
+        return self._journal is not None and self._journal.snapshot_due()
+
+    def staged_orders(self) -> list[RepairOrder]:
+        return list(self._dirty.values())
+
+    def is_staged(self, order_id: str) -> bool:
+        return order_id in self._dirty
+
+    def staged_events(self) -> list[Event]:
+        """Events appended since the last commit; the list is live and must not be modified."""
+        return self._new_events
+
+    def _clear(self) -> None:
+        self._identity_map.clear()
+        self._dirty.clear()
+        self._new_events.clear()
+
+
+class TrackedOrderRepository(OrderRepositoryPort):
+    def __init__(self, uow: UnitOfWork) -> None:
+        self._uow = uow
+
+    def get_by_id(self, order_id: str) -> RepairOrder | None:
+        identity_map = self._uow._identity_map
+        if order_id in identity_map:
+            return identity_map[order_id]
+        order = self._uow._orders_repo.get_by_id(order_id)
+        if order is not None:
+            order = _clone_order(order)
+        identity_map[order_id] = order
+        return order
+
+    def save(self, order: RepairOrder) -> RepairOrder:
+        self._uow._identity_map[order.order_id] = order
+        self._uow._dirty[order.order_id] = order
+        return order
+
+
+class TrackedEventRepository(EventRepositoryPort):
+    def __init__(self, uow: UnitOfWork) -> None:
+        self._uow = uow
+
+    def append(self, event: Event) -> None:
+        self._uow._new_events.append(event)
+
+    def get_by_order_id(self, order_id: str) -> list[Event]:
+        staged = [e for e in self._uow._new_events if e.order_id == order_id]
+        return self._uow._events_repo.get_by_order_id(order_id) + staged
+
+    def get_by_order_ids(self, order_ids: Iterable[str]) -> list[Event]:
+        order_ids = set(order_ids)
+        staged = [e for e in self._uow._new_events if e.order_id in order_ids]
+        return self._uow._events_repo.get_by_order_ids(order_ids) + staged
+
+    def get_all(self) -> list[Event]:
+        return self._uow._events_repo.get_all() + self._uow._new_events
+
+
+def _clone_order(order: RepairOrder) -> RepairOrder:
+    # Components are never mutated once created, so only the order and its services are copied.
+    return dataclasses.replace(order, services=[dataclasses.replace(svc) for svc in order.services])
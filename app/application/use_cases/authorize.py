@@ -1,59 +1,73 @@
 from __future__ import annotations
 
-from app.application.dtos import CommandDTO, ErrorViewDTO
+from collections.abc import Iterable
+
+from app.application.bulk_pricing import scale_half_even
+from app.application.dtos import CommandDTO, ErrorView
 from app.application.use_cases.base import CommandHandler
 from app.domain.errors import ErrorCode
 from app.domain.entities import Event, OrderStatus, RepairOrder
-from app.domain.helpers.rounding import round_amount
+from app.domain.money import Money
 
 
 class AuthorizeHandler(CommandHandler):
-    def handle(self, cmd: CommandDTO, errors: list[ErrorViewDTO]) -> None:
-        order: RepairOrder | None = self._get_order_or_error(cmd, errors)
+    # 16% tax, rounded half to even on the cent.
+    TAX_NUMERATOR = 116
+    TAX_DENOMINATOR = 100
+
+    def handle(self, cmd: CommandDTO, errors: list[ErrorView]) -> None:
+        order = self._authorizable(cmd, errors)
         if order is None:
             return
+        self._authorize(order, order.estimated_total.scale(self.TAX_NUMERATOR, self.TAX_DENOMINATOR))
+
+    def handle_many(self, commands: Iterable[CommandDTO], errors: list[ErrorView]) -> None:
+        """
+        Same outcome as calling `handle` for each command in turn, but the authorized amounts of
+        all the authorizable orders are computed together (see scale_half_even).
+        """
+        authorizable: list[RepairOrder] = []
+        for cmd in commands:
+            order = self._authorizable(cmd, errors)
+            if order is not None:
+                # A later command for the same order has to find it authorized, as it would one at a time.
+                order.status = OrderStatus.AUTHORIZED
+                authorizable.append(order)
+        amounts = scale_half_even(
+            [int(order.estimated_total) for order in authorizable], self.TAX_NUMERATOR, self.TAX_DENOMINATOR
+        )
+        for order, amount in zip(authorizable, amounts):
+            self._authorize(order, Money(amount))
+
+    def _authorizable(self, cmd: CommandDTO, errors: list[ErrorView]) -> RepairOrder | None:
+        order: RepairOrder | None = self._get_order_or_error(cmd, errors)
+        if order is None:
+            return None
 
         order_id = order.order_id
 
-        if order.status != OrderStatus.DIAGNOSED:
-            errors.append(
-                ErrorViewDTO(
-                    op=cmd.op,
-                    order_id=order_id,
-                    code=ErrorCode.SEQUENCE_ERROR.value,
-                    message=("Transición inválida: solo se puede autorizar una orden cuando está en estado DIAGNOSED."),
-                )
-            )
-            return
+        if not self._check_transition(cmd, order, errors):
+            return None
 
         if not order.services:
             errors.append(
-                ErrorViewDTO(
+                ErrorView(
                     op=cmd.op,
                     order_id=order_id,
                     code=ErrorCode.NO_SERVICES.value,
                     message=(f"No existen servicios válidos para autorizar la orden {order_id}."),
                 )
             )
-            return
-
-        subtotal: float = 0
-
-        for svc in order.services:
-            subtotal += svc.labor_estimated_cost
-
-            if svc.components:
-                for comp in svc.components:
-                    subtotal += comp.estimated_cost
-
-        authorized_amount = round_amount(subtotal * 1.16)
+            return None
+        return order
 
-        order.subtotal_estimated = subtotal
+    def _authorize(self, order: RepairOrder, authorized_amount: Money) -> None:
+        order.subtotal_estimated = order.estimated_total
         order.authorized_amount = authorized_amount
         order.authorized = True
         order.status = OrderStatus.AUTHORIZED
 
         self._orders_repo.save(order)
 
-        event = Event(order_id=order_id, type=OrderStatus.AUTHORIZED)
+        event = Event(order_id=order.order_id, type=OrderStatus.AUTHORIZED)
         self._events_repo.append(event)
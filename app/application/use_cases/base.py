@@ -2,25 +2,38 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 
-from app.application.dtos import CommandDTO, ErrorViewDTO
+from app.application.dtos import CommandDTO, ErrorView, RejectedCommand
 from app.domain.ports import OrderRepositoryPort, EventRepositoryPort
 from app.domain.entities import OrderStatus, RepairOrder
 from app.domain.errors import ErrorCode
+from app.domain.transitions import TransitionTable, Violation
 
 
 class CommandHandler(ABC):
-    def __init__(self, orders_repo: OrderRepositoryPort, events_repo: EventRepositoryPort) -> None:
+    def __init__(
+        self,
+        orders_repo: OrderRepositoryPort,
+        events_repo: EventRepositoryPort,
+        transitions: TransitionTable | None = None,
+    ) -> None:
         self._orders_repo = orders_repo
         self._events_repo = events_repo
+        self._transitions = transitions if transitions is not None else TransitionTable()
 
     @abstractmethod
-    def handle(self, cmd: CommandDTO, errors: list[ErrorViewDTO]) -> None: ...
+    def handle(self, cmd: CommandDTO, errors: list[ErrorView]) -> None: ...
 
-    def _get_order_or_error(self, cmd: CommandDTO, errors: list[ErrorViewDTO]) -> RepairOrder | None:
+    def reject(self, cmd: RejectedCommand, errors: list[ErrorView]) -> None:
+        """Report the validation error of `cmd`, unless its order is missing or cancelled."""
+        if cmd.data["order_id"] and self._get_order_or_error(cmd, errors) is None:
+            return
+        errors.append(cmd.error)
+
+    def _get_order_or_error(self, cmd: CommandDTO, errors: list[ErrorView]) -> RepairOrder | None:
         order_id: str = cmd.data.get("order_id")
         if not order_id:
             errors.append(
-                ErrorViewDTO(
+                ErrorView(
                     op=cmd.op,
                     order_id="",
                     code=ErrorCode.INVALID_OPERATION.value,
@@ -32,7 +45,7 @@ class CommandHandler(ABC):
         order: RepairOrder = self._orders_repo.get_by_id(order_id)
         if order is None:
             errors.append(
-                ErrorViewDTO(
+                ErrorView(
                     op=cmd.op,
                     order_id=order_id,
                     code=ErrorCode.INVALID_OPERATION.value,
@@ -41,14 +54,27 @@ class CommandHandler(ABC):
             )
             return None
 
-        if order and order.status == OrderStatus.CANCELLED:
-            errors.append(
-                ErrorViewDTO(
-                    op=cmd.op,
-                    order_id=order_id,
-                    code=ErrorCode.ORDER_CANCELLED.value,
-                    message=(f"La orden {order_id} está CANCELLED."),
-                )
-            )
+        # A cancelled order rejects the command before its payload is read.
+        if order.status == OrderStatus.CANCELLED:
+            self._check_transition(cmd, order, errors)
             return None
         return order
+
+    def _check_transition(self, cmd: CommandDTO, order: RepairOrder, errors: list[ErrorView]) -> bool:
+        """Report the transition-table error of `cmd.op` from the order's status, if any."""
+        violation = self._transitions.violation(cmd.op, order.status)
+        if violation is None:
+            return True
+        self._report_violation(cmd, order, violation, errors)
+        return False
+
+    @staticmethod
+    def _report_violation(cmd: CommandDTO, order: RepairOrder, violation: Violation, errors: list[ErrorView]) -> None:
+        errors.append(
+            ErrorView(
+                op=cmd.op,
+                order_id=order.order_id,
+                code=violation.code.value,
+                message=violation.message.format(order_id=order.order_id),
+            )
+        )
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from app.application.dtos import CommandDTO, ErrorViewDTO
+from app.application.dtos import CommandDTO, ErrorView, RejectedCommand
 from app.application.use_cases.base import CommandHandler
 from app.domain.entities import RepairOrder, Event, OrderStatus
 from app.domain.errors import ErrorCode
 
 
 class CreateOrderHandler(CommandHandler):
-    def handle(self, cmd: CommandDTO, errors: list[ErrorViewDTO]) -> None:
+    def handle(self, cmd: CommandDTO, errors: list[ErrorView]) -> None:
         data: dict = cmd.data
         order_id: str = data["order_id"]
         customer: str = data["customer"]
@@ -16,7 +16,7 @@ class CreateOrderHandler(CommandHandler):
         existing: RepairOrder | None = self._orders_repo.get_by_id(order_id)
         if existing is not None:
             errors.append(
-                ErrorViewDTO(
+                ErrorView(
                     op=cmd.op,
                     order_id=order_id,
                     code=ErrorCode.INVALID_OPERATION.value,
@@ -30,3 +30,7 @@ class CreateOrderHandler(CommandHandler):
 
         event: Event = Event(order_id=order_id, type=OrderStatus.CREATED)
         self._events_repo.append(event)
+
+    def reject(self, cmd: RejectedCommand, errors: list[ErrorView]) -> None:
+        # The order does not have to exist yet.
+        errors.append(cmd.error)
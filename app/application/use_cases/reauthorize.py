@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from app.application.dtos import CommandDTO, ErrorViewDTO
+from app.application.dtos import CommandDTO, ErrorView
 from app.application.use_cases.base import CommandHandler
 from app.domain.entities import OrderStatus, Event, RepairOrder
 from app.domain.errors import ErrorCode
-from app.domain.helpers.rounding import round_amount
+from app.domain.money import Money
+
 
 class ReauthorizeHandler(CommandHandler):
-    def handle(self, cmd: CommandDTO, errors: list[ErrorViewDTO]) -> None:
+    def handle(self, cmd: CommandDTO, errors: list[ErrorView]) -> None:
         order: RepairOrder | None = self._get_order_or_error(cmd, errors)
         if order is None:
             return
@@ -15,23 +16,13 @@ class ReauthorizeHandler(CommandHandler):
         order_id = order.order_id
         data = cmd.data
 
-        if order.status != OrderStatus.WAITING_FOR_APPROVAL:
-            errors.append(
-                ErrorViewDTO(
-                    op=cmd.op,
-                    order_id=order_id,
-                    code=ErrorCode.SEQUENCE_ERROR.value,
-                    message=(
-                        "Transición inválida: solo se puede re-autorizar una orden en estado WAITING_FOR_APPROVAL."
-                    ),
-                )
-            )
+        if not self._check_transition(cmd, order, errors):
             return
 
         new_amount_str = data.get("new_authorized_amount")
         if new_amount_str is None:
             errors.append(
-                ErrorViewDTO(
+                ErrorView(
                     op=cmd.op,
                     order_id=order_id,
                     code=ErrorCode.INVALID_OPERATION.value,
@@ -40,7 +31,7 @@ class ReauthorizeHandler(CommandHandler):
             )
             return
 
-        new_amount: float = round_amount(new_amount_str)
+        new_amount: Money = Money.parse(new_amount_str)
 
         order.authorized_amount = new_amount
         order.authorized = True
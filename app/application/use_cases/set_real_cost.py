@@ -1,16 +1,16 @@
 from __future__ import annotations
 
-from app.application.dtos import CommandDTO, ErrorViewDTO
+from app.application.dtos import CommandDTO, ErrorView
 from app.application.use_cases.base import CommandHandler
 from app.domain.errors import ErrorCode
 from app.domain.entities import RepairOrder
-from app.domain.helpers.rounding import round_amount
+from app.domain.money import Money
 
 
 class SetRealCostHandler(CommandHandler):
-    def handle(self, cmd: CommandDTO, errors: list[ErrorViewDTO]) -> None:
+    def handle(self, cmd: CommandDTO, errors: list[ErrorView]) -> None:
         order: RepairOrder | None = self._get_order_or_error(cmd, errors)
-        if order is None:
+        if order is None or not self._check_transition(cmd, order, errors):
             return
 
         data = cmd.data
@@ -21,7 +21,7 @@ class SetRealCostHandler(CommandHandler):
             real_cost_str = data.get("real_cost")
         except (KeyError, ValueError):
             errors.append(
-                ErrorViewDTO(
+                ErrorView(
                     op=cmd.op,
                     order_id=order_id,
                     code=ErrorCode.INVALID_OPERATION.value,
@@ -30,12 +30,28 @@ class SetRealCostHandler(CommandHandler):
             )
             return
 
-        real_cost: float = round_amount(real_cost_str)
+        real_cost: Money = Money.parse(real_cost_str)
         completed: bool = bool(data.get("completed", False))
 
         service_pos = service_index - 1
+        if not 0 <= service_pos < len(order.services):
+            errors.append(
+                ErrorView(
+                    op=cmd.op,
+                    order_id=order_id,
+                    code=ErrorCode.INVALID_OPERATION.value,
+                    message=f"El servicio {service_index} no existe en la orden {order_id}.",
+                )
+            )
+            return
         service = order.services[service_pos]
 
+        if service.real_cost is not None:
+            order.real_cost_total -= service.real_cost
+            order.services_ready -= service.completed
+        order.real_cost_total += real_cost
+        order.services_ready += completed
+
         service.real_cost = real_cost
         service.completed = completed
         self._orders_repo.save(order)
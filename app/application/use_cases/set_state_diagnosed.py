@@ -1,27 +1,18 @@
 from __future__ import annotations
 
-from app.application.dtos import CommandDTO, ErrorViewDTO
+from app.application.dtos import CommandDTO, ErrorView
 from app.application.use_cases.base import CommandHandler
 from app.domain.entities import OrderStatus, Event, RepairOrder
-from app.domain.errors import ErrorCode
 
 
 class SetStateDiagnosedHandler(CommandHandler):
-    def handle(self, cmd: CommandDTO, errors: list[ErrorViewDTO]) -> None:
+    def handle(self, cmd: CommandDTO, errors: list[ErrorView]) -> None:
         order: RepairOrder | None = self._get_order_or_error(cmd, errors)
         if order is None:
             return
 
         order_id: str = order.order_id
-        if order.status != OrderStatus.CREATED:
-            errors.append(
-                ErrorViewDTO(
-                    op=cmd.op,
-                    order_id=order_id,
-                    code=ErrorCode.SEQUENCE_ERROR.value,
-                    message=("Transición inválida: solo se puede establecer DIAGNOSED desde CREATED."),
-                )
-            )
+        if not self._check_transition(cmd, order, errors):
             return
 
         order.status = OrderStatus.DIAGNOSED
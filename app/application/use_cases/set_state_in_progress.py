@@ -1,28 +1,22 @@
 from __future__ import annotations
 
-from app.application.dtos import CommandDTO, ErrorViewDTO
+from app.application.dtos import CommandDTO, ErrorView
 from app.application.use_cases.base import CommandHandler
 from app.domain.entities import OrderStatus, Event, RepairOrder
-from app.domain.errors import ErrorCode
 
 
 class SetStateInProgressHandler(CommandHandler):
-    def handle(self, cmd: CommandDTO, errors: list[ErrorViewDTO]) -> None:
-        order: RepairOrder | None  = self._get_order_or_error(cmd, errors)
+    def handle(self, cmd: CommandDTO, errors: list[ErrorView]) -> None:
+        order: RepairOrder | None = self._get_order_or_error(cmd, errors)
         if order is None:
             return
 
         order_id = order.order_id
 
-        if order.status != OrderStatus.AUTHORIZED or not order.authorized:
-            errors.append(
-                ErrorViewDTO(
-                    op=cmd.op,
-                    order_id=order_id,
-                    code=ErrorCode.SEQUENCE_ERROR.value,
-                    message=("Transición inválida: solo se puede pasar a IN_PROGRESS desde una orden autorizada."),
-                )
-            )
+        if not self._check_transition(cmd, order, errors):
+            return
+        if not order.authorized:
+            self._report_violation(cmd, order, self._transitions.rule(cmd.op).violation, errors)
             return
 
         order.status = OrderStatus.IN_PROGRESS
@@ -1,59 +1,49 @@
 from __future__ import annotations
 
-from app.application.dtos import CommandDTO, ErrorViewDTO
+from app.application.dtos import CommandDTO, ErrorView
 from app.application.use_cases.base import CommandHandler
 from app.domain.entities import OrderStatus, Event, RepairOrder
 from app.domain.errors import ErrorCode
-from app.domain.helpers.rounding import round_amount
+from app.domain.money import Money
+
 
 class TryCompleteHandler(CommandHandler):
-    def handle(self, cmd: CommandDTO, errors: list[ErrorViewDTO]) -> None:
+    def handle(self, cmd: CommandDTO, errors: list[ErrorView]) -> None:
         order: RepairOrder | None = self._get_order_or_error(cmd, errors)
         if order is None:
             return
 
         order_id = order.order_id
-        if order.status != OrderStatus.IN_PROGRESS:
+        if not self._check_transition(cmd, order, errors):
+            return
+
+        if not order.authorized or order.authorized_amount is None:
             errors.append(
-                ErrorViewDTO(
+                ErrorView(
                     op=cmd.op,
                     order_id=order_id,
                     code=ErrorCode.SEQUENCE_ERROR.value,
-                    message=(
-                        "Transición inválida: solo se puede intentar completar una orden cuando está en estado IN_PROGRESS."
-                    ),
+                    message=("No se puede completar una orden sin autorización válida."),
                 )
             )
             return
 
-        if not order.authorized or order.authorized_amount is None:
+        if order.services_ready != len(order.services):
             errors.append(
-                ErrorViewDTO(
+                ErrorView(
                     op=cmd.op,
                     order_id=order_id,
                     code=ErrorCode.SEQUENCE_ERROR.value,
-                    message=("No se puede completar una orden sin autorización válida."),
+                    message=(
+                        "No se puede completar la orden; existen servicios no completados o sin costo real asignado."
+                    ),
                 )
             )
             return
 
-        for svc in order.services:
-            if not svc.completed or svc.real_cost is None:
-                errors.append(
-                    ErrorViewDTO(
-                        op=cmd.op,
-                        order_id=order_id,
-                        code=ErrorCode.SEQUENCE_ERROR.value,
-                        message=(
-                            "No se puede completar la orden; existen servicios no completados o sin costo real asignado."
-                        ),
-                    )
-                )
-                return
-
-        real_total = sum(svc.real_cost for svc in order.services if svc.real_cost is not None)
+        real_total: Money = order.real_cost_total
         order.real_total = real_total
-        limit: float = round_amount(order.authorized_amount * 1.10)
+        limit: Money = order.authorized_amount.scale(110, 100)
 
         if real_total > limit:
             order.status = OrderStatus.WAITING_FOR_APPROVAL
@@ -63,7 +53,7 @@ class TryCompleteHandler(CommandHandler):
             self._events_repo.append(event)
 
             errors.append(
-                ErrorViewDTO(
+                ErrorView(
                     op=cmd.op,
                     order_id=order_id,
                     code=ErrorCode.REQUIRES_REAUTH.value,
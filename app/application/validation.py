@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from typing import TypeVar
+
+from app.application.dtos import Command, CommandDTO, ErrorView, RejectedCommand
+from app.domain.errors import ErrorCode
+from app.domain.money import Money
+
+CommandT = TypeVar("CommandT", Command, CommandDTO)
+
+# A check receives a field value that is present (not None) and tells whether it is well-formed.
+Check = Callable[[object], bool]
+
+
+def _is_text(value: object) -> bool:
+    return type(value) is str
+
+
+def _is_amount(value: object) -> bool:
+    if type(value) is not str and type(value) is not int and type(value) is not float:
+        return False
+    try:
+        Money.parse(value)
+    except (ArithmeticError, ValueError):
+        return False
+    return True
+
+
+def _is_service_index(value: object) -> bool:
+    if type(value) is str:
+        return value.strip().isdigit()
+    return type(value) is int
+
+
+def _is_component(value: object) -> bool:
+    return type(value) is dict and _is_text(value.get("description")) and value.get("estimated_cost") is not None
+
+
+def _is_service(value: object) -> bool:
+    if type(value) is not dict:
+        return False
+    components = value.get("components") or []
+    return (
+        _is_text(value.get("description"))
+        and value.get("labor_estimated_cost") is not None
+        and type(components) is list
+        and all(_is_component(c) for c in components)
+    )
+
+
+def _service_amounts(service: dict) -> Iterator[tuple[str, object]]:
+    # Only called on services that passed _is_service.
+    yield "labor_estimated_cost", service["labor_estimated_cost"]
+    for component in service.get("components") or []:
+        yield "estimated_cost", component["estimated_cost"]
+
+
+_ORDER_ID: tuple[str, Check] = ("order_id", _is_text)
+
+# Required fields of every op's `data`; ops that are not listed are left to the service.
+COMMAND_SCHEMAS: dict[str, tuple[tuple[str, Check], ...]] = {
+    "CREATE_ORDER": (_ORDER_ID, ("customer", _is_text), ("vehicle", _is_text)),
+    "ADD_SERVICE": (_ORDER_ID, ("service", _is_service)),
+    "SET_STATE_DIAGNOSED": (_ORDER_ID,),
+    "AUTHORIZE": (_ORDER_ID,),
+    "SET_STATE_IN_PROGRESS": (_ORDER_ID,),
+    "SET_REAL_COST": (_ORDER_ID, ("service_index", _is_service_index), ("real_cost", _is_amount)),
+    "TRY_COMPLETE": (_ORDER_ID,),
+    "REAUTHORIZE": (_ORDER_ID, ("new_authorized_amount", _is_amount)),
+    "DELIVER": (_ORDER_ID,),
+    "CANCEL": (_ORDER_ID,),
+}
+
+
+def validate_commands(commands: Iterable[CommandT]) -> list[CommandT | RejectedCommand]:
+    """
+    Check the `data` of every command against its op's schema before anything is executed.
+
+    Args:
+        commands: Decoded commands, in batch order.
+
+    Returns:
+        list: The commands in batch order, with every malformed one replaced by a RejectedCommand
+            whose error is INVALID_AMOUNT for a malformed or out-of-range amount and INVALID_OPERATION
+            otherwise. The service reports it at the command's place in the batch, after the order
+            checks of its handler, so a missing or cancelled order takes precedence.
+    """
+    checked: list[CommandT | RejectedCommand] = []
+    schemas = COMMAND_SCHEMAS
+    for cmd in commands:
+        schema = None if type(cmd) is RejectedCommand else schemas.get(cmd.op)
+        error = None if schema is None else _schema_error(cmd.op, cmd.data, schema)
+        if error is None:
+            checked.append(cmd)
+            continue
+        code, message = error
+        order_id = cmd.data.get("order_id")
+        rejection = ErrorView(
+            op=cmd.op,
+            order_id=order_id if type(order_id) is str else "",
+            code=code.value,
+            message=message,
+        )
+        checked.append(RejectedCommand(cmd.op, cmd.ts, rejection))
+    return checked
+
+
+def _schema_error(op: str, data: dict, schema: tuple[tuple[str, Check], ...]) -> tuple[ErrorCode, str] | None:
+    for field, check in schema:
+        value = data.get(field)
+        if value is None or (field == "order_id" and value == ""):
+            if field == "order_id":
+                return ErrorCode.INVALID_OPERATION, "Falta 'order_id' en los datos del comando."
+            return ErrorCode.INVALID_OPERATION, f"El campo '{field}' es obligatorio en {op}."
+        if not check(value):
+            if check is _is_amount:
+                return ErrorCode.INVALID_AMOUNT, f"El campo '{field}' no es un monto válido en {op}."
+            return ErrorCode.INVALID_OPERATION, f"El campo '{field}' no es válido en {op}."
+        if field == "service":
+            for name, amount in _service_amounts(value):
+                if not _is_amount(amount):
+                    return ErrorCode.INVALID_AMOUNT, f"El campo '{name}' no es un monto válido en {op}."
+    return None
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+from app.domain.entities import Event, RepairOrder
+
+
+class _Entry:
+    __slots__ = ("version", "view", "view_size", "events", "size")
+
+    def __init__(self, version: int, view: dict, view_size: int) -> None:
+        self.version = version
+        self.view = view
+        self.view_size = view_size
+        # Event views of the order by event type; they never change, whatever the order version.
+        self.events: dict[str, dict] = {}
+        # View plus event views.
+        self.size = view_size
+
+
+class ViewCache:
+    """
+    LRU cache of rendered order views, keyed by order id and checked against the order version.
+
+    An order's view is rendered again only when the order comes back with a different version,
+    i.e. after a commit changed it; its event views are rendered once per event type and then
+    shared by every result that includes them. The cache is bounded by the approximate size of
+    the views it holds, evicting least recently used orders first.
+
+    Views are only valid for committed orders: a dry run changes orders without bumping their
+    version, so its results must not go through the cache.
+    """
+
+    def __init__(
+        self,
+        render_order: Callable[[RepairOrder], dict],
+        render_event: Callable[[Event], dict],
+        max_bytes: int = 64 << 20,
+    ) -> None:
+        """
+        Args:
+            render_order: Builds the view of an order.
+            render_event: Builds the view of an event.
+            max_bytes: Approximate memory the cached views may take.
+        """
+        self._render_order = render_order
+        self._render_event = render_event
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def order_view(self, order: RepairOrder) -> dict:
+        with self._lock:
+            entry = self._entries.get(order.order_id)
+            if entry is not None and entry.version == order.version:
+                self._entries.move_to_end(order.order_id)
+                self.hits += 1
+                return entry.view
+            self.misses += 1
+        view = self._render_order(order)
+        size = _view_size(view)
+        with self._lock:
+            entry = self._entries.get(order.order_id)
+            if entry is None:
+                self._entries[order.order_id] = _Entry(order.version, view, size)
+                self._bytes += size
+            else:
+                # Keep the event views: they do not depend on the version.
+                self._entries.move_to_end(order.order_id)
+                entry.size += size - entry.view_size
+                self._bytes += size - entry.view_size
+                entry.version, entry.view, entry.view_size = order.version, view, size
+            self._evict()
+        return view
+
+    def event_view(self, event: Event) -> dict:
+        with self._lock:
+            entry = self._entries.get(event.order_id)
+            if entry is None:
+                # Orders are looked up before their events; an order that is not cached (too big,
+                # or just evicted) does not get its events cached either.
+                return self._render_event(event)
+            view = entry.events.get(event.type)
+            if view is None:
+                view = entry.events[event.type] = self._render_event(event)
+                size = _view_size(view)
+                entry.size += size
+                self._bytes += size
+                self._evict()
+            return view
+
+    def _evict(self) -> None:
+        entries = self._entries
+        while self._bytes > self._max_bytes and entries:
+            _, entry = entries.popitem(last=False)
+            self._bytes -= entry.size
+
+
+def _view_size(view: dict) -> int:
+    # Shallow: the dict and its values; strings shared with the domain objects are counted anyway.
+    return sys.getsizeof(view) + sum(sys.getsizeof(value) for value in view.values())
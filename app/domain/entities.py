@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import Enum
 
+from app.domain.money import Money
+
 
 class OrderStatus(str, Enum):
 
@@ -16,23 +18,23 @@ class OrderStatus(str, Enum):
     CANCELLED = "CANCELLED"
 
 
-@dataclass
+@dataclass(slots=True)
 class Component:
     description: str
-    estimated_cost: float
+    estimated_cost: Money
 
 
-@dataclass
+@dataclass(slots=True)
 class Service:
     index: int
     description: str
-    labor_estimated_cost: float
-    real_cost: float | None = None
+    labor_estimated_cost: Money
+    real_cost: Money | None = None
     components: list[Component] = field(default_factory=list)
     completed: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class RepairOrder:
     order_id: str
     customer: str
@@ -40,12 +42,21 @@ class RepairOrder:
     authorized: bool = False
     status: OrderStatus = OrderStatus.CREATED
     services: list[Service] = field(default_factory=list)
-    subtotal_estimated: float = 0
-    authorized_amount: float = 0
-    real_total: float = 0
-
-
-@dataclass
+    subtotal_estimated: Money = Money(0)
+    authorized_amount: Money = Money(0)
+    real_total: Money = Money(0)
+    # Running aggregates over `services`, kept up to date by ADD_SERVICE and SET_REAL_COST:
+    # estimated labor + components, sum of assigned real costs, and services that are completed
+    # with a real cost.
+    estimated_total: Money = Money(0)
+    real_cost_total: Money = Money(0)
+    services_ready: int = 0
+    # Incremented every time a unit of work commits a change to the order (events are only ever
+    # appended together with a save), so (order_id, version) identifies its content.
+    version: int = 0
+
+
+@dataclass(slots=True)
 class Event:
     order_id: str
     type: OrderStatus
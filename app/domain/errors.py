@@ -9,6 +9,7 @@ class ErrorCode(str, Enum):
     ORDER_CANCELLED = "ORDER_CANCELLED"
     REQUIRES_REAUTH = "REQUIRES_REAUTH"
     INVALID_OPERATION = "INVALID_OPERATION"
+    INVALID_AMOUNT = "INVALID_AMOUNT"
 
 
 @dataclass
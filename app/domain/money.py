@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from decimal import ROUND_HALF_EVEN, Decimal
+
+# Largest accepted amount: 15 integer digits, well within the exact range of a float (see to_float).
+MAX_UNITS_DIGITS = 15
+
+
+class Money(int):
+    """
+    Exact amount stored as integer cents.
+
+    Arithmetic stays in integers; values are only rounded when they enter the domain (`parse`) or
+    when they are scaled by a rate (`scale`), both with banker's rounding (ROUND_HALF_EVEN).
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, value: str | int | float) -> Money:
+        """
+        Convert an amount in currency units (e.g. "1500.00", 1500, 1500.005) to cents.
+
+        Raises:
+            ValueError: If the amount is not a plain decimal (exponent notation, NaN, infinity) or has
+                more than MAX_UNITS_DIGITS integer digits.
+        """
+        if isinstance(value, str):
+            text = value.strip()
+            units, _, fraction = text.partition(".")
+            digits = units[1:] if units.startswith(("-", "+")) else units
+            parts = [part for part in (digits, fraction) if part]
+            if not parts or not all(part.isascii() and part.isdigit() for part in parts):
+                raise ValueError(f"Monto no válido: {value!r}.")
+            if len(digits) > MAX_UNITS_DIGITS:
+                raise ValueError(f"Monto fuera de rango: {value!r}.")
+            if len(fraction) <= 2:
+                cents = int(digits or "0") * 100 + int(fraction.ljust(2, "0"))
+                return cls(-cents if units.startswith("-") else cents)
+            amount = Decimal(text)
+        elif isinstance(value, int):
+            if abs(value) >= 10**MAX_UNITS_DIGITS:
+                raise ValueError(f"Monto fuera de rango: {value!r}.")
+            return cls(value * 100)
+        else:
+            amount = Decimal(str(value))
+            if not amount.is_finite():
+                raise ValueError(f"Monto no válido: {value!r}.")
+            if amount.adjusted() >= MAX_UNITS_DIGITS:
+                raise ValueError(f"Monto fuera de rango: {value!r}.")
+        cents = (amount * 100).to_integral_value(rounding=ROUND_HALF_EVEN)
+        return cls(int(cents))
+
+    def scale(self, numerator: int, denominator: int) -> Money:
+        """Multiply by numerator/denominator (e.g. 116/100 for +16%), rounding half to even."""
+        quotient, remainder = divmod(int(self) * numerator, denominator)
+        twice = 2 * remainder
+        if twice > denominator or (twice == denominator and quotient % 2):
+            quotient += 1
+        return Money(quotient)
+
+    def to_float(self) -> float:
+        return int(self) / 100
+
+    def __add__(self, other: int) -> Money:
+        return Money(int(self) + int(other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other: int) -> Money:
+        return Money(int(self) - int(other))
+
+    def __format__(self, format_spec: str) -> str:
+        if not format_spec:
+            return str(self)
+        return format(self.to_float(), format_spec)
+
+    def __str__(self) -> str:
+        sign = "-" if self < 0 else ""
+        units, cents = divmod(abs(int(self)), 100)
+        return f"{sign}{units}.{cents:02d}"
+
+    def __repr__(self) -> str:
+        return f"Money('{self!s}')"
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 
-from app.domain.entities import Event, RepairOrder
+from app.domain.entities import Event, OrderStatus, RepairOrder
 
 
 class OrderRepositoryPort(ABC):
@@ -16,6 +17,35 @@ class OrderRepositoryPort(ABC):
         raise NotImplementedError
 
 
+class OrderQueryPort(ABC):
+    """Read-side lookups over the stored orders, in creation order, paginated by an opaque cursor."""
+
+    @abstractmethod
+    def find(
+        self,
+        status: OrderStatus | None = None,
+        customer: str | None = None,
+        vehicle: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+    ) -> tuple[list[RepairOrder], str | None]:
+        """
+        Args:
+            status: Only orders currently in this status.
+            customer: Only orders of this customer.
+            vehicle: Only orders of this vehicle.
+            cursor: `next_cursor` of the previous page; None for the first page.
+            limit: Maximum number of orders returned.
+
+        Returns:
+            tuple: The matching orders and the cursor of the next page, or None on the last page.
+
+        Raises:
+            ValueError: If the cursor is not one this repository returned.
+        """
+        raise NotImplementedError
+
+
 class EventRepositoryPort(ABC):
 
     @abstractmethod
@@ -26,6 +56,43 @@ class EventRepositoryPort(ABC):
     def get_by_order_id(self, order_id: str) -> list[Event]:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_by_order_ids(self, order_ids: Iterable[str]) -> list[Event]:
+        raise NotImplementedError
+
     @abstractmethod
     def get_all(self) -> list[Event]:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+
+class TransactionPort(ABC):
+    """Groups every write of one OrderService batch into a single atomic unit."""
+
+    @abstractmethod
+    def begin(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def commit(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def rollback(self) -> None:
+        raise NotImplementedError
+
+
+class ChangeJournalPort(ABC):
+    """Durable log of the changes committed by OrderService, written before they are applied."""
+
+    @abstractmethod
+    def record(self, orders: list[RepairOrder], events: list[Event]) -> None:
+        """
+        Args:
+            orders: Full state of every order changed by the commit.
+            events: Events appended by the commit, in append order.
+        """
+        raise NotImplementedError
+
+    def snapshot_due(self) -> bool:
+        """Whether the next `record` also writes a snapshot of the whole store."""
+        return False
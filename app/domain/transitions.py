@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from app.domain.entities import OrderStatus
+from app.domain.errors import ErrorCode
+
+
+@dataclass(frozen=True, slots=True)
+class Violation:
+    """Error raised by an op on an order in a status it is not allowed from."""
+
+    code: ErrorCode
+    # May reference {order_id}.
+    message: str
+
+
+@dataclass(frozen=True, slots=True)
+class TransitionRule:
+    op: str
+    allowed_from: frozenset[OrderStatus]
+    violation: Violation | None = None
+
+
+_ALL_ACTIVE = frozenset(OrderStatus) - {OrderStatus.CANCELLED}
+
+TRANSITION_RULES: tuple[TransitionRule, ...] = (
+    TransitionRule(
+        "ADD_SERVICE",
+        frozenset({OrderStatus.CREATED, OrderStatus.DIAGNOSED}),
+        Violation(
+            ErrorCode.NOT_ALLOWED_AFTER_AUTHORIZATION,
+            "No se pueden agregar servicios en una orden que ya fue autorizada o está en un estado posterior ",
+        ),
+    ),
+    TransitionRule(
+        "SET_STATE_DIAGNOSED",
+        frozenset({OrderStatus.CREATED}),
+        Violation(ErrorCode.SEQUENCE_ERROR, "Transición inválida: solo se puede establecer DIAGNOSED desde CREATED."),
+    ),
+    TransitionRule(
+        "AUTHORIZE",
+        frozenset({OrderStatus.DIAGNOSED}),
+        Violation(
+            ErrorCode.SEQUENCE_ERROR,
+            "Transición inválida: solo se puede autorizar una orden cuando está en estado DIAGNOSED.",
+        ),
+    ),
+    TransitionRule(
+        "SET_STATE_IN_PROGRESS",
+        frozenset({OrderStatus.AUTHORIZED}),
+        Violation(
+            ErrorCode.SEQUENCE_ERROR,
+            "Transición inválida: solo se puede pasar a IN_PROGRESS desde una orden autorizada.",
+        ),
+    ),
+    TransitionRule("SET_REAL_COST", _ALL_ACTIVE),
+    TransitionRule(
+        "TRY_COMPLETE",
+        frozenset({OrderStatus.IN_PROGRESS}),
+        Violation(
+            ErrorCode.SEQUENCE_ERROR,
+            "Transición inválida: solo se puede intentar completar una orden cuando está en estado IN_PROGRESS.",
+        ),
+    ),
+    TransitionRule(
+        "REAUTHORIZE",
+        frozenset({OrderStatus.WAITING_FOR_APPROVAL}),
+        Violation(
+            ErrorCode.SEQUENCE_ERROR,
+            "Transición inválida: solo se puede re-autorizar una orden en estado WAITING_FOR_APPROVAL.",
+        ),
+    ),
+    TransitionRule(
+        "DELIVER",
+        frozenset({OrderStatus.COMPLETED}),
+        Violation(
+            ErrorCode.SEQUENCE_ERROR,
+            "Transición inválida: solo se puede entregar un vehículo cuando la orden está COMPLETED.",
+        ),
+    ),
+    TransitionRule(
+        "CANCEL",
+        _ALL_ACTIVE - {OrderStatus.COMPLETED, OrderStatus.DELIVERED},
+        Violation(ErrorCode.SEQUENCE_ERROR, "No se puede cancelar una orden que ya fue completada o entregada."),
+    ),
+)
+
+# A cancelled order rejects every op that has a rule, whatever the rule says.
+CANCELLED_VIOLATION = Violation(ErrorCode.ORDER_CANCELLED, "La orden {order_id} está CANCELLED.")
+
+_STATUS_INDEX: dict[OrderStatus, int] = {status: index for index, status in enumerate(OrderStatus)}
+
+
+class TransitionTable:
+    """
+    Dense (op × status) lookup compiled from declarative transition rules.
+
+    Each op gets a row of one cell per OrderStatus holding the Violation raised from that status,
+    or None when the op is allowed; checking a transition is then a single list index.
+    """
+
+    def __init__(self, rules: tuple[TransitionRule, ...] = TRANSITION_RULES) -> None:
+        self._rows: dict[str, int] = {}
+        self._rules: dict[str, TransitionRule] = {}
+        self._cells: list[Violation | None] = []
+        for rule in rules:
+            self._rows[rule.op] = len(self._cells)
+            self._rules[rule.op] = rule
+            for status in _STATUS_INDEX:
+                if status is OrderStatus.CANCELLED:
+                    self._cells.append(CANCELLED_VIOLATION)
+                else:
+                    self._cells.append(None if status in rule.allowed_from else rule.violation)
+
+    def violation(self, op: str, status: OrderStatus) -> Violation | None:
+        """
+        Args:
+            op: Command op; ops without a rule are never restricted.
+            status: Current status of the order.
+
+        Returns:
+            Violation | None: The error to report, or None when the transition is allowed.
+        """
+        row = self._rows.get(op)
+        if row is None:
+            return None
+        return self._cells[row + _STATUS_INDEX[status]]
+
+    def rule(self, op: str) -> TransitionRule | None:
+        return self._rules.get(op)
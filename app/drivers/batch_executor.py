@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class BatchQueueFullError(RuntimeError):
+    """Too many large batches are already running or waiting."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Hay demasiados lotes en cola; reintente más tarde.")
+        self.retry_after = retry_after
+
+
+class Backpressure:
+    """
+    Bound on the batches accepted (queued or running) by a pool of `workers` threads.
+
+    `acquire` fails right away with BatchQueueFullError once `capacity` batches are in flight; its
+    `retry_after` estimates, from the mean duration of recent batches, how many seconds the
+    accepted batches need to drain. Thread-safe.
+    """
+
+    def __init__(self, workers: int, capacity: int) -> None:
+        self._workers = workers
+        self._capacity = capacity
+        self._in_flight = 0
+        self._mean_seconds = 1.0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self) -> None:
+        """
+        Raises:
+            BatchQueueFullError: If `capacity` batches are already in flight.
+        """
+        with self._lock:
+            if self._in_flight >= self._capacity:
+                # Time for the batches already accepted to drain.
+                raise BatchQueueFullError(max(1, math.ceil(self._mean_seconds * self._in_flight / self._workers)))
+            self._in_flight += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def observe(self, seconds: float) -> None:
+        """Record how long a batch ran."""
+        with self._lock:
+            # Exponential moving average over the last few batches.
+            self._mean_seconds += 0.2 * (seconds - self._mean_seconds)
+
+
+class BatchExecutor:
+    """
+    Bounded executor for large batches, awaited from async routes.
+
+    At most `workers` batches run at once and at most `max_queued` more wait for a worker; beyond
+    that `submit` fails right away with BatchQueueFullError (see Backpressure).
+    """
+
+    def __init__(self, workers: int = 1, max_queued: int = 8) -> None:
+        """
+        Args:
+            workers: Threads executing batches.
+            max_queued: Batches allowed to wait for a free thread.
+        """
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch")
+        self._backpressure = Backpressure(workers, capacity=workers + max_queued)
+
+    @property
+    def in_flight(self) -> int:
+        return self._backpressure.in_flight
+
+    async def submit(self, fn: Callable[[], T]) -> T:
+        """
+        Run `fn` on the pool and wait for its result without blocking the event loop.
+
+        Raises:
+            BatchQueueFullError: If the queue is full.
+        """
+        self._backpressure.acquire()
+        try:
+            future = self._pool.submit(self._timed, fn)
+        except BaseException:
+            self._backpressure.release()
+            raise
+        # The slot is freed when the batch is done (or cancelled before it started), not when the
+        # caller stops waiting: a cancelled request leaves its batch running on the pool.
+        future.add_done_callback(lambda _: self._backpressure.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def _timed(self, fn: Callable[[], T]) -> T:
+        started = time.monotonic()
+        try:
+            return fn()
+        finally:
+            self._backpressure.observe(time.monotonic() - started)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections.abc import Iterator
+
+from app.application.orders_service import OrderService
+from app.domain.entities import Event, RepairOrder
+from app.drivers.http_api import get_shared_order_service
+from app.infrastructure.columnar_export import export_columnar
+from app.infrastructure.columnar_kpis import compute_kpis
+
+
+def iter_order_pages(service: OrderService, chunk_rows: int) -> Iterator[tuple[list[RepairOrder], list[Event]]]:
+    """Committed orders in creation order, `chunk_rows` at a time, each page with its events."""
+    cursor = None
+    while True:
+        orders, cursor = service.find_orders(cursor=cursor, limit=chunk_rows)
+        yield orders, service.load_events([order.order_id for order in orders])
+        if cursor is None:
+            return
+
+
+def main(argv: list[str]) -> int:
+    """
+    `export <dir>` writes the state of the shared service (configured through the same environment
+    variables as the API) as a columnar export, and fails unless REPAIR_ORDERS_DB or
+    REPAIR_ORDERS_JOURNAL is set, since an in-memory service starts empty; `kpis <dir>` prints the KPIs
+    of an export as JSON.
+    """
+    parser = argparse.ArgumentParser(prog="main.py")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Exportar órdenes, servicios y eventos en formato columnar.")
+    export.add_argument("directory")
+    export.add_argument("--chunk-rows", type=int, default=65536, help="Órdenes por archivo.")
+    kpis = commands.add_parser("kpis", help="Calcular KPIs sobre una exportación (requiere NumPy).")
+    kpis.add_argument("directory")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        if not (os.environ.get("REPAIR_ORDERS_DB") or os.environ.get("REPAIR_ORDERS_JOURNAL")):
+            print(
+                "Se requiere REPAIR_ORDERS_DB o REPAIR_ORDERS_JOURNAL para exportar un estado persistido.",
+                file=sys.stderr,
+            )
+            return 1
+        manifest = export_columnar(iter_order_pages(get_shared_order_service(), args.chunk_rows), args.directory)
+        rows = {table: sum(info["chunks"]) for table, info in manifest["tables"].items()}
+        print(json.dumps(rows))
+    else:
+        try:
+            kpis = compute_kpis(args.directory)
+        except (RuntimeError, ValueError) as exc:
+            print(exc, file=sys.stderr)
+            return 1
+        print(json.dumps(kpis, indent=2))
+    return 0
@@ -1,21 +1,361 @@
 # app/drivers/http_api.py
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+import os
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import islice
 
-from app.application.orders_service import OrderService
-from app.drivers.json_controller import process_payload
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+
+from app.application.dtos import BatchResult
+from app.application.idempotency import IdempotencyKeyReusedError, IdempotencyStore
+from app.application.instrumentation import MetricsRegistry
+from app.application.orders_service import BatchDeadlineExceeded, OrderService
+from app.application.view_cache import ViewCache
+from app.domain.entities import OrderStatus
+from app.drivers.batch_executor import BatchExecutor, BatchQueueFullError
+from app.drivers.jobs import Job, JobManager, JobStore
+from app.drivers.json_controller import (
+    InvalidPayloadError,
+    NdjsonCommandStream,
+    authorize_payload,
+    event_to_dict,
+    order_to_dict,
+    process_payload_fast,
+    render_json,
+    result_to_dict,
+    result_to_ndjson,
+)
+from app.infrastructure.journal import FileJournal
 from app.infrastructure.in_memory_repos import InMemoryOrderRepository, InMemoryEventRepository
+from app.infrastructure.sqlite_repos import SqliteDatabase, SqliteEventRepository, SqliteOrderRepository
 
 router = APIRouter()
 
+# Closing lines of an NDJSON stream built per trip to the threadpool.
+STREAM_BATCH_LINES = 256
+
+
+@lru_cache(maxsize=1)
+def get_metrics_registry() -> MetricsRegistry | None:
+    """Registry of the shared service; only created when REPAIR_ORDERS_METRICS=1."""
+    if os.environ.get("REPAIR_ORDERS_METRICS") == "1":
+        return MetricsRegistry()
+    return None
+
+
+@lru_cache(maxsize=1)
+def get_shared_order_service() -> OrderService:
+    """
+    Process-lifetime service: state carries across requests.
+
+    Set REPAIR_ORDERS_DB to a file path to keep the state in SQLite instead of in memory, and
+    REPAIR_ORDERS_WORKERS to process the orders of each batch on that many threads. With
+    REPAIR_ORDERS_JOURNAL set to a directory, the in-memory state is journaled there and restored
+    from its latest snapshot on startup (REPAIR_ORDERS_SNAPSHOT_EVERY sets the snapshot interval).
+    REPAIR_ORDERS_VIEW_CACHE_BYTES bounds the cache of rendered order views (default 64 MiB, 0 disables it).
+    Idempotency keys are kept REPAIR_ORDERS_IDEMPOTENCY_TTL seconds (default one day), up to
+    REPAIR_ORDERS_IDEMPOTENCY_ITEMS recorded commands, orders, events and errors (default 100,000).
+    Batches are committed every REPAIR_ORDERS_CHECKPOINT_EVERY commands (default 1000, 0 commits
+    each batch at once), and other batches may run between two chunks (see OrderService).
+    """
+    workers = int(os.environ.get("REPAIR_ORDERS_WORKERS", "0")) or None
+    checkpoint_every = int(os.environ.get("REPAIR_ORDERS_CHECKPOINT_EVERY", "1000")) or None
+    instrumentation = get_metrics_registry()
+    cache_bytes = int(os.environ.get("REPAIR_ORDERS_VIEW_CACHE_BYTES", str(64 << 20)))
+    view_cache = ViewCache(order_to_dict, event_to_dict, max_bytes=cache_bytes) if cache_bytes > 0 else None
+    idempotency = IdempotencyStore(
+        ttl_seconds=float(os.environ.get("REPAIR_ORDERS_IDEMPOTENCY_TTL", "86400")),
+        max_items=int(os.environ.get("REPAIR_ORDERS_IDEMPOTENCY_ITEMS", "100000")),
+    )
+    db_path = os.environ.get("REPAIR_ORDERS_DB")
+    if db_path:
+        database = SqliteDatabase(db_path)
+        return OrderService(
+            orders_repo=SqliteOrderRepository(database),
+            events_repo=SqliteEventRepository(database),
+            transaction=database,
+            checkpoint_every=checkpoint_every,
+            workers=workers,
+            instrumentation=instrumentation,
+            view_cache=view_cache,
+            idempotency=idempotency,
+        )
 
-def get_order_service() -> OrderService:
+    orders_repo = InMemoryOrderRepository()
+    events_repo = InMemoryEventRepository()
+    journal = None
+    journal_dir = os.environ.get("REPAIR_ORDERS_JOURNAL")
+    if journal_dir:
+        snapshot_every = int(os.environ.get("REPAIR_ORDERS_SNAPSHOT_EVERY", "1000"))
+        journal = FileJournal(journal_dir, orders_repo, events_repo, snapshot_every=snapshot_every)
+        journal.restore()
+    return OrderService(
+        orders_repo=orders_repo,
+        events_repo=events_repo,
+        checkpoint_every=checkpoint_every,
+        workers=workers,
+        instrumentation=instrumentation,
+        journal=journal,
+        view_cache=view_cache,
+        idempotency=idempotency,
+    )
+
+
+def get_isolated_order_service() -> OrderService:
+    """Fresh service with empty repositories for every request (used by tests)."""
     orders_repo = InMemoryOrderRepository()
     events_repo = InMemoryEventRepository()
     return OrderService(orders_repo=orders_repo, events_repo=events_repo)
 
 
+def get_order_service() -> OrderService:
+    return get_shared_order_service()
+
+
+@dataclass(frozen=True)
+class BatchLimits:
+    # Batches with more commands than this go to the batch executor instead of running inline.
+    inline_limit: int
+    # Seconds a request may take, queueing included, before its batch is abandoned.
+    deadline_seconds: float
+
+
+@lru_cache(maxsize=1)
+def get_batch_limits() -> BatchLimits:
+    """
+    Read from REPAIR_ORDERS_INLINE_LIMIT (default 20) and REPAIR_ORDERS_DEADLINE_SECONDS (default 30).
+
+    Inline batches run on the event loop, so the limit only lets through batches short enough
+    (well under a millisecond) to be cheaper than a trip to the executor; 0 sends every batch there.
+    """
+    return BatchLimits(
+        inline_limit=int(os.environ.get("REPAIR_ORDERS_INLINE_LIMIT", "20")),
+        deadline_seconds=float(os.environ.get("REPAIR_ORDERS_DEADLINE_SECONDS", "30")),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_batch_executor() -> BatchExecutor:
+    """Executor for large batches; REPAIR_ORDERS_BATCH_WORKERS threads, REPAIR_ORDERS_MAX_QUEUED waiting."""
+    return BatchExecutor(
+        workers=int(os.environ.get("REPAIR_ORDERS_BATCH_WORKERS", "1")),
+        max_queued=int(os.environ.get("REPAIR_ORDERS_MAX_QUEUED", "8")),
+    )
+
+
 @router.post("/process-orders/")
-def process_repair_orders(payload: dict, service: OrderService = Depends(get_order_service)) -> dict:
-    return process_payload(payload, service)
+async def process_repair_orders(
+    payload: dict,
+    dry_run: bool = False,
+    idempotency_key: str | None = Header(None),
+    service: OrderService = Depends(get_order_service),
+) -> Response:
+    """
+    Process a batch of commands; with `?dry_run=true` the batch is simulated and nothing is committed.
+    A retry carrying the same `Idempotency-Key` header gets the original result back; reusing the key
+    for a different payload is answered with 422.
+
+    Small batches run inline on the event loop when no other batch holds the service and their
+    commit does not write a journal snapshot, and in the threadpool otherwise. Large batches go to
+    the bounded batch executor, which answers 429 with Retry-After when it is full. A batch still
+    running at the request deadline is rolled back to its last checkpoint between two commands and
+    answered with 503.
+    """
+    limits = get_batch_limits()
+    run = partial(
+        process_payload_fast,
+        payload,
+        service,
+        dry_run=dry_run,
+        deadline=time.monotonic() + limits.deadline_seconds,
+        idempotency_key=idempotency_key,
+    )
+    return await _run_batch(run, payload.get("commands"), service, limits)
+
+
+async def _run_batch(run: Callable[[], dict], items: object, service: OrderService, limits: BatchLimits) -> Response:
+    """
+    Run a batch of `items` inline, in the threadpool or in the batch executor, depending on its size
+    (see process_repair_orders), and map its failures to HTTP errors.
+    """
+    try:
+        if isinstance(items, list) and len(items) > limits.inline_limit:
+            result = await get_batch_executor().submit(run)
+        elif _lock_for_inline_run(service):
+            try:
+                result = run()
+            finally:
+                service.unlock()
+        else:
+            result = await run_in_threadpool(run)
+    except (InvalidPayloadError, IdempotencyKeyReusedError) as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except BatchQueueFullError as exc:
+        raise HTTPException(status_code=429, detail=str(exc), headers={"Retry-After": str(exc.retry_after)}) from exc
+    except BatchDeadlineExceeded as exc:
+        detail = "Se superó el tiempo límite del lote; se descartaron los cambios desde el último checkpoint."
+        raise HTTPException(status_code=503, detail=detail) from exc
+    return Response(content=render_json(result), media_type="application/json")
+
+
+def _lock_for_inline_run(service: OrderService) -> bool:
+    """
+    Take the service lock for a batch run on the event loop, unless another batch holds it or the
+    next commit writes a journal snapshot, which copies the whole store.
+    """
+    if not service.try_lock():
+        return False
+    if service.snapshot_due():
+        service.unlock()
+        return False
+    return True
+
+
+@router.post("/process-orders/stream")
+async def process_repair_orders_stream(
+    request: Request, service: OrderService = Depends(get_order_service)
+) -> StreamingResponse:
+    """
+    NDJSON in, NDJSON out (see NdjsonCommandStream). Commands run on the threadpool, one body chunk
+    at a time, and the closing lines are built there STREAM_BATCH_LINES at a time, so the event loop
+    is never held by the service lock.
+    """
+    stream = NdjsonCommandStream(service)
+
+    async def results() -> AsyncIterator[bytes]:
+        async for chunk in request.stream():
+            lines = await run_in_threadpool(lambda: list(stream.feed(chunk)))
+            if lines:
+                yield b"".join(lines)
+        closing = stream.close()
+        while lines := await run_in_threadpool(lambda: list(islice(closing, STREAM_BATCH_LINES))):
+            yield b"".join(lines)
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@router.get("/orders/")
+def list_orders(
+    status: OrderStatus | None = None,
+    customer: str | None = None,
+    vehicle: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=1000),
+    service: OrderService = Depends(get_order_service),
+) -> Response:
+    """
+    Orders matching every given filter, in creation order. Pass `next_cursor` back as `cursor` to
+    get the next page; it is null on the last one.
+    """
+    try:
+        orders, next_cursor = service.find_orders(status, customer, vehicle, cursor, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except NotImplementedError as exc:
+        raise HTTPException(status_code=501, detail=str(exc)) from exc
+    render = order_to_dict if service.view_cache is None else service.view_cache.order_view
+    body = {"orders": [render(order) for order in orders], "next_cursor": next_cursor}
+    return Response(content=render_json(body), media_type="application/json")
+
+
+@router.post("/orders/authorize")
+async def authorize_orders(payload: dict, service: OrderService = Depends(get_order_service)) -> Response:
+    """
+    Authorize many orders at once: `{"ts": ..., "order_ids": [...]}`. The response is the one of a
+    /process-orders/ batch with an AUTHORIZE command per id, and the request is run, limited and
+    timed out like one too.
+    """
+    limits = get_batch_limits()
+    run = partial(authorize_payload, payload, service, deadline=time.monotonic() + limits.deadline_seconds)
+    return await _run_batch(run, payload.get("order_ids"), service, limits)
+
+
+@router.get("/orders/{order_id}")
+def get_order(order_id: str, service: OrderService = Depends(get_order_service)) -> Response:
+    """One order with its event history."""
+    orders = service.load_orders([order_id])
+    if not orders:
+        raise HTTPException(status_code=404, detail=f"La orden {order_id} no existe.")
+    result = BatchResult(orders=orders, events=service.load_events([order_id]), errors=[])
+    views = result_to_dict(result, service.view_cache)
+    body = {"order": views["orders"][0], "events": views["events"]}
+    return Response(content=render_json(body), media_type="application/json")
+
+
+@lru_cache(maxsize=1)
+def get_job_manager() -> JobManager:
+    """
+    Background runner of the shared service. Finished results are kept until they add up to
+    REPAIR_ORDERS_JOB_RESULT_ITEMS orders, events and errors (default 1,000,000).
+    """
+    store = JobStore(max_items=int(os.environ.get("REPAIR_ORDERS_JOB_RESULT_ITEMS", "1000000")))
+    return JobManager(get_shared_order_service(), store)
+
+
+@router.post("/jobs/", status_code=202)
+def submit_job(payload: dict, jobs: JobManager = Depends(get_job_manager)) -> dict:
+    """Queue a batch for background execution and return its id and progress right away."""
+    try:
+        job = jobs.submit(payload)
+    except (InvalidPayloadError, IdempotencyKeyReusedError) as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except BatchQueueFullError as exc:
+        raise HTTPException(status_code=429, detail=str(exc), headers={"Retry-After": str(exc.retry_after)}) from exc
+    return job.progress()
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str, jobs: JobManager = Depends(get_job_manager)) -> dict:
+    return _find_job(jobs, job_id).progress()
+
+
+@router.get("/jobs/{job_id}/result")
+def get_job_result(
+    job_id: str, offset: int = 0, limit: int = 1000, jobs: JobManager = Depends(get_job_manager)
+) -> Response:
+    """
+    One page of a finished job's result: the orders, events and errors in [offset, offset + limit).
+    `next_offset` is null on the last page.
+    """
+    result = _finished_result(_find_job(jobs, job_id))
+    offset = max(offset, 0)
+    limit = max(limit, 1)
+    end = offset + limit
+    more = any(len(items) > end for items in result.values())
+    page = {key: items[offset:end] for key, items in result.items()}
+    body = {"job_id": job_id, "offset": offset, "next_offset": end if more else None, **page}
+    return Response(content=render_json(body), media_type="application/json")
+
+
+@router.get("/jobs/{job_id}/result/stream")
+def stream_job_result(job_id: str, jobs: JobManager = Depends(get_job_manager)) -> StreamingResponse:
+    """The whole result of a finished job as NDJSON, like /process-orders/stream."""
+    result = _finished_result(_find_job(jobs, job_id))
+    return StreamingResponse(result_to_ndjson(result), media_type="application/x-ndjson")
+
+
+def _find_job(jobs: JobManager, job_id: str) -> Job:
+    job = jobs.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"El job {job_id} no existe o su resultado ya fue descartado.")
+    return job
+
+
+def _finished_result(job: Job) -> dict:
+    if job.result is None:
+        detail = job.failure or f"El job {job.job_id} todavía no terminó."
+        raise HTTPException(status_code=409, detail=detail)
+    return job.result
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    registry = get_metrics_registry()
+    body = registry.render_prometheus() if registry is not None else ""
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
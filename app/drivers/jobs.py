@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+
+from app.application.dtos import Command, ErrorView
+from app.application.orders_service import OrderService
+from app.application.validation import validate_commands
+from app.drivers.batch_executor import Backpressure
+from app.drivers.json_controller import decode_commands, result_to_dict
+
+
+class JobStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class Job:
+    """A batch submitted through the job API, with its live progress and, once done, its result."""
+
+    __slots__ = ("job_id", "status", "total", "processed", "errors", "result", "failure", "size")
+
+    def __init__(self, job_id: str, total: int) -> None:
+        self.job_id = job_id
+        self.status = JobStatus.QUEUED
+        self.total = total
+        self.processed = 0
+        # Appended to by the handlers while the batch runs.
+        self.errors: list[ErrorView] = []
+        self.result: dict | None = None
+        self.failure: str | None = None
+        # Number of orders, events and errors in the result; what the store is bounded by.
+        self.size = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def progress(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status.value,
+            "total": self.total,
+            "processed": self.processed,
+            "errors": len(self.errors),
+            "failure": self.failure,
+        }
+
+    def track(self, commands: Iterable[Command]) -> Iterator[Command]:
+        """Yield the commands, counting each one as processed once the next one is requested."""
+        processed = self.processed
+        for cmd in commands:
+            yield cmd
+            processed += 1
+            self.processed = processed
+
+
+class JobStore:
+    """
+    Jobs by id, bounded by the total size of the finished results.
+
+    Finished jobs are evicted least-recently-used first once their results hold more than
+    `max_items` orders, events and errors together, or once there are more than `max_jobs` of
+    them. Queued and running jobs are never evicted.
+    """
+
+    def __init__(self, max_items: int = 1_000_000, max_jobs: int = 1000) -> None:
+        self._max_items = max_items
+        self._max_jobs = max_jobs
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._items = 0
+        self._finished = 0
+        self._lock = threading.Lock()
+
+    def add(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.job_id] = job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._jobs.move_to_end(job_id)
+            return job
+
+    def finish(self, job: Job) -> None:
+        """Account for a job whose result has just been set, evicting older results if needed."""
+        with self._lock:
+            if job.job_id not in self._jobs:
+                return
+            self._jobs.move_to_end(job.job_id)
+            self._items += job.size
+            self._finished += 1
+            for old in list(self._jobs.values()):
+                if self._items <= self._max_items and self._finished <= self._max_jobs:
+                    break
+                if old.finished and old is not job:
+                    del self._jobs[old.job_id]
+                    self._items -= old.size
+                    self._finished -= 1
+
+
+class JobManager:
+    """
+    Runs submitted batches in the background, one at a time per worker.
+
+    `submit` decodes and validates the payload right away (so malformed envelopes are still
+    rejected synchronously) and returns the queued job; at most `max_pending` jobs may be queued
+    or running.
+    """
+
+    def __init__(self, service: OrderService, store: JobStore, workers: int = 1, max_pending: int = 16) -> None:
+        self._service = service
+        self._store = store
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._backpressure = Backpressure(workers, capacity=max_pending)
+
+    @property
+    def store(self) -> JobStore:
+        return self._store
+
+    def submit(self, payload: dict) -> Job:
+        """
+        Raises:
+            InvalidPayloadError: If the envelope or any command does not have the expected shape.
+            BatchQueueFullError: If `max_pending` jobs are already queued or running.
+        """
+        commands = validate_commands(decode_commands(payload))
+        self._backpressure.acquire()
+        job = Job(uuid.uuid4().hex, total=len(commands))
+        self._store.add(job)
+        self._pool.submit(self._run, job, commands)
+        return job
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def _run(self, job: Job, commands: list[Command]) -> None:
+        started = time.monotonic()
+        job.status = JobStatus.RUNNING
+        try:
+            result = self._service.execute_raw(job.track(commands), errors=job.errors)
+            job.result = result_to_dict(result, self._service.view_cache)
+            job.size = len(result.orders) + len(result.events) + len(result.errors)
+            job.status = JobStatus.SUCCEEDED
+        except Exception as exc:
+            job.failure = f"{type(exc).__name__}: {exc}"
+            job.size = len(job.errors)
+            job.status = JobStatus.FAILED
+        finally:
+            self._store.finish(job)
+            self._backpressure.observe(time.monotonic() - started)
+            self._backpressure.release()
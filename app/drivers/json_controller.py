@@ -1,16 +1,275 @@
 from __future__ import annotations
 
-from app.application.dtos import CommandDTO, ResultDTO
+import json
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+
+from pydantic import TypeAdapter, ValidationError
+
+from app.application.dtos import BatchResult, Command, CommandDTO, ErrorView, RejectedCommand, ResultDTO
+from app.application.idempotency import batch_fingerprint
 from app.application.orders_service import OrderService
+from app.application.validation import validate_commands
+from app.application.view_cache import ViewCache
+from app.domain.entities import Event, RepairOrder
+from app.domain.errors import ErrorCode
+
+
+class InvalidPayloadError(ValueError):
+    pass
+
+
+# Parses `ts` with the same rules as CommandDTO.ts, so both paths accept the same timestamps.
+_parse_ts = TypeAdapter(datetime).validate_python
 
 
-def process_payload(payload: dict, service: OrderService) -> dict:
+def process_payload(payload: dict, service: OrderService, dry_run: bool = False) -> dict:
     raw_commands: list = payload.get("commands", [])
 
     commands: list[CommandDTO] = []
     for item in raw_commands:
-        command = CommandDTO(op=item["op"], ts=item["ts"], data=item.get("data", {}))
+        command = CommandDTO(
+            op=item["op"], ts=item["ts"], data=item.get("data", {}), idempotency_key=item.get("idempotency_key")
+        )
         commands.append(command)
 
-    result: ResultDTO = service.execute(commands)
+    result: ResultDTO = service.execute(validate_commands(commands), dry_run=dry_run)
     return result.model_dump()
+
+
+def process_payload_fast(
+    payload: dict,
+    service: OrderService,
+    dry_run: bool = False,
+    deadline: float | None = None,
+    idempotency_key: str | None = None,
+) -> dict:
+    """
+    Same result as `process_payload`, without building a pydantic model per command or per view.
+
+    With `dry_run` the batch is only simulated (see OrderService.simulate) and nothing is committed;
+    `deadline` and `idempotency_key` are passed on to the service (see OrderService.execute_raw),
+    the latter with the fingerprint of the payload.
+    Committed results are rendered through the service's view cache, if it has one.
+
+    Raises:
+        InvalidPayloadError: If the envelope or any command does not have the expected shape.
+        IdempotencyKeyReusedError: If `idempotency_key` was already used for a different payload.
+    """
+    result = service.execute_raw(
+        validate_commands(decode_commands(payload)),
+        dry_run=dry_run,
+        deadline=deadline,
+        idempotency_key=idempotency_key,
+        fingerprint=None if idempotency_key is None else batch_fingerprint(payload),
+    )
+    views = None if dry_run else service.view_cache
+    return result_to_dict(result, views)
+
+
+def authorize_payload(payload: dict, service: OrderService, deadline: float | None = None) -> dict:
+    """
+    Authorize the orders of a `{"ts": ..., "order_ids": [...]}` payload (see OrderService.authorize_many),
+    with `ts` parsed like CommandDTO does.
+
+    Raises:
+        InvalidPayloadError: If `order_ids` is not a list of strings or `ts` is not one CommandDTO accepts.
+        BatchDeadlineExceeded: If `deadline` passed before every order was checked.
+    """
+    order_ids = payload.get("order_ids") if isinstance(payload, dict) else None
+    if type(order_ids) is not list or not all(type(order_id) is str for order_id in order_ids):
+        raise InvalidPayloadError("El payload debe tener 'ts' y una lista 'order_ids' de textos.")
+    ts = payload.get("ts")
+    try:
+        parsed_ts = _parse_ts(ts)
+    except ValidationError:
+        raise InvalidPayloadError(f"El payload tiene un 'ts' inválido: {ts!r}.") from None
+    result = service.authorize_many(order_ids, parsed_ts, deadline)
+    return result_to_dict(result, service.view_cache)
+
+
+def render_json(result: dict) -> bytes:
+    """Encode a result exactly like FastAPI's JSONResponse does."""
+    return json.dumps(result, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def decode_commands(payload: dict) -> list[Command]:
+    """
+    Validate the `{"commands": [...]}` envelope once and decode its items into Command objects,
+    with their `ts` parsed like CommandDTO does.
+
+    Raises:
+        InvalidPayloadError: If the envelope is not a dict with a list of commands, or an item lacks a
+            string `op` or a `ts` that CommandDTO accepts, or has a non-dict `data` or a non-string
+            `idempotency_key`.
+    """
+    raw_commands = payload.get("commands", []) if isinstance(payload, dict) else None
+    if not isinstance(raw_commands, list):
+        raise InvalidPayloadError("El payload debe ser un objeto con una lista 'commands'.")
+
+    commands: list[Command] = []
+    append = commands.append
+    for position, item in enumerate(raw_commands):
+        try:
+            op = item["op"]
+            ts = item["ts"]
+            data = item.get("data", {})
+            key = item.get("idempotency_key")
+        except (KeyError, TypeError, AttributeError):
+            raise InvalidPayloadError(f"El comando {position} debe tener 'op' y 'ts'.") from None
+        if type(op) is not str or type(data) is not dict or (key is not None and type(key) is not str):
+            raise InvalidPayloadError(f"El comando {position} tiene campos con tipos inválidos.")
+        try:
+            append(Command(op, _parse_ts(ts), data, key))
+        except ValidationError:
+            raise InvalidPayloadError(f"El comando {position} tiene un 'ts' inválido: {ts!r}.") from None
+    return commands
+
+
+def result_to_dict(result: BatchResult, views: ViewCache | None = None) -> dict:
+    """
+    Args:
+        result: Outcome of a batch.
+        views: Cache of committed order and event views; None renders every view from scratch.
+            The cached views are shared between results and must not be modified.
+    """
+    if views is None:
+        return {
+            "orders": [order_to_dict(order) for order in result.orders],
+            "events": [event_to_dict(event) for event in result.events],
+            "errors": [error.to_dict() for error in result.errors],
+        }
+    return {
+        "orders": [views.order_view(order) for order in result.orders],
+        "events": [views.event_view(event) for event in result.events],
+        "errors": [error.to_dict() for error in result.errors],
+    }
+
+
+def order_to_dict(order: RepairOrder) -> dict:
+    # Mirrors OrderViewDTO.model_dump(): amounts are emitted as floats in currency units.
+    authorized_amount = order.authorized_amount
+    real_total = order.real_total
+    return {
+        "order_id": order.order_id,
+        "status": order.status.value,
+        "customer": order.customer,
+        "vehicle": order.vehicle,
+        "subtotal_estimated": order.subtotal_estimated.to_float(),
+        "authorized_amount": None if authorized_amount is None else authorized_amount.to_float(),
+        "real_total": None if real_total is None else real_total.to_float(),
+    }
+
+
+def event_to_dict(event: Event) -> dict:
+    return {"order_id": event.order_id, "type": event.type.value}
+
+
+def result_to_ndjson(result: dict) -> Iterator[bytes]:
+    """Yield a result dict as NDJSON lines, in the order NdjsonCommandStream emits them."""
+    for error in result["errors"]:
+        yield _ndjson_line("error", error)
+    for order in result["orders"]:
+        yield _ndjson_line("order", order)
+    for event in result["events"]:
+        yield _ndjson_line("event", event)
+
+
+def process_ndjson(chunks: Iterable[bytes], service: OrderService) -> Iterator[bytes]:
+    """
+    Process a newline-delimited JSON command stream and yield NDJSON result lines.
+
+    Args:
+        chunks: Raw body chunks; lines may be split across chunk boundaries.
+        service: Service the commands are executed against.
+
+    Returns:
+        Iterator[bytes]: Result lines, see NdjsonCommandStream.
+    """
+    stream = NdjsonCommandStream(service)
+    for chunk in chunks:
+        yield from stream.feed(chunk)
+    yield from stream.close()
+
+
+# Touched orders loaded at a time when an NDJSON stream is closed.
+CLOSE_PAGE_ORDERS = 1000
+
+
+class NdjsonCommandStream:
+    """
+    Incremental NDJSON driver for OrderService.
+
+    Each input line holds one command (`{"op": ..., "ts": ..., "data": {...}}`). Complete lines are
+    executed as soon as their chunk arrives, and errors are emitted right away as `{"error": {...}}`
+    lines. Once the input is closed, the touched orders and their events are emitted as
+    `{"order": {...}}` and `{"event": {...}}` lines, loaded CLOSE_PAGE_ORDERS orders at a time: the
+    events of each page come in append order, after the orders. Only the ids of the touched orders
+    are kept between chunks.
+    """
+
+    def __init__(self, service: OrderService) -> None:
+        self._service = service
+        self._pending: list[bytes] = []
+        self._order_ids: dict[str, None] = {}
+
+    def feed(self, chunk: bytes) -> Iterator[bytes]:
+        if b"\n" not in chunk:
+            self._pending.append(chunk)
+            return iter(())
+
+        lines = chunk.split(b"\n")
+        if self._pending:
+            self._pending.append(lines[0])
+            lines[0] = b"".join(self._pending)
+        self._pending = [lines.pop()]
+        return self._process(lines)
+
+    def close(self) -> Iterator[bytes]:
+        lines = [b"".join(self._pending)]
+        self._pending = []
+        yield from self._process(lines)
+
+        views = self._service.view_cache
+        render_order = order_to_dict if views is None else views.order_view
+        render_event = event_to_dict if views is None else views.event_view
+        order_ids = list(self._order_ids)
+        pages = [order_ids[i : i + CLOSE_PAGE_ORDERS] for i in range(0, len(order_ids), CLOSE_PAGE_ORDERS)]
+        for page in pages:
+            for order in self._service.load_orders(page):
+                yield _ndjson_line("order", render_order(order))
+        for page in pages:
+            for event in self._service.load_events(page):
+                yield _ndjson_line("event", render_event(event))
+
+    def _process(self, lines: list[bytes]) -> Iterator[bytes]:
+        errors: list[ErrorView] = []
+        commands = validate_commands(_decode_command(line) for line in lines if line.strip())
+        if commands:
+            self._order_ids |= self._service.dispatch(commands, errors)
+        for error in errors:
+            yield _ndjson_line("error", error.to_dict())
+
+
+def _decode_command(line: bytes) -> CommandDTO | RejectedCommand:
+    # Undecodable lines keep their place in the batch as rejected commands.
+    item = None
+    try:
+        item = json.loads(line)
+        return CommandDTO(
+            op=item["op"], ts=item["ts"], data=item.get("data", {}), idempotency_key=item.get("idempotency_key")
+        )
+    except (ValueError, KeyError, TypeError, AttributeError, ValidationError):
+        op = item.get("op") if isinstance(item, dict) else None
+        op = op if isinstance(op, str) else ""
+        error = ErrorView(
+            op=op,
+            order_id="",
+            code=ErrorCode.INVALID_OPERATION.value,
+            message="Línea NDJSON inválida: se esperaba un comando con 'op', 'ts' y 'data'.",
+        )
+        return RejectedCommand(op, None, error)
+
+
+def _ndjson_line(kind: str, body: dict) -> bytes:
+    return json.dumps({kind: body}, ensure_ascii=False).encode() + b"\n"
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from array import array
+from collections.abc import Callable, Iterable
+from typing import NamedTuple
+
+from app.domain.entities import Event, OrderStatus, RepairOrder, Service
+from app.domain.money import Money
+
+# Columnar export of orders, services and events, readable with `numpy.load` (see columnar_kpis).
+#
+# Every table is written in chunks, one per page of orders (a chunk of services or events holds
+# the rows of the orders in the matching orders chunk), with one `.npy` file per column:
+# `<table>-<chunk>.<column>.npy`. Amounts are integer cents, with NULL_CENTS for missing ones;
+# statuses and event types are uint8 codes indexing `manifest.json["statuses"]`. The manifest is
+# written last, so an export without one is incomplete.
+
+FORMAT = "repair-orders-columnar/1"
+MANIFEST = "manifest.json"
+NULL_CENTS = -(2**63)
+
+STATUSES: list[OrderStatus] = list(OrderStatus)
+_STATUS_CODES: dict[OrderStatus, int] = {status: code for code, status in enumerate(STATUSES)}
+
+# `array` typecode and .npy descr of every column kind; "U" is fixed-width UTF-32 text.
+_KINDS: dict[str, tuple[str, str]] = {
+    "i8": ("q", "<i8"),
+    "i4": ("i", "<i4"),
+    "u1": ("B", "|u1"),
+    "b1": ("B", "|b1"),
+}
+
+
+class Column(NamedTuple):
+    name: str
+    kind: str
+    value: Callable[[tuple], object]
+
+
+def _cents(amount: Money | None) -> int:
+    return NULL_CENTS if amount is None else int(amount)
+
+
+# Rows are (order row, order) for orders, (order row, order, service) for services and
+# (order row, event) for events; the order row is the position of the order in the orders table.
+ORDER_COLUMNS: tuple[Column, ...] = (
+    Column("order_id", "U", lambda r: r[1].order_id),
+    Column("customer", "U", lambda r: r[1].customer),
+    Column("vehicle", "U", lambda r: r[1].vehicle),
+    Column("status", "u1", lambda r: _STATUS_CODES[r[1].status]),
+    Column("authorized", "b1", lambda r: r[1].authorized),
+    Column("subtotal_estimated", "i8", lambda r: _cents(r[1].subtotal_estimated)),
+    Column("authorized_amount", "i8", lambda r: _cents(r[1].authorized_amount)),
+    Column("real_total", "i8", lambda r: _cents(r[1].real_total)),
+    Column("estimated_total", "i8", lambda r: int(r[1].estimated_total)),
+    Column("real_cost_total", "i8", lambda r: int(r[1].real_cost_total)),
+    Column("services", "i4", lambda r: len(r[1].services)),
+    Column("version", "i8", lambda r: r[1].version),
+)
+SERVICE_COLUMNS: tuple[Column, ...] = (
+    Column("order_row", "i8", lambda r: r[0]),
+    Column("index", "i4", lambda r: r[2].index),
+    Column("description", "U", lambda r: r[2].description),
+    Column("labor_estimated_cost", "i8", lambda r: int(r[2].labor_estimated_cost)),
+    Column("components_estimated_cost", "i8", lambda r: sum(int(c.estimated_cost) for c in r[2].components)),
+    Column("components", "i4", lambda r: len(r[2].components)),
+    Column("real_cost", "i8", lambda r: _cents(r[2].real_cost)),
+    Column("completed", "b1", lambda r: r[2].completed),
+)
+EVENT_COLUMNS: tuple[Column, ...] = (
+    Column("order_row", "i8", lambda r: r[0]),
+    Column("type", "u1", lambda r: _STATUS_CODES[r[1].type]),
+)
+TABLES: dict[str, tuple[Column, ...]] = {
+    "orders": ORDER_COLUMNS,
+    "services": SERVICE_COLUMNS,
+    "events": EVENT_COLUMNS,
+}
+
+
+class ColumnarWriter:
+    """
+    Writes orders, their services and their events chunk by chunk.
+
+    Only the chunk being written is held in memory; `close()` writes the manifest.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._chunks: dict[str, list[int]] = {table: [] for table in TABLES}
+        self._orders = 0
+
+    def write_chunk(self, orders: list[RepairOrder], events: Iterable[Event]) -> None:
+        """
+        Args:
+            orders: Orders of the chunk.
+            events: Events of those orders, in append order.
+        """
+        first_row = self._orders
+        rows = {order.order_id: first_row + i for i, order in enumerate(orders)}
+        service_rows: list[tuple[int, RepairOrder, Service]] = [
+            (rows[order.order_id], order, service) for order in orders for service in order.services
+        ]
+        chunk = len(self._chunks["orders"])
+        self._write_table("orders", chunk, [(rows[order.order_id], order) for order in orders])
+        self._write_table("services", chunk, service_rows)
+        self._write_table("events", chunk, [(rows[event.order_id], event) for event in events])
+        self._orders += len(orders)
+
+    def close(self) -> dict:
+        manifest = {
+            "format": FORMAT,
+            "statuses": [status.value for status in STATUSES],
+            "null_cents": NULL_CENTS,
+            "tables": {
+                table: {
+                    "columns": {column.name: column.kind for column in columns},
+                    "chunks": self._chunks[table],
+                }
+                for table, columns in TABLES.items()
+            },
+        }
+        path = os.path.join(self._directory, MANIFEST)
+        with open(path + ".tmp", "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh, indent=2)
+        os.replace(path + ".tmp", path)
+        return manifest
+
+    def _write_table(self, table: str, chunk: int, rows: list[tuple]) -> None:
+        for column in TABLES[table]:
+            path = os.path.join(self._directory, chunk_file(table, chunk, column.name))
+            values = [column.value(row) for row in rows]
+            if column.kind == "U":
+                _write_text(path, values)
+            else:
+                typecode, descr = _KINDS[column.kind]
+                data = array(typecode, values)
+                if sys.byteorder == "big":
+                    data.byteswap()
+                _write_npy(path, descr, len(values), data.tobytes())
+        self._chunks[table].append(len(rows))
+
+
+def export_columnar(pages: Iterable[tuple[list[RepairOrder], list[Event]]], directory: str) -> dict:
+    """
+    Write every (orders, events) page as one chunk and return the manifest.
+
+    Args:
+        pages: Orders and their events, one chunk at a time.
+        directory: Output directory, created if needed.
+    """
+    writer = ColumnarWriter(directory)
+    for orders, events in pages:
+        writer.write_chunk(orders, events)
+    return writer.close()
+
+
+def chunk_file(table: str, chunk: int, column: str) -> str:
+    return f"{table}-{chunk:05d}.{column}.npy"
+
+
+def _write_text(path: str, values: list[str]) -> None:
+    width = max((len(value) for value in values), default=0) or 1
+    data = b"".join(value.ljust(width, "\0").encode("utf-32-le") for value in values)
+    _write_npy(path, f"<U{width}", len(values), data)
+
+
+def _write_npy(path: str, descr: str, count: int, data: bytes) -> None:
+    # .npy format version 1.0: magic, header length, then a dict literal padded to 64 bytes.
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({count},), }}"
+    header = header + " " * (-(10 + len(header) + 1) % 64) + "\n"
+    with open(path, "wb") as fh:
+        fh.write(b"\x93NUMPY\x01\x00")
+        fh.write(len(header).to_bytes(2, "little"))
+        fh.write(header.encode("latin1"))
+        fh.write(data)
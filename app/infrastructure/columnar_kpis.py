@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import os
+
+from app.infrastructure.columnar_export import FORMAT, MANIFEST, chunk_file
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+def compute_kpis(directory: str) -> dict:
+    """
+    Finance KPIs over a columnar export (see columnar_export), computed with NumPy.
+
+    Each chunk is memory-mapped and reduced with vectorized operations, and only the running
+    totals are kept, so memory is bounded by the chunk size.
+
+    Args:
+        directory: Directory holding `manifest.json` and the chunk files.
+
+    Returns:
+        dict: Order counts by status, authorized vs. real totals (in currency units), the share of
+            authorized orders that needed a re-authorization and service completion figures.
+
+    Raises:
+        RuntimeError: If NumPy is not installed.
+        ValueError: If the directory does not hold a complete export.
+    """
+    if np is None:
+        raise RuntimeError("El cálculo de KPIs requiere NumPy: pip install numpy")
+    manifest = _read_manifest(directory)
+    statuses: list[str] = manifest["statuses"]
+    null_cents = manifest["null_cents"]
+    waiting = statuses.index("WAITING_FOR_APPROVAL")
+    authorized_event = statuses.index("AUTHORIZED")
+
+    by_status = np.zeros(len(statuses), dtype=np.int64)
+    authorized_orders = 0
+    authorized_cents = 0
+    real_cents = 0
+    reauth_orders = 0
+    reauth_events = 0
+    services = 0
+    completed_services = 0
+    service_estimated_cents = 0
+    service_real_cents = 0
+
+    def column(table: str, chunk: int, name: str) -> np.ndarray:
+        return np.load(os.path.join(directory, chunk_file(table, chunk, name)), mmap_mode="r")
+
+    first_row = 0
+    for chunk, rows in enumerate(manifest["tables"]["orders"]["chunks"]):
+        status = column("orders", chunk, "status")
+        by_status += np.bincount(status, minlength=len(statuses))
+
+        # Authorized orders: those with an AUTHORIZED event, whatever their status now.
+        event_type = column("events", chunk, "type")
+        event_row = column("events", chunk, "order_row") - first_row
+        was_authorized = np.zeros(rows, dtype=bool)
+        was_authorized[event_row[event_type == authorized_event]] = True
+        needed_reauth = np.zeros(rows, dtype=bool)
+        needed_reauth[event_row[event_type == waiting]] = True
+
+        authorized_amount = column("orders", chunk, "authorized_amount")
+        real_cost_total = column("orders", chunk, "real_cost_total")
+        counted = was_authorized & (authorized_amount != null_cents)
+        authorized_orders += int(np.count_nonzero(was_authorized))
+        authorized_cents += int(authorized_amount[counted].sum())
+        real_cents += int(real_cost_total[counted].sum())
+        reauth_orders += int(np.count_nonzero(needed_reauth & was_authorized))
+        reauth_events += int(np.count_nonzero(event_type == waiting))
+
+        real_cost = column("services", chunk, "real_cost")
+        with_real_cost = real_cost != null_cents
+        estimated = column("services", chunk, "labor_estimated_cost") + column(
+            "services", chunk, "components_estimated_cost"
+        )
+        services += real_cost.shape[0]
+        completed_services += int(np.count_nonzero(column("services", chunk, "completed") & with_real_cost))
+        service_estimated_cents += int(estimated[with_real_cost].sum())
+        service_real_cents += int(real_cost[with_real_cost].sum())
+        first_row += rows
+
+    return {
+        "orders": first_row,
+        "orders_by_status": {name: int(count) for name, count in zip(statuses, by_status)},
+        "authorized_orders": authorized_orders,
+        "authorized_total": authorized_cents / 100,
+        "real_total": real_cents / 100,
+        "real_over_authorized": real_cents / authorized_cents if authorized_cents else None,
+        "reauth_orders": reauth_orders,
+        "reauth_events": reauth_events,
+        "reauth_rate": reauth_orders / authorized_orders if authorized_orders else None,
+        "services": services,
+        "completed_services": completed_services,
+        "services_estimated_total": service_estimated_cents / 100,
+        "services_real_total": service_real_cents / 100,
+    }
+
+
+def _read_manifest(directory: str) -> dict:
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    except FileNotFoundError:
+        raise ValueError(f"{directory} no contiene una exportación completa (falta {MANIFEST}).") from None
+    if manifest.get("format") != FORMAT:
+        raise ValueError(f"Formato de exportación no soportado: {manifest.get('format')!r}.")
+    return manifest
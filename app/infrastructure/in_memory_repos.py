@@ -1,30 +1,188 @@
 from __future__ import annotations
 
-from app.domain.entities import Event, RepairOrder
-from app.domain.ports import EventRepositoryPort, OrderRepositoryPort
+import heapq
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Sequence
 
+from app.domain.entities import Event, OrderStatus, RepairOrder
+from app.domain.ports import EventRepositoryPort, OrderQueryPort, OrderRepositoryPort
+
+_STATUSES: list[OrderStatus] = list(OrderStatus)
+_STATUS_CODES: dict[OrderStatus, int] = {status: code for code, status in enumerate(_STATUSES)}
+
+
+class InMemoryOrderRepository(OrderRepositoryPort, OrderQueryPort):
+    """
+    Orders by id, plus secondary indexes on status, customer and vehicle for the read side.
+
+    Every order gets a sequence number the first time it is saved; each index maps a key to the
+    sorted sequence numbers of its orders, and the query cursor is the last sequence number
+    returned. `save` moves an order between index entries only when the indexed field changed.
+    """
 
-class InMemoryOrderRepository(OrderRepositoryPort):
     def __init__(self) -> None:
         self._orders: dict = {}
+        self._lock = threading.RLock()
+        self._seqs: dict[str, int] = {}
+        self._ids_by_seq: list[str] = []
+        # Indexed fields of each order as of its last save, by sequence number.
+        self._keys: list[tuple[OrderStatus, str, str]] = []
+        self._by_status: dict[OrderStatus, list[int]] = {status: [] for status in _STATUSES}
+        self._by_customer: dict[str, list[int]] = {}
+        self._by_vehicle: dict[str, list[int]] = {}
 
     def get_by_id(self, order_id: str) -> RepairOrder | None:
-        return self._orders.get(order_id)
+        with self._lock:
+            return self._orders.get(order_id)
 
     def save(self, order: RepairOrder) -> RepairOrder:
-        self._orders[order.order_id] = order
+        keys = (order.status, order.customer, order.vehicle)
+        with self._lock:
+            self._orders[order.order_id] = order
+            seq = self._seqs.get(order.order_id)
+            if seq is None:
+                seq = len(self._ids_by_seq)
+                self._seqs[order.order_id] = seq
+                self._ids_by_seq.append(order.order_id)
+                self._keys.append(keys)
+                # The new sequence number is the highest, so appending keeps every entry sorted.
+                self._by_status[keys[0]].append(seq)
+                self._by_customer.setdefault(keys[1], []).append(seq)
+                self._by_vehicle.setdefault(keys[2], []).append(seq)
+                return order
+            old = self._keys[seq]
+            if old != keys:
+                self._keys[seq] = keys
+                if old[0] is not keys[0]:
+                    _move(self._by_status, old[0], keys[0], seq)
+                if old[1] != keys[1]:
+                    _move(self._by_customer, old[1], keys[1], seq)
+                if old[2] != keys[2]:
+                    _move(self._by_vehicle, old[2], keys[2], seq)
         return order
 
+    def get_all(self) -> list[RepairOrder]:
+        with self._lock:
+            return list(self._orders.values())
+
+    def find(
+        self,
+        status: OrderStatus | None = None,
+        customer: str | None = None,
+        vehicle: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+    ) -> tuple[list[RepairOrder], str | None]:
+        after = _parse_cursor(cursor)
+        with self._lock:
+            candidates: list[Sequence[int]] = []
+            if status is not None:
+                candidates.append(self._by_status[status])
+            if customer is not None:
+                candidates.append(self._by_customer.get(customer, ()))
+            if vehicle is not None:
+                candidates.append(self._by_vehicle.get(vehicle, ()))
+            # Walk the most selective index and check the other filters on the stored keys.
+            seqs = min(candidates, key=len) if candidates else range(len(self._ids_by_seq))
+            keys = self._keys
+            page: list[int] = []
+            for i in range(bisect_right(seqs, after), len(seqs)):
+                seq = seqs[i]
+                status_, customer_, vehicle_ = keys[seq]
+                if (
+                    (status is None or status_ is status)
+                    and (customer is None or customer_ == customer)
+                    and (vehicle is None or vehicle_ == vehicle)
+                ):
+                    if len(page) == limit:
+                        return self._page(page), str(page[-1])
+                    page.append(seq)
+            return self._page(page), None
+
+    def _page(self, seqs: list[int]) -> list[RepairOrder]:
+        ids, orders = self._ids_by_seq, self._orders
+        return [orders[ids[seq]] for seq in seqs]
+
+
+def _move(index: dict, old_key: object, new_key: object, seq: int) -> None:
+    entries = index[old_key]
+    del entries[bisect_left(entries, seq)]
+    # Customer and vehicle entries go away with their last order; the status index keeps one per status.
+    if not entries and type(old_key) is str:
+        del index[old_key]
+    insort(index.setdefault(new_key, []), seq)
+
+
+def _parse_cursor(cursor: str | None) -> int:
+    if cursor is None:
+        return -1
+    if not cursor.isdigit():
+        raise ValueError(f"Cursor inválido: {cursor!r}.")
+    return int(cursor)
+
 
 class InMemoryEventRepository(EventRepositoryPort):
+    """
+    Append-only, columnar event store with a per-order index.
+
+    Events are not kept as objects: each one is an interned order number (`array('I')`) plus a
+    status code (`array('B')`) in two parallel columns, whose positions act as the global append
+    sequence. Every order keeps the ascending positions of its own events, so lookups only touch
+    matching events; Event objects are built on the way out.
+    """
+
     def __init__(self) -> None:
-        self._events: list[Event] = []
+        self._order_ids: list[str] = []
+        self._order_numbers: dict[str, int] = {}
+        self._event_orders = array("I")
+        self._event_types = array("B")
+        self._positions_by_order: list[array] = []
+        self._lock = threading.RLock()
 
     def append(self, event: Event) -> None:
-        self._events.append(event)
+        with self._lock:
+            number = self._order_numbers.get(event.order_id)
+            if number is None:
+                number = self._order_numbers[event.order_id] = len(self._order_ids)
+                self._order_ids.append(event.order_id)
+                self._positions_by_order.append(array("I"))
+            self._positions_by_order[number].append(len(self._event_orders))
+            self._event_orders.append(number)
+            self._event_types.append(_STATUS_CODES[event.type])
 
     def get_by_order_id(self, order_id: str) -> list[Event]:
-        return [e for e in self._events if e.order_id == order_id]
+        with self._lock:
+            number = self._order_numbers.get(order_id)
+            if number is None:
+                return []
+            types = self._event_types
+            return [Event(order_id=order_id, type=_STATUSES[types[pos]]) for pos in self._positions_by_order[number]]
+
+    def get_by_order_ids(self, order_ids: Iterable[str]) -> list[Event]:
+        """
+        Return the events of several orders, in global append order.
+
+        Args:
+            order_ids: Orders whose events are requested; duplicates and unknown ids are ignored.
+
+        Returns:
+            list[Event]: Matching events, merged by their global sequence.
+        """
+        with self._lock:
+            numbers = self._order_numbers
+            positions_by_order = self._positions_by_order
+            position_lists = [positions_by_order[numbers[oid]] for oid in set(order_ids) if oid in numbers]
+            positions = position_lists[0] if len(position_lists) == 1 else heapq.merge(*position_lists)
+            return self._materialize(positions)
 
     def get_all(self) -> list[Event]:
-        return self._events
+        with self._lock:
+            return self._materialize(range(len(self._event_orders)))
+
+    def _materialize(self, positions: Iterable[int]) -> list[Event]:
+        order_ids = self._order_ids
+        event_orders = self._event_orders
+        types = self._event_types
+        return [Event(order_id=order_ids[event_orders[pos]], type=_STATUSES[types[pos]]) for pos in positions]
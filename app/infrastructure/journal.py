@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+
+from app.domain.entities import Event, OrderStatus, RepairOrder
+from app.domain.ports import ChangeJournalPort
+from app.infrastructure.in_memory_repos import InMemoryEventRepository, InMemoryOrderRepository
+from app.infrastructure.serialization import order_from_record, order_to_record
+
+_SNAPSHOT_PREFIX = "snapshot-"
+_SEGMENT_PREFIX = "journal-"
+
+
+class FileJournal(ChangeJournalPort):
+    """
+    Snapshot + change log that makes the in-memory repositories survive restarts.
+
+    Every commit is appended to the current journal segment as one JSON line with a sequence
+    number, the full state of the orders it changed and its new events. After `snapshot_every`
+    records the next commit first writes a snapshot of both repositories and starts a new segment
+    named after the snapshot's sequence number; older files are then removed. `restore()` loads
+    the latest snapshot and replays only the records after it, so startup work is bounded by the
+    snapshot interval rather than by the total history.
+
+    Files in `directory`:
+        snapshot-<seq>.json   orders and events as of record <seq>
+        journal-<seq>.jsonl   records <seq>+1 onwards
+
+    Call `restore()` once before the journal is handed to OrderService.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        orders_repo: InMemoryOrderRepository,
+        events_repo: InMemoryEventRepository,
+        snapshot_every: int = 1000,
+        fsync: bool = False,
+    ) -> None:
+        """
+        Args:
+            directory: Directory holding the snapshot and journal files; created if missing.
+            orders_repo: Repository the snapshots are taken from and restored into.
+            events_repo: Repository the snapshots are taken from and restored into.
+            snapshot_every: Number of records between two snapshots.
+            fsync: Also fsync every record; otherwise records are only flushed to the OS, which
+                survives a process crash but not a power loss.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._orders_repo = orders_repo
+        self._events_repo = events_repo
+        self._snapshot_every = snapshot_every
+        self._fsync = fsync
+        self._seq = 0
+        self._snapshot_seq = 0
+        self._segment = None
+        self._lock = threading.Lock()
+
+    def restore(self) -> int:
+        """
+        Load the latest snapshot and replay the records after it into the (empty) repositories.
+
+        A torn last line, left by a crash in the middle of a write, is discarded.
+
+        Returns:
+            int: Number of journal records replayed.
+        """
+        with self._lock:
+            snapshots = self._files(_SNAPSHOT_PREFIX)
+            if snapshots:
+                self._snapshot_seq, path = snapshots[-1]
+                with open(path, encoding="utf-8") as fh:
+                    snapshot = json.load(fh)
+                self._apply(snapshot["orders"], snapshot["events"])
+            self._seq = self._snapshot_seq
+
+            replayed = 0
+            for base, path in self._files(_SEGMENT_PREFIX):
+                if base < self._snapshot_seq:
+                    continue
+                for record in _read_records(path):
+                    if record["seq"] <= self._seq:
+                        continue
+                    self._apply(record["orders"], record["events"])
+                    self._seq = record["seq"]
+                    replayed += 1
+            return replayed
+
+    def snapshot_due(self) -> bool:
+        with self._lock:
+            return self._rotation_due()
+
+    def record(self, orders: list[RepairOrder], events: list[Event]) -> None:
+        with self._lock:
+            if self._rotation_due():
+                self._rotate()
+            self._seq += 1
+            line = json.dumps(
+                {
+                    "seq": self._seq,
+                    "orders": [order_to_record(order) for order in orders],
+                    "events": [[event.order_id, event.type.value] for event in events],
+                },
+                separators=(",", ":"),
+            )
+            self._segment.write(line + "\n")
+            self._segment.flush()
+            if self._fsync:
+                os.fsync(self._segment.fileno())
+
+    def snapshot(self) -> None:
+        """Write a snapshot now and start a new journal segment."""
+        with self._lock:
+            self._rotate(force=True)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+
+    def _rotation_due(self) -> bool:
+        return self._segment is None or self._seq - self._snapshot_seq >= self._snapshot_every
+
+    def _rotate(self, force: bool = False) -> None:
+        # The records up to self._seq have already been applied to the repositories, so their
+        # current contents are exactly the state as of that record.
+        if force or self._seq > self._snapshot_seq:
+            self._write_snapshot()
+        if self._segment is not None:
+            self._segment.close()
+        # A segment only ever follows its snapshot, so any record already in it (at most a torn
+        # line, since nothing after the snapshot was replayed) can be discarded.
+        path = self._path(_SEGMENT_PREFIX, self._snapshot_seq, ".jsonl")
+        self._segment = open(path, "w", encoding="utf-8")
+        for prefix in (_SNAPSHOT_PREFIX, _SEGMENT_PREFIX):
+            for base, old in self._files(prefix):
+                if base < self._snapshot_seq:
+                    os.remove(old)
+
+    def _write_snapshot(self) -> None:
+        snapshot = {
+            "seq": self._seq,
+            "orders": [order_to_record(order) for order in self._orders_repo.get_all()],
+            "events": [[event.order_id, event.type.value] for event in self._events_repo.get_all()],
+        }
+        path = self._path(_SNAPSHOT_PREFIX, self._seq, ".json")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(snapshot, fh, separators=(",", ":"))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+        self._snapshot_seq = self._seq
+
+    def _apply(self, orders: list[list], events: list[list]) -> None:
+        for record in orders:
+            self._orders_repo.save(order_from_record(record))
+        for order_id, type_ in events:
+            self._events_repo.append(Event(order_id=order_id, type=OrderStatus(type_)))
+
+    def _path(self, prefix: str, seq: int, extension: str) -> str:
+        return os.path.join(self._directory, f"{prefix}{seq:012d}{extension}")
+
+    def _files(self, prefix: str) -> list[tuple[int, str]]:
+        """(sequence number, path) of the finished files with `prefix`, oldest first."""
+        extension = ".json" if prefix == _SNAPSHOT_PREFIX else ".jsonl"
+        files = []
+        for name in os.listdir(self._directory):
+            if name.startswith(prefix) and name.endswith(extension):
+                files.append((int(name[len(prefix) : -len(extension)]), os.path.join(self._directory, name)))
+        return sorted(files)
+
+
+def _read_records(path: str) -> list[dict]:
+    records = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+    return records
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import heapq
+import mmap
+import os
+import struct
+import threading
+from array import array
+from collections.abc import Iterable, Iterator
+
+from app.domain.entities import Event, OrderStatus
+from app.domain.ports import EventRepositoryPort, TransactionPort
+
+_STATUSES: list[OrderStatus] = list(OrderStatus)
+_STATUS_CODES: dict[OrderStatus, int] = {status: code for code, status in enumerate(_STATUSES)}
+
+# status code, order number, sequence number + 1 of the order's previous event (0: none)
+_RECORD = struct.Struct("<BIQ")
+# committed record count
+_HEADS_HEADER = struct.Struct("<Q")
+_HEAD = struct.Struct("<Q")
+
+_ORDERS_FILE = "orders.txt"
+_HEADS_FILE = "heads.idx"
+
+
+class MmapEventRepository(EventRepositoryPort, TransactionPort):
+    """
+    Append-only event log on local disk, read through mmap.
+
+    Events are fixed-size records stored in preallocated segment files of `segment_records`
+    records each, so an event's sequence number is also its location. Every record points back to
+    the previous event of the same order, and `heads.idx` keeps, per order number, the latest
+    event of that order plus the number of committed records; `orders.txt` maps order numbers to
+    order ids. Per-order reads follow the chain from the head, full scans walk the mapped segments
+    with `struct.iter_unpack`, and nothing is parsed into Python objects until it is returned.
+
+    The repository is also the batch transaction: appends go to the mapped segments right away,
+    and `commit()` syncs the segments, the new order ids and the index heads once for the whole
+    batch (group fsync), then writes and syncs the committed count. Records past the committed
+    count are ignored on open, so a batch that was not committed, or a crash in the middle of one,
+    leaves no trace.
+    """
+
+    def __init__(self, directory: str, segment_records: int = 1 << 20) -> None:
+        """
+        Args:
+            directory: Directory holding the log; created if missing.
+            segment_records: Capacity of each segment file, in records. Must not change for an
+                existing log.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._segment_records = segment_records
+        self._segments: list[mmap.mmap] = []
+        self._lock = threading.RLock()
+
+        orders_path = os.path.join(directory, _ORDERS_FILE)
+        with open(orders_path, "a+", encoding="utf-8") as fh:
+            fh.seek(0)
+            self._order_ids: list[str] = fh.read().splitlines()
+        self._order_numbers = {order_id: number for number, order_id in enumerate(self._order_ids)}
+        self._orders_file = open(orders_path, "a", encoding="utf-8")
+        self._persisted_orders = len(self._order_ids)
+
+        self._heads_fd = os.open(os.path.join(directory, _HEADS_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+        raw = os.pread(self._heads_fd, _HEADS_HEADER.size + _HEAD.size * len(self._order_ids), 0)
+        self._committed = _HEADS_HEADER.unpack_from(raw)[0] if len(raw) >= _HEADS_HEADER.size else 0
+        self._heads = array("Q", raw[_HEADS_HEADER.size :])
+        self._heads.extend([0] * (len(self._order_ids) - len(self._heads)))
+        self._count = self._committed
+        written = max(self._committed, max(self._heads, default=0))
+        for _ in range((written + segment_records - 1) // segment_records):
+            self._open_segment()
+        self._repair_heads()
+
+        self._changed_heads: dict[int, int] = {}
+
+    # -- EventRepositoryPort ------------------------------------------------------------------
+
+    def append(self, event: Event) -> None:
+        with self._lock:
+            number = self._order_numbers.get(event.order_id)
+            if number is None:
+                number = self._order_numbers[event.order_id] = len(self._order_ids)
+                self._order_ids.append(event.order_id)
+                self._heads.append(0)
+            seq = self._count
+            segment_index, slot = divmod(seq, self._segment_records)
+            if segment_index == len(self._segments):
+                self._open_segment()
+            self._changed_heads.setdefault(number, self._heads[number])
+            segment = self._segments[segment_index]
+            _RECORD.pack_into(segment, slot * _RECORD.size, _STATUS_CODES[event.type], number, self._heads[number])
+            self._heads[number] = seq + 1
+            self._count = seq + 1
+
+    def get_by_order_id(self, order_id: str) -> list[Event]:
+        with self._lock:
+            number = self._order_numbers.get(order_id)
+            if number is None:
+                return []
+            return [Event(order_id=order_id, type=_STATUSES[self._read(seq)[0]]) for seq in self._chain(number)]
+
+    def get_by_order_ids(self, order_ids: Iterable[str]) -> list[Event]:
+        """
+        Return the events of several orders, in append order.
+
+        Args:
+            order_ids: Orders whose events are requested; duplicates and unknown ids are ignored.
+
+        Returns:
+            list[Event]: Matching events, merged by their sequence number.
+        """
+        with self._lock:
+            numbers = self._order_numbers
+            chains = [self._chain(numbers[oid]) for oid in set(order_ids) if oid in numbers]
+            events = []
+            for seq in heapq.merge(*chains):
+                code, number, _ = self._read(seq)
+                events.append(Event(order_id=self._order_ids[number], type=_STATUSES[code]))
+            return events
+
+    def get_all(self) -> list[Event]:
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator[Event]:
+        """Yield every event in append order straight from the mapped segments."""
+        with self._lock:
+            count = self._count
+            segments = list(self._segments)
+        order_ids = self._order_ids
+        for segment_index, segment in enumerate(segments):
+            records = min(self._segment_records, count - segment_index * self._segment_records)
+            if records <= 0:
+                break
+            view = memoryview(segment)[: records * _RECORD.size]
+            try:
+                for code, number, _ in _RECORD.iter_unpack(view):
+                    yield Event(order_id=order_ids[number], type=_STATUSES[code])
+            finally:
+                view.release()
+
+    # -- TransactionPort ----------------------------------------------------------------------
+
+    def begin(self) -> None:
+        pass
+
+    def commit(self) -> None:
+        with self._lock:
+            if self._count == self._committed:
+                return
+            first_segment = self._committed // self._segment_records
+            for segment in self._segments[first_segment:]:
+                segment.flush()
+            if self._persisted_orders < len(self._order_ids):
+                self._orders_file.write("".join(f"{oid}\n" for oid in self._order_ids[self._persisted_orders :]))
+                self._orders_file.flush()
+                os.fsync(self._orders_file.fileno())
+                self._persisted_orders = len(self._order_ids)
+            for number in self._changed_heads:
+                os.pwrite(self._heads_fd, _HEAD.pack(self._heads[number]), _HEADS_HEADER.size + number * _HEAD.size)
+            # The committed count is written last, and only once the heads are on disk: until it
+            # lands the new records do not exist, and a head can never lag behind it.
+            os.fsync(self._heads_fd)
+            os.pwrite(self._heads_fd, _HEADS_HEADER.pack(self._count), 0)
+            os.fsync(self._heads_fd)
+            self._committed = self._count
+            self._changed_heads.clear()
+
+    def rollback(self) -> None:
+        with self._lock:
+            for number, head in self._changed_heads.items():
+                self._heads[number] = head
+            self._changed_heads.clear()
+            self._count = self._committed
+
+    def close(self) -> None:
+        with self._lock:
+            for segment in self._segments:
+                segment.close()
+            self._segments.clear()
+            self._orders_file.close()
+            os.close(self._heads_fd)
+
+    # -- internals ----------------------------------------------------------------------------
+
+    def _open_segment(self) -> None:
+        path = os.path.join(self._directory, f"events-{len(self._segments):06d}.log")
+        size = self._segment_records * _RECORD.size
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            self._segments.append(mmap.mmap(fd, size))
+        finally:
+            os.close(fd)
+
+    def _read(self, seq: int) -> tuple[int, int, int]:
+        segment_index, slot = divmod(seq, self._segment_records)
+        return _RECORD.unpack_from(self._segments[segment_index], slot * _RECORD.size)
+
+    def _chain(self, number: int) -> list[int]:
+        """Sequence numbers of an order's events, oldest first."""
+        seqs = []
+        link = self._heads[number]
+        while link:
+            seqs.append(link - 1)
+            link = self._read(link - 1)[2]
+        seqs.reverse()
+        return seqs
+
+    def _repair_heads(self) -> None:
+        # Heads are written before the committed count, so after a crash some may point past it;
+        # walking back along the chain finds the last committed event of those orders.
+        for number, link in enumerate(self._heads):
+            while link > self._committed:
+                link = self._read(link - 1)[2]
+            self._heads[number] = link
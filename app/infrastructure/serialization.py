@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from app.domain.entities import Component, OrderStatus, RepairOrder, Service
+from app.domain.money import Money
+
+# Compact, JSON-friendly encodings of the domain objects shared by the persistent adapters.
+# Amounts are integer cents; the running aggregates of an order are derived on load, not stored.
+
+
+def order_to_record(order: RepairOrder) -> list:
+    return [
+        order.order_id,
+        order.customer,
+        order.vehicle,
+        order.status.value,
+        order.authorized,
+        int(order.subtotal_estimated),
+        int_or_none(order.authorized_amount),
+        int_or_none(order.real_total),
+        services_to_record(order.services),
+        order.version,
+    ]
+
+
+def order_from_record(record: list) -> RepairOrder:
+    # Records written before orders were versioned have no trailing version.
+    order_id, customer, vehicle, status, authorized, subtotal, authorized_amount, real_total, services = record[:9]
+    return build_order(
+        order_id=order_id,
+        customer=customer,
+        vehicle=vehicle,
+        status=OrderStatus(status),
+        authorized=bool(authorized),
+        subtotal_estimated=Money(subtotal),
+        authorized_amount=money_or_none(authorized_amount),
+        real_total=money_or_none(real_total),
+        services=services_from_record(services),
+        version=record[9] if len(record) > 9 else 0,
+    )
+
+
+def build_order(services: list[Service], **fields) -> RepairOrder:
+    """Build a stored order, deriving its running aggregates from the services."""
+    return RepairOrder(
+        services=services,
+        estimated_total=sum((estimated_cost(svc) for svc in services), Money(0)),
+        real_cost_total=sum((svc.real_cost for svc in services if svc.real_cost is not None), Money(0)),
+        services_ready=sum(1 for svc in services if svc.completed and svc.real_cost is not None),
+        **fields,
+    )
+
+
+def services_to_record(services: list[Service]) -> list:
+    return [
+        [
+            svc.index,
+            svc.description,
+            int(svc.labor_estimated_cost),
+            int_or_none(svc.real_cost),
+            svc.completed,
+            [[c.description, int(c.estimated_cost)] for c in svc.components],
+        ]
+        for svc in services
+    ]
+
+
+def services_from_record(record: list) -> list[Service]:
+    return [
+        Service(
+            index=index,
+            description=description,
+            labor_estimated_cost=Money(labor_estimated_cost),
+            real_cost=money_or_none(real_cost),
+            completed=completed,
+            components=[Component(description=c[0], estimated_cost=Money(c[1])) for c in components],
+        )
+        for index, description, labor_estimated_cost, real_cost, completed, components in record
+    ]
+
+
+def estimated_cost(service: Service) -> Money:
+    return sum((c.estimated_cost for c in service.components), service.labor_estimated_cost)
+
+
+def money_or_none(cents: int | None) -> Money | None:
+    return None if cents is None else Money(cents)
+
+
+def int_or_none(amount: Money | None) -> int | None:
+    return None if amount is None else int(amount)
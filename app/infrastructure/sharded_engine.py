@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import heapq
+import multiprocessing
+import zlib
+from array import array
+from collections.abc import Iterator
+from multiprocessing.connection import Connection
+
+from app.application.dtos import CommandDTO, ErrorViewDTO, EventViewDTO, OrderViewDTO, ResultDTO
+from app.application.orders_service import OrderService
+from app.domain.entities import Event
+from app.infrastructure import wire
+from app.infrastructure.in_memory_repos import InMemoryEventRepository, InMemoryOrderRepository
+
+
+class ShardExecutionError(RuntimeError):
+    """A shard failed a command, died or answered out of turn; see ShardedEngine.execute."""
+
+
+class ShardedEngine:
+    """
+    Runs batches on a pool of worker processes, each owning the orders of one shard.
+
+    Orders are hash-partitioned by order_id (crc32, so the assignment is stable across runs) and
+    every shard keeps its own in-memory repositories for the lifetime of the engine. A batch is
+    split by shard, sent over a pipe in the `wire` format, executed in parallel and merged back by
+    command position and event stamp, so the ResultDTO matches OrderService.execute on the same
+    history. Commands without an order_id go to shard 0.
+
+    A batch is not atomic across shards: each shard commits its part on its own, so when one of
+    them fails a command, the others keep their changes and a ShardExecutionError is raised. Commands
+    with an `idempotency_key` are rejected, since the shards keep no idempotency store.
+    """
+
+    def __init__(self, shards: int, start_method: str | None = None) -> None:
+        context = multiprocessing.get_context(start_method)
+        self._batch = 0
+        # Set once a shard dies or answers out of turn; the engine is unusable from then on.
+        self._broken: str | None = None
+        self._connections: list[Connection] = []
+        self._processes = []
+        for _ in range(shards):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(target=_shard_main, args=(child_conn,), daemon=True)
+            process.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+
+    def __enter__(self) -> ShardedEngine:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for conn in self._connections:
+            try:
+                conn.send_bytes(b"")
+            except OSError:
+                pass  # The shard is already gone.
+            conn.close()
+        for process in self._processes:
+            process.join()
+        self._connections = []
+        self._processes = []
+
+    def shard_of(self, order_id: str) -> int:
+        return zlib.crc32(order_id.encode()) % len(self._connections)
+
+    def execute(self, commands: list[CommandDTO]) -> ResultDTO:
+        """
+        Raises:
+            ValueError: If a command carries an `idempotency_key`; nothing is run.
+            ShardExecutionError: If a shard failed a command (the other shards keep their changes),
+                or a shard died or answered another batch, which leaves the engine unusable.
+        """
+        if self._broken is not None:
+            raise ShardExecutionError(self._broken)
+        if any(cmd.idempotency_key is not None for cmd in commands):
+            raise ValueError("ShardedEngine no admite comandos con 'idempotency_key'.")
+        self._batch += 1
+        batch = self._batch
+        order_ids: dict[str, None] = {}
+        per_shard: list[list[tuple[int, CommandDTO]]] = [[] for _ in self._connections]
+        for position, cmd in enumerate(commands):
+            order_id: str = cmd.data.get("order_id", "")
+            if order_id:
+                order_ids[order_id] = None
+            per_shard[self.shard_of(order_id) if order_id else 0].append((position, cmd))
+
+        busy = [shard for shard, shard_commands in enumerate(per_shard) if shard_commands]
+        for shard in busy:
+            try:
+                self._connections[shard].send_bytes(wire.encode_commands(batch, per_shard[shard]))
+            except OSError:
+                raise self._break(f"El shard {shard} terminó inesperadamente.") from None
+
+        replies = []
+        failures = []
+        for shard in busy:
+            try:
+                kind, reply_batch, body = wire.decode_reply(self._connections[shard].recv_bytes())
+            except (EOFError, OSError):
+                raise self._break(f"El shard {shard} terminó inesperadamente.") from None
+            if reply_batch != batch:
+                raise self._break(f"El shard {shard} respondió el lote {reply_batch} en lugar del {batch}.")
+            if kind == wire.FAILURE:
+                failures.append((shard, body))
+            else:
+                replies.append(body)
+        if failures:
+            shard, (position, error_type, message) = min(failures, key=lambda f: f[1][0])
+            raise ShardExecutionError(f"Shard {shard} falló en el comando {position}: {error_type}: {message}")
+
+        errors = [
+            ErrorViewDTO(op=op, order_id=order_id, code=code, message=message)
+            for _, cmd_errors in heapq.merge(*(reply[0] for reply in replies))
+            for op, order_id, code, message in cmd_errors
+        ]
+        views_by_id = {row[0]: row for reply in replies for row in reply[1]}
+        orders = [
+            OrderViewDTO(
+                order_id=row[0],
+                status=row[1],
+                customer=row[2],
+                vehicle=row[3],
+                subtotal_estimated=row[4],
+                authorized_amount=row[5],
+                real_total=row[6],
+            )
+            for row in (views_by_id.get(order_id) for order_id in order_ids)
+            if row is not None
+        ]
+        events = [
+            EventViewDTO(order_id=order_id, type=type_)
+            for _, order_id, type_ in heapq.merge(*(reply[2] for reply in replies))
+        ]
+        return ResultDTO(orders=orders, events=events, errors=errors)
+
+    def _break(self, message: str) -> ShardExecutionError:
+        # Replies still pending in the other pipes would be read as the next batch's.
+        self._broken = message
+        return ShardExecutionError(message)
+
+
+def _shard_main(conn: Connection) -> None:
+    orders_repo = InMemoryOrderRepository()
+    events_repo = InMemoryEventRepository()
+    service = OrderService(orders_repo=orders_repo, events_repo=events_repo)
+    # Batch and position of every stored event, packed as `batch << 32 | position` and aligned with
+    # events_repo.get_by_order_id(order_id): one uint64 per event, like the store's own columns.
+    stamps: dict[str, array] = {}
+
+    while True:
+        message = conn.recv_bytes()
+        if not message:
+            break
+        batch, commands = wire.decode_commands(message)
+        outcomes, failure = service.execute_positioned(commands)
+        if failure is not None:
+            conn.send_bytes(wire.encode_failure(batch, *failure))
+            continue
+
+        error_rows = []
+        for position, cmd_errors, cmd_events in outcomes:
+            if cmd_errors:
+                error_rows.append((position, [(e.op, e.order_id, e.code, e.message) for e in cmd_errors]))
+            for event in cmd_events:
+                order_stamps = stamps.get(event.order_id)
+                if order_stamps is None:
+                    order_stamps = stamps[event.order_id] = array("Q")
+                order_stamps.append(batch << 32 | position)
+
+        order_ids = dict.fromkeys(cmd.data.get("order_id", "") for _, cmd in commands)
+        order_ids.pop("", None)
+        order_rows = []
+        event_rows = []
+        for order_id in order_ids:
+            order = orders_repo.get_by_id(order_id)
+            if order is None:
+                continue
+            order_rows.append(
+                (
+                    order.order_id,
+                    order.status.value,
+                    order.customer,
+                    order.vehicle,
+                    order.subtotal_estimated.to_float(),
+                    None if order.authorized_amount is None else order.authorized_amount.to_float(),
+                    None if order.real_total is None else order.real_total.to_float(),
+                )
+            )
+            event_rows.extend(_event_rows(stamps.get(order_id, ()), events_repo.get_by_order_id(order_id)))
+        event_rows.sort()
+        conn.send_bytes(wire.encode_result(batch, (error_rows, order_rows, event_rows)))
+    conn.close()
+
+
+def _event_rows(stamps: array | tuple, events: list[Event]) -> Iterator[tuple]:
+    # Events of one command share their packed stamp and are stored in order, so their index within
+    # the command is recovered by counting.
+    previous, index = -1, 0
+    for stamp, event in zip(stamps, events):
+        index = index + 1 if stamp == previous else 0
+        previous = stamp
+        yield (stamp >> 32, stamp & 0xFFFFFFFF, index), event.order_id, event.type.value
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterable
+
+from app.domain.entities import Event, OrderStatus, RepairOrder
+from app.domain.money import Money
+from app.domain.ports import EventRepositoryPort, OrderQueryPort, OrderRepositoryPort, TransactionPort
+from app.infrastructure.serialization import (
+    build_order,
+    int_or_none,
+    money_or_none,
+    services_from_record,
+    services_to_record,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    order_id TEXT PRIMARY KEY,
+    customer TEXT NOT NULL,
+    vehicle TEXT NOT NULL,
+    status TEXT NOT NULL,
+    authorized INTEGER NOT NULL,
+    subtotal_estimated INTEGER NOT NULL,
+    authorized_amount INTEGER,
+    real_total INTEGER,
+    services TEXT NOT NULL,
+    created_seq INTEGER,
+    version INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id TEXT NOT NULL,
+    type TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_events_order_id_seq ON events (order_id, seq);
+"""
+
+# Read-side indexes, created after _migrate() so older databases have `created_seq` by then.
+_INDEXES = """
+CREATE UNIQUE INDEX IF NOT EXISTS idx_orders_created_seq ON orders (created_seq);
+CREATE INDEX IF NOT EXISTS idx_orders_status_seq ON orders (status, created_seq);
+CREATE INDEX IF NOT EXISTS idx_orders_customer_seq ON orders (customer, created_seq);
+CREATE INDEX IF NOT EXISTS idx_orders_vehicle_seq ON orders (vehicle, created_seq);
+"""
+
+# Amounts are stored as integer cents (see Money).
+# Statements are kept as module constants so sqlite3's statement cache always reuses the same
+# prepared statement (the multi-order lookup passes its ids as one JSON parameter for that reason).
+_ORDER_COLUMNS = (
+    "order_id, customer, vehicle, status, authorized, subtotal_estimated, authorized_amount, real_total, services, "
+    "version"
+)
+_SELECT_ORDER = f"SELECT {_ORDER_COLUMNS} FROM orders WHERE order_id = ?"
+# `created_seq` is only set on insert: it orders the read-side queries and is their cursor.
+_UPSERT_ORDER = """
+INSERT INTO orders (
+    order_id, customer, vehicle, status, authorized, subtotal_estimated, authorized_amount, real_total, services,
+    version, created_seq
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(created_seq), -1) + 1 FROM orders))
+ON CONFLICT (order_id) DO UPDATE SET
+    customer = excluded.customer,
+    vehicle = excluded.vehicle,
+    status = excluded.status,
+    authorized = excluded.authorized,
+    subtotal_estimated = excluded.subtotal_estimated,
+    authorized_amount = excluded.authorized_amount,
+    real_total = excluded.real_total,
+    services = excluded.services,
+    version = excluded.version
+"""
+# One statement per combination of filters, keyed by (status, customer, vehicle) being given.
+_FIND_ORDERS: dict[tuple[bool, bool, bool], str] = {
+    (by_status, by_customer, by_vehicle): (
+        f"SELECT {_ORDER_COLUMNS}, created_seq FROM orders WHERE "
+        + "".join(
+            condition
+            for given, condition in (
+                (by_status, "status = ? AND "),
+                (by_customer, "customer = ? AND "),
+                (by_vehicle, "vehicle = ? AND "),
+            )
+            if given
+        )
+        + "created_seq > ? ORDER BY created_seq LIMIT ?"
+    )
+    for by_status in (False, True)
+    for by_customer in (False, True)
+    for by_vehicle in (False, True)
+}
+_INSERT_EVENT = "INSERT INTO events (order_id, type) VALUES (?, ?)"
+_SELECT_EVENTS_BY_ORDER = "SELECT order_id, type FROM events WHERE order_id = ? ORDER BY seq"
+_SELECT_EVENTS_BY_ORDERS = (
+    "SELECT order_id, type FROM events WHERE order_id IN (SELECT value FROM json_each(?)) ORDER BY seq"
+)
+_SELECT_ALL_EVENTS = "SELECT order_id, type FROM events ORDER BY seq"
+
+
+class SqliteDatabase(TransactionPort):
+    """
+    Shared SQLite connection in WAL mode.
+
+    Outside of a transaction every statement commits on its own; OrderService wraps each batch in
+    begin()/commit() so all its writes land in a single transaction.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False, cached_statements=64)
+        self._lock = threading.RLock()
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._conn.executescript(_INDEXES)
+
+    def begin(self) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN")
+
+    def commit(self) -> None:
+        with self._lock:
+            self._conn.execute("COMMIT")
+
+    def rollback(self) -> None:
+        with self._lock:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def execute(self, sql: str, params: tuple = ()) -> None:
+        with self._lock:
+            self._conn.execute(sql, params)
+
+    def fetch_one(self, sql: str, params: tuple = ()) -> tuple | None:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def fetch_all(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _migrate(self) -> None:
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(orders)")}
+        if "created_seq" not in columns:
+            # Databases created before the read-side queries: number the existing orders by id.
+            self._conn.execute("ALTER TABLE orders ADD COLUMN created_seq INTEGER")
+            self._conn.execute(
+                "UPDATE orders SET created_seq = (SELECT COUNT(*) FROM orders AS o WHERE o.order_id < orders.order_id)"
+            )
+        if "version" not in columns:
+            self._conn.execute("ALTER TABLE orders ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+
+class SqliteOrderRepository(OrderRepositoryPort, OrderQueryPort):
+    def __init__(self, database: SqliteDatabase) -> None:
+        self._db = database
+
+    def get_by_id(self, order_id: str) -> RepairOrder | None:
+        row = self._db.fetch_one(_SELECT_ORDER, (order_id,))
+        if row is None:
+            return None
+        return _order_from_row(row)
+
+    def find(
+        self,
+        status: OrderStatus | None = None,
+        customer: str | None = None,
+        vehicle: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+    ) -> tuple[list[RepairOrder], str | None]:
+        if cursor is not None and not cursor.isdigit():
+            raise ValueError(f"Cursor inválido: {cursor!r}.")
+        filters = (status, customer, vehicle)
+        params = [value.value if isinstance(value, OrderStatus) else value for value in filters if value is not None]
+        params += [-1 if cursor is None else int(cursor), limit + 1]
+        sql = _FIND_ORDERS[(status is not None, customer is not None, vehicle is not None)]
+        rows = self._db.fetch_all(sql, tuple(params))
+        if len(rows) <= limit:
+            return [_order_from_row(row) for row in rows], None
+        rows = rows[:limit]
+        return [_order_from_row(row) for row in rows], str(rows[-1][10])
+
+    def save(self, order: RepairOrder) -> RepairOrder:
+        self._db.execute(
+            _UPSERT_ORDER,
+            (
+                order.order_id,
+                order.customer,
+                order.vehicle,
+                order.status.value,
+                int(order.authorized),
+                int(order.subtotal_estimated),
+                int_or_none(order.authorized_amount),
+                int_or_none(order.real_total),
+                json.dumps(services_to_record(order.services), separators=(",", ":")),
+                order.version,
+            ),
+        )
+        return order
+
+
+class SqliteEventRepository(EventRepositoryPort):
+    def __init__(self, database: SqliteDatabase) -> None:
+        self._db = database
+
+    def append(self, event: Event) -> None:
+        self._db.execute(_INSERT_EVENT, (event.order_id, event.type.value))
+
+    def get_by_order_id(self, order_id: str) -> list[Event]:
+        return _events_from_rows(self._db.fetch_all(_SELECT_EVENTS_BY_ORDER, (order_id,)))
+
+    def get_by_order_ids(self, order_ids: Iterable[str]) -> list[Event]:
+        return _events_from_rows(self._db.fetch_all(_SELECT_EVENTS_BY_ORDERS, (json.dumps(list(set(order_ids))),)))
+
+    def get_all(self) -> list[Event]:
+        return _events_from_rows(self._db.fetch_all(_SELECT_ALL_EVENTS))
+
+
+def _order_from_row(row: tuple) -> RepairOrder:
+    return build_order(
+        order_id=row[0],
+        customer=row[1],
+        vehicle=row[2],
+        status=OrderStatus(row[3]),
+        authorized=bool(row[4]),
+        subtotal_estimated=Money(row[5]),
+        authorized_amount=money_or_none(row[6]),
+        real_total=money_or_none(row[7]),
+        services=services_from_record(json.loads(row[8])),
+        version=row[9],
+    )
+
+
+def _events_from_rows(rows: list[tuple]) -> list[Event]:
+    return [Event(order_id=order_id, type=OrderStatus(type_)) for order_id, type_ in rows]
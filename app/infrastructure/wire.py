@@ -0,0 +1,61 @@
+"""
+Binary wire format between ShardedEngine and its shard processes.
+
+Every message is a fixed header (magic, kind, batch number) followed by a `marshal` body made only
+of tuples, lists, dicts and scalars; both ends run the same interpreter, so marshal is the most
+compact and fastest encoding the standard library offers for these shapes.
+"""
+
+from __future__ import annotations
+
+import marshal
+import struct
+
+from app.application.dtos import CommandDTO
+
+_HEADER = struct.Struct("<4sBI")
+_MAGIC = b"ROW1"
+
+COMMANDS = 1
+RESULT = 2
+FAILURE = 3
+
+# Shard results, as plain tuples:
+# errors: (position, [(op, order_id, code, message), ...]) for every command that produced errors
+# orders: (order_id, status, customer, vehicle, subtotal_estimated, authorized_amount, real_total)
+# events: ((batch, position, index), order_id, type), sorted by their stamp
+ShardResult = tuple[list[tuple], list[tuple], list[tuple]]
+
+
+def encode_commands(batch: int, commands: list[tuple[int, CommandDTO]]) -> bytes:
+    # `idempotency_key` is not carried: ShardedEngine rejects keyed commands before encoding them.
+    body = [(position, cmd.op, cmd.ts.isoformat(), cmd.data) for position, cmd in commands]
+    return _HEADER.pack(_MAGIC, COMMANDS, batch) + marshal.dumps(body)
+
+
+def decode_commands(message: bytes) -> tuple[int, list[tuple[int, CommandDTO]]]:
+    batch, body = _decode(message, COMMANDS)
+    return batch, [(position, CommandDTO(op=op, ts=ts, data=data)) for position, op, ts, data in body]
+
+
+def encode_result(batch: int, result: ShardResult) -> bytes:
+    return _HEADER.pack(_MAGIC, RESULT, batch) + marshal.dumps(result)
+
+
+def encode_failure(batch: int, position: int, error: BaseException) -> bytes:
+    return _HEADER.pack(_MAGIC, FAILURE, batch) + marshal.dumps((position, type(error).__name__, str(error)))
+
+
+def decode_reply(message: bytes) -> tuple[int, int, tuple]:
+    """Return (kind, batch, body) for a RESULT or FAILURE message."""
+    magic, kind, batch = _HEADER.unpack_from(message)
+    if magic != _MAGIC or kind not in (RESULT, FAILURE):
+        raise ValueError("Mensaje de shard inválido.")
+    return kind, batch, marshal.loads(message[_HEADER.size :])
+
+
+def _decode(message: bytes, expected_kind: int) -> tuple[int, list]:
+    magic, kind, batch = _HEADER.unpack_from(message)
+    if magic != _MAGIC or kind != expected_kind:
+        raise ValueError("Mensaje de shard inválido.")
+    return batch, marshal.loads(message[_HEADER.size :])
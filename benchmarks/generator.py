@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+
+_START = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+class CommandGenerator:
+    """
+    Deterministic stream of raw commands covering the whole repair order lifecycle.
+
+    Up to `concurrency` orders are open at the same time and their commands are interleaved. Each
+    order follows one scenario, picked with the given weights:
+
+    - happy: services, diagnosis, authorization, real costs within the limit, completion, delivery.
+    - reauth: real costs above 110%, then one or more REAUTHORIZE / TRY_COMPLETE loops.
+    - cancel: cancellation followed by a command that hits the cancelled order.
+    - errors: sequence errors, unknown ops, missing order ids and modifications after authorization.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        concurrency: int = 50,
+        weights: dict[str, float] | None = None,
+        prefix: str = "B",
+    ) -> None:
+        self._rng = random.Random(seed)
+        self._concurrency = concurrency
+        weights = weights or {"happy": 0.6, "reauth": 0.2, "cancel": 0.1, "errors": 0.1}
+        self._scenarios = list(weights)
+        self._weights = list(weights.values())
+        self._prefix = prefix
+        self._tick = 0
+
+    def take(self, count: int) -> list[dict]:
+        stream = iter(self)
+        return [next(stream) for _ in range(count)]
+
+    def __iter__(self) -> Iterator[dict]:
+        rng = self._rng
+        open_orders: list[Iterator[dict]] = []
+        next_order = 0
+        while True:
+            while len(open_orders) < self._concurrency:
+                scenario = rng.choices(self._scenarios, self._weights)[0]
+                order_id = f"{self._prefix}{next_order:08d}"
+                next_order += 1
+                open_orders.append(getattr(self, f"_{scenario}")(order_id))
+            pick = rng.randrange(len(open_orders))
+            try:
+                yield next(open_orders[pick])
+            except StopIteration:
+                open_orders[pick] = open_orders[-1]
+                open_orders.pop()
+
+    def _command(self, op: str, data: dict) -> dict:
+        self._tick += 1
+        ts = _START + timedelta(seconds=self._tick)
+        return {"op": op, "ts": ts.strftime("%Y-%m-%dT%H:%M:%SZ"), "data": data}
+
+    def _setup(self, order_id: str, services: int) -> Iterator[dict]:
+        rng = self._rng
+        customer = f"C{rng.randrange(500):03d}"
+        vehicle = f"V{rng.randrange(5000):04d}"
+        yield self._command("CREATE_ORDER", {"order_id": order_id, "customer": customer, "vehicle": vehicle})
+        for index in range(services):
+            components = [
+                {"description": f"Part {n}", "estimated_cost": f"{rng.randrange(50, 2000)}.{rng.randrange(100):02d}"}
+                for n in range(rng.randrange(4))
+            ]
+            service = {
+                "description": f"Service {index + 1}",
+                "labor_estimated_cost": f"{rng.randrange(100, 5000)}.{rng.randrange(100):02d}",
+                "components": components,
+            }
+            yield self._command("ADD_SERVICE", {"order_id": order_id, "service": service})
+        yield self._command("SET_STATE_DIAGNOSED", {"order_id": order_id})
+        yield self._command("AUTHORIZE", {"order_id": order_id})
+        yield self._command("SET_STATE_IN_PROGRESS", {"order_id": order_id})
+
+    def _set_real_costs(self, order_id: str, services: int, amount: str) -> Iterator[dict]:
+        for index in range(1, services + 1):
+            data = {"order_id": order_id, "service_index": index, "real_cost": amount, "completed": True}
+            yield self._command("SET_REAL_COST", data)
+
+    def _happy(self, order_id: str) -> Iterator[dict]:
+        services = self._rng.randrange(1, 4)
+        yield from self._setup(order_id, services)
+        yield from self._set_real_costs(order_id, services, "100.00")
+        yield self._command("TRY_COMPLETE", {"order_id": order_id})
+        yield self._command("DELIVER", {"order_id": order_id})
+
+    def _reauth(self, order_id: str) -> Iterator[dict]:
+        services = self._rng.randrange(1, 3)
+        yield from self._setup(order_id, services)
+        yield from self._set_real_costs(order_id, services, "999999.00")
+        yield self._command("TRY_COMPLETE", {"order_id": order_id})
+        for _ in range(self._rng.randrange(1, 4)):
+            yield self._command("REAUTHORIZE", {"order_id": order_id, "new_authorized_amount": "100.00"})
+            yield self._command("SET_STATE_IN_PROGRESS", {"order_id": order_id})
+            yield self._command("TRY_COMPLETE", {"order_id": order_id})
+        yield self._command("REAUTHORIZE", {"order_id": order_id, "new_authorized_amount": "99999999.00"})
+        yield self._command("SET_STATE_IN_PROGRESS", {"order_id": order_id})
+        yield self._command("TRY_COMPLETE", {"order_id": order_id})
+        yield self._command("DELIVER", {"order_id": order_id})
+
+    def _cancel(self, order_id: str) -> Iterator[dict]:
+        yield from self._setup(order_id, 1)
+        yield self._command("CANCEL", {"order_id": order_id, "reason": "Customer changed mind"})
+        yield self._command("TRY_COMPLETE", {"order_id": order_id})
+
+    def _errors(self, order_id: str) -> Iterator[dict]:
+        yield self._command("CREATE_ORDER", {"order_id": order_id, "customer": "ERR", "vehicle": "ERR-000"})
+        yield self._command("CREATE_ORDER", {"order_id": order_id, "customer": "ERR", "vehicle": "ERR-000"})
+        yield self._command("AUTHORIZE", {"order_id": order_id})
+        yield self._command("SET_STATE_DIAGNOSED", {"order_id": order_id})
+        yield self._command("AUTHORIZE", {"order_id": order_id})
+        yield self._command("UNKNOWN_OP", {"order_id": order_id})
+        yield self._command("DELIVER", {})
+        yield self._command("DELIVER", {"order_id": f"{order_id}-missing"})
+        yield self._command("SET_STATE_IN_PROGRESS", {"order_id": order_id})
@@ -0,0 +1,148 @@
+"""
+Memory footprint of the in-memory store: slotted entities and the columnar event log against the
+previous layout (the same dataclasses with a per-instance __dict__, one Event object per transition).
+
+Usage:
+    python -m benchmarks.memory --orders 100000 --events-per-order 8 --output memory.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from app.domain.entities import Component, Event, OrderStatus, RepairOrder, Service
+from app.domain.money import Money
+from app.infrastructure.in_memory_repos import InMemoryEventRepository
+
+_TRANSITIONS = [
+    OrderStatus.CREATED,
+    OrderStatus.DIAGNOSED,
+    OrderStatus.AUTHORIZED,
+    OrderStatus.IN_PROGRESS,
+    OrderStatus.WAITING_FOR_APPROVAL,
+    OrderStatus.AUTHORIZED,
+    OrderStatus.COMPLETED,
+    OrderStatus.DELIVERED,
+]
+
+
+@dataclass
+class _DictComponent:
+    description: str
+    estimated_cost: Money
+
+
+@dataclass
+class _DictService:
+    index: int
+    description: str
+    labor_estimated_cost: Money
+    real_cost: Money | None = None
+    components: list = field(default_factory=list)
+    completed: bool = False
+
+
+@dataclass
+class _DictOrder:
+    order_id: str
+    customer: str
+    vehicle: str
+    authorized: bool = False
+    status: OrderStatus = OrderStatus.CREATED
+    services: list = field(default_factory=list)
+    subtotal_estimated: Money = Money(0)
+    authorized_amount: Money = Money(0)
+    real_total: Money = Money(0)
+    estimated_total: Money = Money(0)
+    real_cost_total: Money = Money(0)
+    services_ready: int = 0
+
+
+@dataclass
+class _DictEvent:
+    order_id: str
+    type: OrderStatus
+
+
+def _order_ids(count: int) -> list[str]:
+    return [f"R{i:09d}" for i in range(count)]
+
+
+def _build_orders(order_ids: list[str], order_type: type, service_type: type, component_type: type) -> object:
+    return {
+        oid: order_type(
+            order_id=oid,
+            customer="ACME",
+            vehicle="ABC-123",
+            services=[
+                service_type(1, "Service", Money(100000), Money(110000), [component_type("Part", Money(15000))], True)
+            ],
+        )
+        for oid in order_ids
+    }
+
+
+def _legacy_events(order_ids: list[str], per_order: int) -> object:
+    return [_DictEvent(oid, status) for status in _TRANSITIONS[:per_order] for oid in order_ids]
+
+
+def _columnar_events(order_ids: list[str], per_order: int) -> object:
+    repo = InMemoryEventRepository()
+    for status in _TRANSITIONS[:per_order]:
+        for oid in order_ids:
+            repo.append(Event(order_id=oid, type=status))
+    return repo
+
+
+def _measure(build: Callable[[], object]) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return used
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--events-per-order", type=int, default=len(_TRANSITIONS), choices=range(1, 9))
+    parser.add_argument("--output", default="memory.json")
+    args = parser.parse_args(argv)
+
+    # Order ids are allocated up front so both layouts share the same strings.
+    order_ids = _order_ids(args.orders)
+    events = args.orders * args.events_per_order
+    results = {
+        "orders": {
+            "legacy_bytes": _measure(lambda: _build_orders(order_ids, _DictOrder, _DictService, _DictComponent)),
+            "slotted_bytes": _measure(lambda: _build_orders(order_ids, RepairOrder, Service, Component)),
+            "count": args.orders,
+        },
+        "events": {
+            "legacy_bytes": _measure(lambda: _legacy_events(order_ids, args.events_per_order)),
+            "columnar_bytes": _measure(lambda: _columnar_events(order_ids, args.events_per_order)),
+            "count": events,
+        },
+    }
+    for name, row in results.items():
+        legacy, current = row["legacy_bytes"], row.get("slotted_bytes", row.get("columnar_bytes"))
+        row["reduction"] = round(1 - current / legacy, 3)
+        print(
+            f"{name:<7} {row['count']:>10} items  {legacy / row['count']:>8.1f} -> {current / row['count']:>8.1f} "
+            f"bytes/item  (-{row['reduction']:.0%})"
+        )
+
+    with open(args.output, "w") as fh:
+        json.dump(results, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Throughput benchmarks for OrderService and the HTTP driver.
+
+Usage:
+    python -m benchmarks.run --sizes 1000,100000,1000000 --output bench.json
+    python -m benchmarks.run --sizes 1000,100000 --baseline bench.json --tolerance 0.10
+
+Every target processes `size` generated commands in batches of `--batch-size` against one fresh,
+long-lived service, and reports commands/sec, p50/p99 batch latency and the peak traced memory
+(measured in a second pass, since tracemalloc slows execution down). With `--baseline`, targets
+whose throughput dropped by more than the tolerance are listed and the exit code is 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from app.application.dtos import CommandDTO
+from app.application.orders_service import OrderService
+from app.drivers.http_api import get_order_service
+from app.drivers.json_controller import process_payload, process_payload_fast
+from app.infrastructure.in_memory_repos import InMemoryEventRepository, InMemoryOrderRepository
+from benchmarks.generator import CommandGenerator
+
+# A target receives a fresh service and returns a callable that processes one batch of raw commands.
+Target = Callable[[OrderService], Callable[[list[dict]], object]]
+
+
+def _service_target(service: OrderService) -> Callable[[list[dict]], object]:
+    def run(batch: list[dict]) -> object:
+        commands = [CommandDTO(op=c["op"], ts=c["ts"], data=c["data"]) for c in batch]
+        return service.execute(commands)
+
+    return run
+
+
+def _payload_target(service: OrderService) -> Callable[[list[dict]], object]:
+    return lambda batch: process_payload({"commands": batch}, service)
+
+
+def _payload_fast_target(service: OrderService) -> Callable[[list[dict]], object]:
+    return lambda batch: process_payload_fast({"commands": batch}, service)
+
+
+def _http_target(service: OrderService) -> Callable[[list[dict]], object]:
+    from fastapi.testclient import TestClient
+
+    from main import create_app
+
+    app = create_app()
+    app.dependency_overrides[get_order_service] = lambda: service
+    client = TestClient(app)
+
+    def run(batch: list[dict]) -> object:
+        response = client.post("/process-orders/", json={"commands": batch})
+        response.raise_for_status()
+        return response.content
+
+    return run
+
+
+TARGETS: dict[str, Target] = {
+    "service": _service_target,
+    "payload": _payload_target,
+    "payload_fast": _payload_fast_target,
+    "http": _http_target,
+}
+
+
+def _make_service() -> OrderService:
+    return OrderService(orders_repo=InMemoryOrderRepository(), events_repo=InMemoryEventRepository())
+
+
+def _batches(size: int, batch_size: int, seed: int) -> list[list[dict]]:
+    commands = CommandGenerator(seed=seed).take(size)
+    return [commands[i : i + batch_size] for i in range(0, size, batch_size)]
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_target(target: Target, batches: list[list[dict]], measure_memory: bool = True) -> dict:
+    run = target(_make_service())
+    latencies: list[float] = []
+    started = time.perf_counter()
+    for batch in batches:
+        batch_started = time.perf_counter()
+        run(batch)
+        latencies.append(time.perf_counter() - batch_started)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    commands = sum(len(batch) for batch in batches)
+    result = {
+        "commands": commands,
+        "batches": len(batches),
+        "seconds": round(elapsed, 4),
+        "commands_per_sec": round(commands / elapsed, 1),
+        "p50_batch_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p99_batch_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+    }
+
+    if measure_memory:
+        run = target(_make_service())
+        tracemalloc.start()
+        for batch in batches:
+            run(batch)
+        result["peak_memory_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        tracemalloc.stop()
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        ratio = current["commands_per_sec"] / previous["commands_per_sec"]
+        status = "REGRESSION" if ratio < 1 - tolerance else "ok"
+        before, after = previous["commands_per_sec"], current["commands_per_sec"]
+        print(f"{key:<28} {before:>12.1f} -> {after:>12.1f}  x{ratio:.2f}  {status}")
+        if status == "REGRESSION":
+            regressions.append(key)
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,100000,1000000", help="Comma-separated command counts.")
+    parser.add_argument("--targets", default=",".join(TARGETS), help=f"Subset of: {', '.join(TARGETS)}.")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass.")
+    parser.add_argument("--output", default="bench.json")
+    parser.add_argument("--baseline", help="Previous --output file to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed throughput drop (0.10 = 10%%).")
+    args = parser.parse_args(argv)
+
+    results: dict = {}
+    for size in (int(s) for s in args.sizes.split(",")):
+        batches = _batches(size, args.batch_size, args.seed)
+        for name in args.targets.split(","):
+            key = f"{name}@{size}"
+            results[key] = run_target(TARGETS[name], batches, measure_memory=not args.no_memory)
+            print(key, results[key], flush=True)
+
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "batch_size": args.batch_size,
+        "results": results,
+    }
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)["results"]
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,12 +5,22 @@ import sys
 import uvicorn
 from fastapi import FastAPI
 
-from app.drivers.http_api import router as repair_orders_router
+from app.drivers import cli
+from app.drivers.http_api import get_isolated_order_service, get_order_service, router as repair_orders_router
 
 
-def create_app() -> FastAPI:
+def create_app(isolated: bool = False) -> FastAPI:
+    """
+    Build the FastAPI application.
+
+    Args:
+        isolated: When True every request gets its own empty repositories instead of the
+            process-wide service, which keeps tests independent from each other.
+    """
     app = FastAPI(title="Repair Orders System", version="1.0.0")
     app.include_router(repair_orders_router)
+    if isolated:
+        app.dependency_overrides[get_order_service] = get_isolated_order_service
     return app
 
 
@@ -20,3 +30,5 @@ app = create_app()
 if __name__ == "__main__":
     if len(sys.argv) >= 2 and sys.argv[1] == "run":
         uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    elif len(sys.argv) >= 2:
+        sys.exit(cli.main(sys.argv[1:]))
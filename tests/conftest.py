@@ -0,0 +1,20 @@
+import copy
+
+import pytest
+
+from tests.helpers import LIFECYCLE, TS, order_commands
+
+
+@pytest.fixture
+def lifecycle() -> dict:
+    return copy.deepcopy(LIFECYCLE)
+
+
+@pytest.fixture
+def payload() -> dict:
+    """The lifecycle order, two more orders run to delivery and an AUTHORIZE without order_id."""
+    commands = copy.deepcopy(LIFECYCLE["commands"])
+    for order_id, real_cost in [("R002", "1276.00"), ("R003", "1500.00")]:
+        commands += [dict(item, ts=TS) for item in order_commands(order_id, real_cost)]
+    commands.append({"op": "AUTHORIZE", "ts": TS, "data": {}})
+    return {"commands": commands}
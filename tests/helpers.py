@@ -0,0 +1,90 @@
+"""Builders of services and command batches shared by the test modules."""
+
+import random
+
+from app.application.dtos import CommandDTO
+from app.application.orders_service import OrderService
+from app.domain.ports import EventRepositoryPort, OrderRepositoryPort
+from app.infrastructure.in_memory_repos import InMemoryEventRepository, InMemoryOrderRepository
+
+TS = "2025-03-01T09:00:00Z"
+
+LIFECYCLE = {
+    "commands": [
+        {
+            "op": "CREATE_ORDER",
+            "ts": "2025-03-01T09:00:00Z",
+            "data": {"order_id": "R001", "customer": "ACME", "vehicle": "ABC-123"},
+        },
+        {
+            "op": "ADD_SERVICE",
+            "ts": "2025-03-01T09:05:00Z",
+            "data": {
+                "order_id": "R001",
+                "service": {
+                    "description": "Engine repair",
+                    "labor_estimated_cost": "10000.00",
+                    "components": [{"description": "Oil pump", "estimated_cost": "1500.00"}],
+                },
+            },
+        },
+        {"op": "SET_STATE_DIAGNOSED", "ts": "2025-03-01T09:10:00Z", "data": {"order_id": "R001"}},
+        {"op": "AUTHORIZE", "ts": "2025-03-01T09:11:00Z", "data": {"order_id": "R001"}},
+        {"op": "SET_STATE_IN_PROGRESS", "ts": "2025-03-01T09:15:00Z", "data": {"order_id": "R001"}},
+        {
+            "op": "SET_REAL_COST",
+            "ts": "2025-03-01T09:20:00Z",
+            "data": {"order_id": "R001", "service_index": 1, "real_cost": "15000.00", "completed": True},
+        },
+        {"op": "TRY_COMPLETE", "ts": "2025-03-01T09:25:00Z", "data": {"order_id": "R001"}},
+    ]
+}
+
+
+def make_service(
+    orders_repo: OrderRepositoryPort | None = None, events_repo: EventRepositoryPort | None = None, **options
+) -> OrderService:
+    """Service over the given repositories (fresh in-memory ones by default); `options` go to OrderService."""
+    return OrderService(
+        orders_repo=InMemoryOrderRepository() if orders_repo is None else orders_repo,
+        events_repo=InMemoryEventRepository() if events_repo is None else events_repo,
+        **options,
+    )
+
+
+def order_commands(order_id: str, real_cost: str) -> list[dict]:
+    """The full life of one order, without timestamps, ending with an unknown op."""
+    return [
+        {"op": "CREATE_ORDER", "data": {"order_id": order_id, "customer": "ACME", "vehicle": "ABC-123"}},
+        {
+            "op": "ADD_SERVICE",
+            "data": {
+                "order_id": order_id,
+                "service": {"description": "Service", "labor_estimated_cost": "1000.00", "components": []},
+            },
+        },
+        {"op": "SET_STATE_DIAGNOSED", "data": {"order_id": order_id}},
+        {"op": "AUTHORIZE", "data": {"order_id": order_id}},
+        {"op": "SET_STATE_IN_PROGRESS", "data": {"order_id": order_id}},
+        {
+            "op": "SET_REAL_COST",
+            "data": {"order_id": order_id, "service_index": 1, "real_cost": real_cost, "completed": True},
+        },
+        {"op": "TRY_COMPLETE", "data": {"order_id": order_id}},
+        {"op": "DELIVER", "data": {"order_id": order_id}},
+        {"op": "UNKNOWN_OP", "data": {"order_id": order_id}},
+    ]
+
+
+def interleaved_batch(orders: int) -> list[CommandDTO]:
+    """The commands of `orders` orders, randomly (but reproducibly) interleaved."""
+    rng = random.Random(7)
+    streams = [order_commands(f"R{i:03d}", rng.choice(["1100.00", "1276.00", "1500.00"])) for i in range(orders)]
+    commands: list[CommandDTO] = []
+    while streams:
+        stream = rng.choice(streams)
+        item = stream.pop(0)
+        commands.append(CommandDTO(op=item["op"], ts=TS, data=item["data"]))
+        if not stream:
+            streams.remove(stream)
+    return commands
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.orders_service import BatchDeadlineExceeded, OrderService
+from app.drivers import http_api
+from app.drivers.batch_executor import Backpressure, BatchExecutor, BatchQueueFullError
+from app.drivers.http_api import BatchLimits
+from app.drivers.json_controller import decode_commands
+from app.infrastructure.in_memory_repos import InMemoryEventRepository, InMemoryOrderRepository
+from app.infrastructure.journal import FileJournal
+from main import create_app
+from tests.helpers import make_service
+
+
+def _client(monkeypatch, inline_limit: int, deadline_seconds: float = 30) -> TestClient:
+    limits = BatchLimits(inline_limit=inline_limit, deadline_seconds=deadline_seconds)
+    monkeypatch.setattr(http_api, "get_batch_limits", lambda: limits)
+    return TestClient(create_app(isolated=True))
+
+
+def test_large_batches_go_through_the_executor(monkeypatch, payload):
+    inline = _client(monkeypatch, inline_limit=10_000).post("/process-orders/", json=payload)
+    offloaded = _client(monkeypatch, inline_limit=1).post("/process-orders/", json=payload)
+
+    assert offloaded.status_code == inline.status_code == 200
+    assert offloaded.content == inline.content
+
+
+def test_full_queue_answers_429_with_retry_after(monkeypatch, payload):
+    class FullExecutor:
+        async def submit(self, fn):
+            raise BatchQueueFullError(retry_after=7)
+
+    monkeypatch.setattr(http_api, "get_batch_executor", lambda: FullExecutor())
+
+    response = _client(monkeypatch, inline_limit=1).post("/process-orders/", json=payload)
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "7"
+
+
+def test_expired_deadline_rolls_back_the_batch(monkeypatch, payload):
+    response = _client(monkeypatch, inline_limit=10_000, deadline_seconds=-1).post("/process-orders/", json=payload)
+    assert response.status_code == 503
+
+    service = make_service()
+    with pytest.raises(BatchDeadlineExceeded):
+        service.execute_raw(decode_commands(payload), deadline=time.monotonic() - 1)
+    assert service.load_orders(["R001", "R002"]) == []
+
+
+def test_inline_run_is_skipped_when_a_journal_snapshot_is_due(tmp_path):
+    orders_repo, events_repo = InMemoryOrderRepository(), InMemoryEventRepository()
+    journal = FileJournal(str(tmp_path), orders_repo, events_repo, snapshot_every=2)
+    journal.restore()
+    service = OrderService(orders_repo=orders_repo, events_repo=events_repo, journal=journal)
+    inline = []
+
+    for i in range(3):
+        inline.append(http_api._lock_for_inline_run(service))
+        if inline[-1]:
+            service.unlock()
+        create = {
+            "op": "CREATE_ORDER",
+            "ts": "2025-03-01T09:00:00Z",
+            "data": {"order_id": f"R{i}", "customer": "ACME", "vehicle": "V"},
+        }
+        service.execute_raw(decode_commands({"commands": [create]}))
+    journal.close()
+
+    # The first commit opens the journal segment, the third one reaches snapshot_every.
+    assert inline == [False, True, False]
+    assert service._lock._owner is None
+
+
+def test_executor_rejects_work_beyond_its_queue():
+    async def scenario() -> None:
+        executor = BatchExecutor(workers=1, max_queued=1)
+        release = threading.Event()
+        running = [asyncio.ensure_future(executor.submit(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(BatchQueueFullError) as info:
+            await executor.submit(lambda: None)
+        assert info.value.retry_after >= 1
+
+        release.set()
+        await asyncio.gather(*running)
+        assert await executor.submit(lambda: "ok") == "ok"
+        executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_requests_keep_their_slot_until_the_batch_ends():
+    async def scenario() -> None:
+        executor = BatchExecutor(workers=1, max_queued=1)
+        release = threading.Event()
+        running = asyncio.ensure_future(executor.submit(release.wait))
+        queued = asyncio.ensure_future(executor.submit(lambda: None))
+        await asyncio.sleep(0.05)
+
+        running.cancel()
+        queued.cancel()
+        await asyncio.gather(running, queued, return_exceptions=True)
+        try:
+            # The queued batch never started and is gone; the running one still holds its slot.
+            assert executor.in_flight == 1
+        finally:
+            release.set()
+        await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+        assert executor.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_backpressure_estimates_retry_after_from_recent_batches():
+    backpressure = Backpressure(workers=2, capacity=4)
+    for _ in range(4):
+        backpressure.acquire()
+    for _ in range(30):
+        backpressure.observe(10.0)
+
+    with pytest.raises(BatchQueueFullError) as info:
+        backpressure.acquire()
+    # Four batches of ~10 s on two workers.
+    assert info.value.retry_after == 20
+
+    backpressure.release()
+    backpressure.acquire()
+    assert backpressure.in_flight == 4
@@ -0,0 +1,32 @@
+from app.application.orders_service import HANDLER_TYPES
+from app.domain.errors import ErrorCode
+from app.drivers.json_controller import process_payload_fast
+from benchmarks.generator import CommandGenerator
+from benchmarks.run import TARGETS, run_target
+from tests.helpers import make_service
+
+
+def test_generator_is_deterministic_and_covers_every_op():
+    commands = CommandGenerator(seed=3).take(3000)
+
+    assert commands == CommandGenerator(seed=3).take(3000)
+    assert set(HANDLER_TYPES) <= {c["op"] for c in commands}
+
+
+def test_generated_batch_exercises_error_paths():
+    result = process_payload_fast({"commands": CommandGenerator(seed=3).take(3000)}, make_service())
+
+    codes = {e["code"] for e in result["errors"]}
+    assert {ErrorCode.REQUIRES_REAUTH.value, ErrorCode.ORDER_CANCELLED.value, ErrorCode.SEQUENCE_ERROR.value} <= codes
+    assert {o["status"] for o in result["orders"]} >= {"DELIVERED", "CANCELLED"}
+
+
+def test_run_target_reports_throughput_and_latency():
+    batches = [CommandGenerator().take(200)]
+
+    result = run_target(TARGETS["service"], batches)
+
+    assert result["commands"] == 200
+    assert result["commands_per_sec"] > 0
+    assert result["p50_batch_ms"] <= result["p99_batch_ms"]
+    assert result["peak_memory_mb"] > 0
@@ -0,0 +1,122 @@
+import random
+import time
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application import bulk_pricing
+from app.application.bulk_pricing import scale_half_even
+from app.application.orders_service import BatchDeadlineExceeded
+from app.domain.entities import OrderStatus
+from app.drivers import http_api
+from app.drivers.batch_executor import BatchQueueFullError
+from app.drivers.http_api import BatchLimits
+from app.drivers.json_controller import process_payload_fast, render_json, result_to_dict
+from app.domain.money import Money
+from main import create_app
+from tests.helpers import make_service
+
+TS = "2025-03-01T09:00:00Z"
+
+
+@pytest.mark.parametrize("numpy_installed", [True, False])
+def test_scale_half_even_matches_money_scale(monkeypatch, numpy_installed):
+    vectorized = []
+    if numpy_installed:
+        np = pytest.importorskip("numpy")
+        divmod_ = np.divmod
+        monkeypatch.setattr(np, "divmod", lambda *args: vectorized.append(True) or divmod_(*args))
+    else:
+        monkeypatch.setattr(bulk_pricing, "np", None)
+    rng = random.Random(5)
+    # Ties (x.5 cents after scaling) on both parities, negatives and large amounts.
+    cents = [50, 150, 250, -50, -150, 0, 2**50] + [rng.randrange(-(10**9), 10**9) for _ in range(500)]
+
+    assert scale_half_even(cents, 116, 100) == [int(Money(c).scale(116, 100)) for c in cents]
+    assert scale_half_even(cents, 1, 2) == [int(Money(c).scale(1, 2)) for c in cents]
+    assert len(vectorized) == (2 if numpy_installed else 0)
+    # Products beyond int64 are scaled exactly, without NumPy.
+    assert scale_half_even(cents + [2**62], 116, 100) == [int(Money(c).scale(116, 100)) for c in cents + [2**62]]
+    assert len(vectorized) == (2 if numpy_installed else 0)
+
+
+def _setup(order_id: str, diagnosed: bool = True) -> list[dict]:
+    service = {
+        "description": "Brakes",
+        "labor_estimated_cost": f"{random.Random(order_id).randrange(1, 10**6) / 100:.2f}",
+        "components": [{"description": "Pads", "estimated_cost": "10.05"}],
+    }
+    commands = [
+        {"op": "CREATE_ORDER", "ts": TS, "data": {"order_id": order_id, "customer": "ACME", "vehicle": order_id}},
+        {"op": "ADD_SERVICE", "ts": TS, "data": {"order_id": order_id, "service": service}},
+    ]
+    if diagnosed:
+        commands.append({"op": "SET_STATE_DIAGNOSED", "ts": TS, "data": {"order_id": order_id}})
+    return commands
+
+
+def test_authorize_many_matches_one_authorize_per_order():
+    setup = [cmd for i in range(200) for cmd in _setup(f"F{i:03d}", diagnosed=i % 17 != 0)]
+    setup.append({"op": "CREATE_ORDER", "ts": TS, "data": {"order_id": "EMPTY", "customer": "A", "vehicle": "V"}})
+    setup.append({"op": "SET_STATE_DIAGNOSED", "ts": TS, "data": {"order_id": "EMPTY"}})
+    setup.append({"op": "CANCEL", "ts": TS, "data": {"order_id": "F005"}})
+    order_ids = [f"F{i:03d}" for i in range(200)] + ["F001", "EMPTY", "MISSING"]
+    bulk, sequential = make_service(), make_service()
+    for service in (bulk, sequential):
+        process_payload_fast({"commands": setup}, service)
+
+    bulk_result = result_to_dict(bulk.authorize_many(order_ids, datetime(2025, 3, 1, 9, tzinfo=timezone.utc)))
+    authorize = [{"op": "AUTHORIZE", "ts": TS, "data": {"order_id": order_id}} for order_id in order_ids]
+    sequential_result = process_payload_fast({"commands": authorize}, sequential)
+
+    assert render_json(bulk_result) == render_json(sequential_result)
+    assert bulk.load_orders(order_ids) == sequential.load_orders(order_ids)
+    codes = {e["code"] for e in bulk_result["errors"]}
+    assert codes == {"SEQUENCE_ERROR", "ORDER_CANCELLED", "NO_SERVICES", "INVALID_OPERATION"}
+
+
+def test_authorize_endpoint():
+    client = TestClient(create_app(isolated=True))
+
+    assert client.post("/orders/authorize", json={"ts": TS, "order_ids": "F001"}).status_code == 422
+    response = client.post("/orders/authorize", json={"ts": TS, "order_ids": ["F001"]})
+    assert response.status_code == 200
+    assert [e["order_id"] for e in response.json()["errors"]] == ["F001"]
+
+
+@pytest.mark.parametrize("ts", ["20250301T090000", "2025-W09-6", None])
+def test_authorize_endpoint_rejects_invalid_timestamps(ts):
+    client = TestClient(create_app(isolated=True))
+
+    response = client.post("/orders/authorize", json={"ts": ts, "order_ids": ["F001"]})
+
+    assert response.status_code == 422
+    assert "'ts' inválido" in response.json()["detail"]
+
+
+def test_large_authorizations_go_through_the_executor(monkeypatch):
+    class FullExecutor:
+        async def submit(self, fn):
+            raise BatchQueueFullError(retry_after=7)
+
+    monkeypatch.setattr(http_api, "get_batch_limits", lambda: BatchLimits(inline_limit=1, deadline_seconds=30))
+    monkeypatch.setattr(http_api, "get_batch_executor", lambda: FullExecutor())
+    client = TestClient(create_app(isolated=True))
+
+    assert client.post("/orders/authorize", json={"ts": TS, "order_ids": ["F001"]}).status_code == 200
+    response = client.post("/orders/authorize", json={"ts": TS, "order_ids": ["F001", "F002"]})
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "7"
+
+
+def test_expired_deadline_rolls_back_the_authorizations(monkeypatch):
+    monkeypatch.setattr(http_api, "get_batch_limits", lambda: BatchLimits(inline_limit=20, deadline_seconds=-1))
+    client = TestClient(create_app(isolated=True))
+    assert client.post("/orders/authorize", json={"ts": TS, "order_ids": ["F001"]}).status_code == 503
+
+    service = make_service()
+    process_payload_fast({"commands": _setup("F001")}, service)
+    with pytest.raises(BatchDeadlineExceeded):
+        service.authorize_many(["F001"], datetime(2025, 3, 1, 9, tzinfo=timezone.utc), deadline=time.monotonic() - 1)
+    assert service.load_orders(["F001"])[0].status == OrderStatus.DIAGNOSED
@@ -0,0 +1,71 @@
+import json
+import os
+
+import pytest
+
+from app.domain.entities import OrderStatus
+from app.drivers import cli
+from app.drivers.json_controller import process_payload_fast
+from app.infrastructure.columnar_export import MANIFEST, chunk_file, export_columnar
+from benchmarks.generator import CommandGenerator
+from tests.helpers import make_service
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = make_service()
+    process_payload_fast({"commands": CommandGenerator(seed=7).take(3000)}, service)
+    return service
+
+
+def test_export_writes_one_chunk_per_page(service, tmp_path):
+    manifest = export_columnar(cli.iter_order_pages(service, chunk_rows=50), str(tmp_path))
+
+    orders, _ = service.find_orders(limit=10_000)
+    events = service.load_events([order.order_id for order in orders])
+    assert sum(manifest["tables"]["orders"]["chunks"]) == len(orders)
+    assert max(manifest["tables"]["orders"]["chunks"]) == 50
+    assert sum(manifest["tables"]["services"]["chunks"]) == sum(len(order.services) for order in orders)
+    assert sum(manifest["tables"]["events"]["chunks"]) == len(events)
+    with open(tmp_path / MANIFEST) as fh:
+        assert json.load(fh) == manifest
+    with open(tmp_path / chunk_file("orders", 0, "status"), "rb") as fh:
+        magic, header_len = fh.read(8), int.from_bytes(fh.read(2), "little")
+        assert magic == b"\x93NUMPY\x01\x00" and (10 + header_len) % 64 == 0
+        assert len(fh.read()) - header_len == 50
+
+
+def test_kpis_match_a_replay_of_the_repositories(service, tmp_path):
+    pytest.importorskip("numpy")
+    from app.infrastructure.columnar_kpis import compute_kpis
+
+    export_columnar(cli.iter_order_pages(service, chunk_rows=64), str(tmp_path))
+    kpis = compute_kpis(str(tmp_path))
+
+    orders, _ = service.find_orders(limit=10_000)
+    events = service.load_events([order.order_id for order in orders])
+    authorized = {e.order_id for e in events if e.type is OrderStatus.AUTHORIZED}
+    reauth = {e.order_id for e in events if e.type is OrderStatus.WAITING_FOR_APPROVAL} & authorized
+    assert kpis["orders"] == len(orders)
+    assert kpis["orders_by_status"]["DELIVERED"] == sum(o.status is OrderStatus.DELIVERED for o in orders)
+    assert kpis["authorized_orders"] == len(authorized)
+    assert kpis["authorized_total"] == sum(int(o.authorized_amount) for o in orders if o.order_id in authorized) / 100
+    assert kpis["reauth_rate"] == len(reauth) / len(authorized)
+
+
+def test_kpis_reject_incomplete_exports(tmp_path):
+    pytest.importorskip("numpy")
+    from app.infrastructure.columnar_kpis import compute_kpis
+
+    with pytest.raises(ValueError):
+        compute_kpis(str(tmp_path))
+    assert not os.listdir(tmp_path)
+
+
+def test_export_requires_a_persisted_state(monkeypatch, tmp_path, capsys):
+    monkeypatch.delenv("REPAIR_ORDERS_DB", raising=False)
+    monkeypatch.delenv("REPAIR_ORDERS_JOURNAL", raising=False)
+
+    assert cli.main(["export", str(tmp_path / "export")]) == 1
+    assert "REPAIR_ORDERS_DB" in capsys.readouterr().err
+    assert not os.path.exists(tmp_path / "export")
@@ -0,0 +1,42 @@
+from fastapi.testclient import TestClient
+
+from app.application.dtos import CommandDTO
+from app.drivers.http_api import get_order_service
+from app.drivers.json_controller import process_payload, process_payload_fast
+from app.infrastructure.in_memory_repos import InMemoryEventRepository, InMemoryOrderRepository
+from main import create_app
+from tests.helpers import make_service
+
+
+def test_dry_run_returns_the_real_result_without_committing(payload):
+    commands = payload["commands"]
+    orders_repo, events_repo = InMemoryOrderRepository(), InMemoryEventRepository()
+    simulated, real, real_dto = make_service(orders_repo, events_repo), make_service(), make_service()
+    # Some state before the batch, so the simulation has to read through to the repositories.
+    for service in (simulated, real, real_dto):
+        process_payload({"commands": commands[:3]}, service)
+    before = (orders_repo.get_all(), events_repo.get_all())
+    original_services = [list(order.services) for order in before[0]]
+
+    dry = process_payload_fast({"commands": commands[3:]}, simulated, dry_run=True)
+    dry_dto = simulated.execute([CommandDTO(**cmd) for cmd in commands[3:]], dry_run=True)
+
+    assert (orders_repo.get_all(), events_repo.get_all()) == before
+    assert [list(order.services) for order in orders_repo.get_all()] == original_services
+    assert dry == process_payload({"commands": commands[3:]}, real)
+    assert dry_dto == real_dto.execute([CommandDTO(**cmd) for cmd in commands[3:]])
+    assert any(error["code"] == "REQUIRES_REAUTH" for error in dry["errors"])
+
+
+def test_http_dry_run_query_parameter(payload):
+    orders_repo = InMemoryOrderRepository()
+    service = make_service(orders_repo)
+    app = create_app()
+    app.dependency_overrides[get_order_service] = lambda: service
+    client = TestClient(app)
+
+    response = client.post("/process-orders/?dry_run=true", json=payload)
+
+    assert response.status_code == 200
+    assert response.json()["orders"]
+    assert orders_repo.get_all() == []
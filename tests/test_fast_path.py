@@ -0,0 +1,61 @@
+import pytest
+from pydantic import ValidationError
+
+from app.application.dtos import CommandDTO
+from app.drivers.json_controller import (
+    InvalidPayloadError,
+    decode_commands,
+    process_payload,
+    process_payload_fast,
+    render_json,
+)
+from tests.helpers import make_service
+
+
+def test_fast_path_output_is_byte_identical(payload):
+    expected = render_json(process_payload(payload, make_service()))
+    result = render_json(process_payload_fast(payload, make_service()))
+
+    assert result == expected
+
+
+@pytest.mark.parametrize("ts", [1700000000, "1700000000", "2025-03-01T09:00:00+01:00"])
+def test_fast_path_accepts_the_timestamps_of_the_pydantic_path(ts):
+    payload = {
+        "commands": [
+            {"op": "CREATE_ORDER", "ts": ts, "data": {"order_id": "R001", "customer": "ACME", "vehicle": "ABC-123"}}
+        ]
+    }
+
+    assert process_payload_fast(payload, make_service()) == process_payload(payload, make_service())
+    assert decode_commands(payload)[0].ts == CommandDTO(op="CREATE_ORDER", ts=ts, data={}).ts
+
+
+@pytest.mark.parametrize("ts", ["20250301T090000", "2025-W09-6", None, True])
+def test_fast_path_rejects_the_timestamps_of_the_pydantic_path(ts):
+    payload = {
+        "commands": [
+            {"op": "CREATE_ORDER", "ts": ts, "data": {"order_id": "R001", "customer": "ACME", "vehicle": "ABC-123"}}
+        ]
+    }
+
+    with pytest.raises(ValidationError):
+        process_payload(payload, make_service())
+    with pytest.raises(InvalidPayloadError):
+        process_payload_fast(payload, make_service())
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"commands": {}},
+        {"commands": [{"ts": "2025-03-01T09:00:00Z"}]},
+        {"commands": [{"op": "CANCEL", "ts": "2025-03-01T09:00:00Z", "data": []}]},
+        {"commands": ["CANCEL"]},
+        {"commands": [{"op": "CANCEL", "ts": "ayer", "data": {}}]},
+        {"commands": [{"op": "CANCEL", "ts": "2025-13-01T09:00:00Z", "data": {}}]},
+    ],
+)
+def test_decode_commands_rejects_malformed_envelopes(payload: dict):
+    with pytest.raises(InvalidPayloadError):
+        decode_commands(payload)
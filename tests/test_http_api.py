@@ -0,0 +1,37 @@
+from app.drivers.http_api import get_isolated_order_service, get_order_service
+from app.drivers.json_controller import process_payload
+from main import create_app
+
+
+def _create_order_payload(order_id: str) -> dict:
+    return {
+        "commands": [
+            {
+                "op": "CREATE_ORDER",
+                "ts": "2025-03-01T09:00:00Z",
+                "data": {"order_id": order_id, "customer": "ACME", "vehicle": "ABC-123"},
+            },
+        ]
+    }
+
+
+def test_shared_service_keeps_state_across_requests():
+    assert get_order_service() is get_order_service()
+
+    process_payload(_create_order_payload("SHARED-001"), get_order_service())
+    payload = {
+        "commands": [{"op": "SET_STATE_DIAGNOSED", "ts": "2025-03-01T09:10:00Z", "data": {"order_id": "SHARED-001"}}]
+    }
+    result = process_payload(payload, get_order_service())
+
+    assert result["errors"] == []
+    assert result["orders"][0]["status"] == "DIAGNOSED"
+    assert [e["type"] for e in result["events"]] == ["CREATED", "DIAGNOSED"]
+
+
+def test_isolated_app_uses_per_request_services():
+    app = create_app(isolated=True)
+
+    assert app.dependency_overrides[get_order_service] is get_isolated_order_service
+    assert get_isolated_order_service() is not get_isolated_order_service()
+    assert create_app().dependency_overrides == {}
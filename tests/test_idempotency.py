@@ -0,0 +1,114 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.dtos import Command
+from app.application.idempotency import IdempotencyStore
+from app.application.instrumentation import MetricsRegistry
+from app.drivers.http_api import get_order_service
+from app.drivers.json_controller import process_payload_fast
+from main import create_app
+from tests.helpers import make_service
+
+
+def _keyed(key: str, op: str, **data) -> dict:
+    return {"op": op, "ts": "2025-03-01T09:00:00Z", "data": data, "idempotency_key": key}
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_keyed_commands_are_not_run_again(workers):
+    service = make_service(workers=workers, idempotency=IdempotencyStore())
+    create = _keyed("k1", "CREATE_ORDER", order_id="R001", customer="ACME", vehicle="ABC-123")
+    cancel = _keyed("k2", "CANCEL", order_id="R002")
+
+    first = process_payload_fast({"commands": [create, cancel]}, service)
+    reused = _keyed("k1", "CANCEL", order_id="R001")
+    retry = process_payload_fast({"commands": [cancel, create, create, reused]}, service)
+
+    assert [e["op"] for e in first["errors"]] == ["CANCEL"]
+    # The retries report their original errors; reusing a key for another command is rejected.
+    assert retry["errors"][0] == first["errors"][0]
+    assert retry["errors"][1]["message"] == "La clave de idempotencia 'k1' ya se usó en otro comando."
+    assert len(retry["errors"]) == 2
+    assert [o["status"] for o in retry["orders"]] == ["CREATED"]
+    assert len(retry["events"]) == 1
+
+
+def test_keys_of_a_rolled_back_batch_are_not_recorded():
+    service = make_service(idempotency=IdempotencyStore())
+    data = {"order_id": "R001", "customer": "ACME", "vehicle": "ABC-123"}
+    create = Command("CREATE_ORDER", datetime(2025, 3, 1, 9, tzinfo=timezone.utc), data, idempotency_key="k1")
+
+    def failing_batch():
+        yield create
+        raise RuntimeError("conexión perdida")
+
+    with pytest.raises(RuntimeError):
+        service.execute_raw(failing_batch())
+    result = service.execute_raw([create])
+
+    assert result.errors == []
+    assert [order.order_id for order in result.orders] == ["R001"]
+
+
+def test_batch_key_header_returns_the_original_response(payload):
+    service = make_service(idempotency=IdempotencyStore())
+    app = create_app()
+    app.dependency_overrides[get_order_service] = lambda: service
+    client = TestClient(app)
+    headers = {"Idempotency-Key": "batch-1"}
+
+    first = client.post("/process-orders/", json=payload, headers=headers)
+    retry = client.post("/process-orders/", json=payload, headers=headers)
+    events_after_retry = service.load_events(["R001", "R002", "R003"])
+    unkeyed = client.post("/process-orders/", json=payload)
+
+    assert retry.content == first.content
+    assert len(events_after_retry) == len(first.json()["events"])
+    assert unkeyed.content != first.content
+
+
+def test_batch_key_reused_for_another_payload_is_rejected(payload):
+    service = make_service(idempotency=IdempotencyStore())
+    app = create_app()
+    app.dependency_overrides[get_order_service] = lambda: service
+    client = TestClient(app)
+    headers = {"Idempotency-Key": "batch-1"}
+    other = {"commands": payload["commands"][:1]}
+
+    first = client.post("/process-orders/", json=payload, headers=headers)
+    reused = client.post("/process-orders/", json=other, headers=headers)
+
+    assert first.status_code == 200
+    assert reused.status_code == 422
+    assert reused.json()["detail"] == "La clave de idempotencia 'batch-1' ya se usó con otro lote."
+
+
+def test_replayed_batches_do_not_count_rejected_commands_again():
+    metrics = MetricsRegistry()
+    service = make_service(instrumentation=metrics, idempotency=IdempotencyStore())
+    payload = {"commands": [{"op": "CANCEL", "ts": "2025-03-01T09:00:00Z", "data": {}}]}
+
+    for _ in range(2):
+        result = process_payload_fast(payload, service, idempotency_key="batch-1")
+
+    assert [e["code"] for e in result["errors"]] == ["INVALID_OPERATION"]
+    assert 'repair_orders_errors_total{code="INVALID_OPERATION"} 1' in metrics.render_prometheus()
+
+
+def test_store_evicts_by_age_and_size():
+    now = [0.0]
+    store = IdempotencyStore(ttl_seconds=10, max_items=5, clock=lambda: now[0])
+
+    store.put("a", 1, weight=2)
+    now[0] = 5
+    store.put("b", 2, weight=2)
+    store.put("c", 3, weight=2)
+    assert store.get("a") is None and store.get("b") == 2
+
+    now[0] = 14
+    assert store.get("b") == 2
+    now[0] = 15
+    assert store.get("b") is None and store.get("c") is None
+    assert len(store) == 0
@@ -0,0 +1,57 @@
+import json
+
+from app.domain.entities import Event, OrderStatus, RepairOrder
+from app.infrastructure.in_memory_repos import InMemoryEventRepository
+from benchmarks import memory
+
+
+def _event_repo_with_history() -> InMemoryEventRepository:
+    events_repo = InMemoryEventRepository()
+    events_repo.append(Event(order_id="R001", type=OrderStatus.CREATED))
+    events_repo.append(Event(order_id="R002", type=OrderStatus.CREATED))
+    events_repo.append(Event(order_id="R003", type=OrderStatus.CREATED))
+    events_repo.append(Event(order_id="R001", type=OrderStatus.DIAGNOSED))
+    events_repo.append(Event(order_id="R002", type=OrderStatus.CANCELLED))
+    events_repo.append(Event(order_id="R001", type=OrderStatus.AUTHORIZED))
+    return events_repo
+
+
+def test_get_by_order_id_uses_append_order():
+    events_repo = _event_repo_with_history()
+
+    events = events_repo.get_by_order_id("R001")
+
+    assert [e.type for e in events] == [OrderStatus.CREATED, OrderStatus.DIAGNOSED, OrderStatus.AUTHORIZED]
+    assert events_repo.get_by_order_id("R999") == []
+
+
+def test_get_by_order_ids_keeps_global_order():
+    events_repo = _event_repo_with_history()
+
+    events = events_repo.get_by_order_ids({"R001", "R002", "R999"})
+
+    assert [(e.order_id, e.type) for e in events] == [
+        ("R001", OrderStatus.CREATED),
+        ("R002", OrderStatus.CREATED),
+        ("R001", OrderStatus.DIAGNOSED),
+        ("R002", OrderStatus.CANCELLED),
+        ("R001", OrderStatus.AUTHORIZED),
+    ]
+    assert [e for e in events_repo.get_all() if e.order_id in ("R001", "R002")] == events
+
+
+def test_entities_have_no_instance_dict():
+    event = Event(order_id="R001", type=OrderStatus.CREATED)
+
+    assert not hasattr(event, "__dict__")
+    assert not hasattr(RepairOrder(order_id="R001", customer="ACME", vehicle="ABC-123"), "__dict__")
+
+
+def test_memory_benchmark_reports_smaller_layouts(tmp_path):
+    output = tmp_path / "memory.json"
+
+    memory.main(["--orders", "2000", "--output", str(output)])
+    results = json.loads(output.read_text())
+
+    assert results["events"]["columnar_bytes"] < results["events"]["legacy_bytes"]
+    assert results["orders"]["slotted_bytes"] < results["orders"]["legacy_bytes"]
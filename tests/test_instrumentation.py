@@ -0,0 +1,40 @@
+from fastapi.testclient import TestClient
+
+from app.application.instrumentation import MetricsRegistry
+from app.application.orders_service import OrderService
+from app.drivers import http_api
+from app.drivers.json_controller import process_payload_fast
+from app.infrastructure.in_memory_repos import InMemoryEventRepository, InMemoryOrderRepository
+from main import create_app
+
+
+def test_registry_counts_ops_errors_and_repository_calls(payload):
+    metrics = MetricsRegistry()
+    service = OrderService(
+        orders_repo=InMemoryOrderRepository(), events_repo=InMemoryEventRepository(), instrumentation=metrics
+    )
+
+    result = process_payload_fast(payload, service)
+    text = metrics.render_prometheus()
+
+    assert 'repair_orders_commands_total{op="CREATE_ORDER"} 3' in text
+    assert 'repair_orders_command_duration_seconds_count{op="TRY_COMPLETE"} 3' in text
+    assert 'repair_orders_command_duration_seconds_bucket{op="TRY_COMPLETE",le="+Inf"} 3' in text
+    requires_reauth = sum(1 for e in result["errors"] if e["code"] == "REQUIRES_REAUTH")
+    assert f'repair_orders_errors_total{{code="REQUIRES_REAUTH"}} {requires_reauth}' in text
+    invalid = sum(1 for e in result["errors"] if e["code"] == "INVALID_OPERATION")
+    assert invalid > 0
+    assert f'repair_orders_errors_total{{code="INVALID_OPERATION"}} {invalid}' in text
+    assert 'repair_orders_repository_calls_total{repository="orders",method="save"} 3' in text
+
+
+def test_metrics_endpoint_renders_prometheus_text(monkeypatch):
+    registry = MetricsRegistry()
+    registry.observe_command("CANCEL", 0.002)
+    monkeypatch.setattr(http_api, "get_metrics_registry", lambda: registry)
+
+    response = TestClient(create_app(isolated=True)).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'repair_orders_command_duration_seconds_bucket{op="CANCEL",le="0.005"} 1' in response.text
@@ -0,0 +1,89 @@
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from app.drivers.http_api import get_job_manager
+from app.drivers.jobs import Job, JobManager, JobStatus, JobStore
+from app.drivers.json_controller import process_payload_fast
+from main import create_app
+from tests.helpers import make_service
+
+
+def _wait(client: TestClient, job_id: str) -> dict:
+    for _ in range(200):
+        progress = client.get(f"/jobs/{job_id}").json()
+        if progress["status"] in ("SUCCEEDED", "FAILED"):
+            return progress
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_job_runs_in_background_and_serves_its_result(payload):
+    manager = JobManager(make_service(), JobStore())
+    app = create_app()
+    app.dependency_overrides[get_job_manager] = lambda: manager
+    client = TestClient(app)
+    expected = process_payload_fast(payload, make_service())
+
+    submitted = client.post("/jobs/", json=payload)
+    assert submitted.status_code == 202
+    job_id = submitted.json()["job_id"]
+    progress = _wait(client, job_id)
+
+    assert progress["processed"] == progress["total"] == len(payload["commands"])
+    assert progress["errors"] == len(expected["errors"])
+    pages, offset = [], 0
+    while offset is not None:
+        page = client.get(f"/jobs/{job_id}/result", params={"offset": offset, "limit": 4}).json()
+        pages.append(page)
+        offset = page["next_offset"]
+    assert len(pages) > 1
+    for key in ("orders", "events", "errors"):
+        assert [item for page in pages for item in page[key]] == expected[key]
+
+    lines = [json.loads(line) for line in client.get(f"/jobs/{job_id}/result/stream").iter_lines() if line]
+    assert [line["order"] for line in lines if "order" in line] == expected["orders"]
+    assert client.get("/jobs/unknown").status_code == 404
+    manager.shutdown()
+
+
+def test_unfinished_job_has_no_result_and_full_queue_is_rejected(payload):
+    service = make_service()
+    manager = JobManager(service, JobStore(), max_pending=1)
+    app = create_app()
+    app.dependency_overrides[get_job_manager] = lambda: manager
+    client = TestClient(app)
+
+    service.try_lock()
+    try:
+        job_id = client.post("/jobs/", json=payload).json()["job_id"]
+        assert client.get(f"/jobs/{job_id}/result").status_code == 409
+        rejected = client.post("/jobs/", json=payload)
+        assert rejected.status_code == 429
+        assert int(rejected.headers["retry-after"]) >= 1
+    finally:
+        service.unlock()
+    assert _wait(client, job_id)["status"] == "SUCCEEDED"
+    manager.shutdown()
+
+
+def test_store_evicts_least_recently_used_results():
+    store = JobStore(max_items=10)
+    jobs = []
+    for index in range(3):
+        job = Job(f"J{index}", total=1)
+        job.status, job.size, job.result = JobStatus.SUCCEEDED, 4, {}
+        store.add(job)
+        jobs.append(job)
+    running = Job("RUNNING", total=1)
+    store.add(running)
+
+    store.finish(jobs[0])
+    store.finish(jobs[1])
+    store.get("J0")
+    store.finish(jobs[2])
+
+    assert store.get("J1") is None
+    assert store.get("J0") is jobs[0] and store.get("J2") is jobs[2]
+    assert store.get("RUNNING") is running
@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+from app.application.dtos import CommandDTO
+from app.application.orders_service import OrderService
+from app.infrastructure.in_memory_repos import InMemoryEventRepository, InMemoryOrderRepository
+from app.infrastructure.journal import FileJournal
+from tests.helpers import interleaved_batch
+
+
+def _journaled_service(directory: str, snapshot_every: int) -> tuple[OrderService, FileJournal, int]:
+    orders_repo = InMemoryOrderRepository()
+    events_repo = InMemoryEventRepository()
+    journal = FileJournal(directory, orders_repo, events_repo, snapshot_every=snapshot_every)
+    replayed = journal.restore()
+    return OrderService(orders_repo=orders_repo, events_repo=events_repo, journal=journal), journal, replayed
+
+
+@pytest.fixture
+def batches() -> list[list[CommandDTO]]:
+    commands = interleaved_batch(10)
+    return [commands[i : i + 7] for i in range(0, len(commands), 7)]
+
+
+def test_restore_rebuilds_the_same_state(tmp_path, batches):
+    service, journal, _ = _journaled_service(str(tmp_path), snapshot_every=3)
+    for batch in batches:
+        service.execute(batch)
+    journal.close()
+
+    restored, _, replayed = _journaled_service(str(tmp_path), snapshot_every=3)
+
+    order_ids = [f"R{i:03d}" for i in range(10)]
+    assert replayed <= 3
+    assert restored.load_orders(order_ids) == service.load_orders(order_ids)
+    assert restored._events_repo.get_all() == service._events_repo.get_all()
+    assert len([name for name in os.listdir(tmp_path) if name.startswith("snapshot-")]) == 1
+
+
+def test_restored_service_keeps_journaling(tmp_path, batches):
+    service, journal, _ = _journaled_service(str(tmp_path), snapshot_every=4)
+    for batch in batches[:5]:
+        service.execute(batch)
+    journal.close()
+
+    restored, journal, _ = _journaled_service(str(tmp_path), snapshot_every=4)
+    for batch in batches[5:]:
+        restored.execute(batch)
+    journal.close()
+    reference = OrderService(orders_repo=InMemoryOrderRepository(), events_repo=InMemoryEventRepository())
+    for batch in batches:
+        reference.execute(batch)
+
+    final, _, _ = _journaled_service(str(tmp_path), snapshot_every=4)
+
+    order_ids = [f"R{i:03d}" for i in range(10)]
+    assert final.load_orders(order_ids) == reference.load_orders(order_ids)
+    assert final._events_repo.get_all() == reference._events_repo.get_all()
+
+
+def test_torn_last_record_is_ignored(tmp_path, batches):
+    service, journal, _ = _journaled_service(str(tmp_path), snapshot_every=100)
+    service.execute(batches[0])
+    service.execute(batches[1])
+    journal.close()
+    (segment,) = [name for name in os.listdir(tmp_path) if name.startswith("journal-")]
+    with open(tmp_path / segment, "a", encoding="utf-8") as fh:
+        fh.write('{"seq":3,"orders":[["R0')
+
+    restored, _, replayed = _journaled_service(str(tmp_path), snapshot_every=100)
+
+    assert replayed == 2
+    assert restored._events_repo.get_all() == service._events_repo.get_all()
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from app.application.orders_service import OrderService
+from app.domain.entities import Event, OrderStatus
+from app.infrastructure.in_memory_repos import InMemoryEventRepository, InMemoryOrderRepository
+from app.infrastructure import mmap_event_log
+from app.infrastructure.mmap_event_log import MmapEventRepository
+from tests.helpers import interleaved_batch
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    return str(tmp_path / "events")
+
+
+def test_service_events_match_in_memory_store(log_dir):
+    commands = interleaved_batch(12)
+    event_log = MmapEventRepository(log_dir, segment_records=16)
+    service = OrderService(orders_repo=InMemoryOrderRepository(), events_repo=event_log, transaction=event_log)
+    reference_events = InMemoryEventRepository()
+    reference = OrderService(orders_repo=InMemoryOrderRepository(), events_repo=reference_events)
+
+    for start in range(0, len(commands), 10):
+        assert service.execute(commands[start : start + 10]) == reference.execute(commands[start : start + 10])
+    event_log.close()
+
+    reopened = MmapEventRepository(log_dir, segment_records=16)
+    assert reopened.get_all() == reference_events.get_all()
+    assert list(reopened.iter_all()) == reference_events.get_all()
+    assert reopened.get_by_order_id("R003") == reference_events.get_by_order_id("R003")
+    assert reopened.get_by_order_ids(["R001", "R007", "NOPE"]) == reference_events.get_by_order_ids(["R001", "R007"])
+
+
+def test_uncommitted_appends_are_discarded(log_dir):
+    event_log = MmapEventRepository(log_dir, segment_records=4)
+    for status in (OrderStatus.CREATED, OrderStatus.DIAGNOSED):
+        event_log.append(Event(order_id="A", type=status))
+    event_log.commit()
+
+    event_log.append(Event(order_id="A", type=OrderStatus.CANCELLED))
+    event_log.append(Event(order_id="B", type=OrderStatus.CREATED))
+    event_log.rollback()
+    event_log.append(Event(order_id="A", type=OrderStatus.WAITING_FOR_APPROVAL))
+    event_log.commit()
+    event_log.append(Event(order_id="A", type=OrderStatus.CANCELLED))
+    event_log.close()
+
+    reopened = MmapEventRepository(log_dir, segment_records=4)
+    expected = [OrderStatus.CREATED, OrderStatus.DIAGNOSED, OrderStatus.WAITING_FOR_APPROVAL]
+    assert [e.type for e in reopened.get_by_order_id("A")] == expected
+    assert reopened.get_by_order_id("B") == []
+    assert len(reopened.get_all()) == 3
+
+
+def test_heads_are_synced_before_the_committed_count(log_dir, monkeypatch):
+    event_log = MmapEventRepository(log_dir, segment_records=4)
+    heads_fd = event_log._heads_fd
+    calls: list[str] = []
+    pwrite, fsync = os.pwrite, os.fsync
+
+    def recording_pwrite(fd, data, offset):
+        if fd == heads_fd:
+            calls.append("count" if offset == 0 else "head")
+        return pwrite(fd, data, offset)
+
+    def recording_fsync(fd):
+        if fd == heads_fd:
+            calls.append("fsync")
+        return fsync(fd)
+
+    monkeypatch.setattr(mmap_event_log.os, "pwrite", recording_pwrite)
+    monkeypatch.setattr(mmap_event_log.os, "fsync", recording_fsync)
+    event_log.append(Event(order_id="A", type=OrderStatus.CREATED))
+    event_log.append(Event(order_id="B", type=OrderStatus.CREATED))
+    event_log.commit()
+    event_log.close()
+
+    assert calls == ["head", "head", "fsync", "count", "fsync"]
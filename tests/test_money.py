@@ -0,0 +1,50 @@
+import pytest
+
+from app.domain.money import Money
+
+
+@pytest.mark.parametrize(
+    "value, cents",
+    [
+        ("10000.00", 1000000),
+        ("1.5", 150),
+        ("-2.25", -225),
+        ("0.015", 2),
+        ("0.025", 2),
+        (3, 300),
+        (2.675, 268),
+    ],
+)
+def test_parse_rounds_half_even_to_cents(value, cents: int):
+    assert Money.parse(value) == cents
+
+
+@pytest.mark.parametrize("value", ["1e3", "1e400", "nan", "Infinity", "1_000", "", "1000000000000000", 10**15, 1e15])
+def test_parse_rejects_exponents_and_out_of_range_amounts(value):
+    with pytest.raises(ValueError):
+        Money.parse(value)
+
+
+@pytest.mark.parametrize(
+    "cents, numerator, denominator, expected",
+    [
+        (1150000, 116, 100, 1334000),
+        (254115, 110, 100, 279526),
+        (254125, 110, 100, 279538),
+        (5, 1, 10, 0),
+        (15, 1, 10, 2),
+        (-15, 1, 10, -2),
+    ],
+)
+def test_scale_uses_exact_bankers_rounding(cents: int, numerator: int, denominator: int, expected: int):
+    assert Money(cents).scale(numerator, denominator) == expected
+
+
+def test_arithmetic_and_formatting_stay_in_cents():
+    total = sum([Money.parse("0.10"), Money.parse("0.20")], Money(0))
+
+    assert isinstance(total, Money)
+    assert total == 30
+    assert total.to_float() == 0.3
+    assert f"{total:.2f}" == "0.30"
+    assert str(Money(-5)) == "-0.05"
@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import pytest
+from starlette.requests import Request
+
+from app.domain.errors import ErrorCode
+from app.drivers import http_api, json_controller
+from app.drivers.json_controller import process_ndjson, process_payload
+from tests.helpers import make_service
+
+
+@pytest.fixture
+def commands() -> list[dict]:
+    return [
+        {
+            "op": "CREATE_ORDER",
+            "ts": "2025-03-01T09:00:00Z",
+            "data": {"order_id": "R001", "customer": "ACME", "vehicle": "ABC-123"},
+        },
+        {
+            "op": "ADD_SERVICE",
+            "ts": "2025-03-01T09:05:00Z",
+            "data": {
+                "order_id": "R001",
+                "service": {"description": "Simple service", "labor_estimated_cost": "1000.00", "components": []},
+            },
+        },
+        {"op": "SET_STATE_DIAGNOSED", "ts": "2025-03-01T09:10:00Z", "data": {"order_id": "R001"}},
+        {"op": "AUTHORIZE", "ts": "2025-03-01T09:11:00Z", "data": {"order_id": "R001"}},
+        {"op": "DELIVER", "ts": "2025-03-01T09:30:00Z", "data": {"order_id": "R001"}},
+    ]
+
+
+def _read_lines(output) -> dict:
+    result: dict = {"order": [], "event": [], "error": []}
+    for line in output:
+        ((kind, body),) = json.loads(line).items()
+        result[kind].append(body)
+    return result
+
+
+def test_process_ndjson_matches_process_payload(commands: list[dict]):
+    body = b"".join(json.dumps(cmd).encode() + b"\n" for cmd in commands)
+    # Split the body at arbitrary byte offsets so lines straddle chunk boundaries.
+    chunks = [body[i : i + 7] for i in range(0, len(body), 7)]
+
+    streamed = _read_lines(process_ndjson(chunks, make_service()))
+    expected = process_payload({"commands": commands}, make_service())
+
+    assert streamed["order"] == expected["orders"]
+    assert streamed["event"] == expected["events"]
+    assert streamed["error"] == expected["errors"]
+    assert streamed["error"][0]["code"] == ErrorCode.SEQUENCE_ERROR.value
+
+
+def test_process_ndjson_reports_malformed_lines(commands: list[dict]):
+    body = json.dumps(commands[0]).encode() + b'\nnot json\n{"op": "AUTHORIZE"}\n' + json.dumps(commands[2]).encode()
+
+    streamed = _read_lines(process_ndjson([body], make_service()))
+
+    assert [e["op"] for e in streamed["error"]] == ["", "AUTHORIZE"]
+    assert {e["code"] for e in streamed["error"]} == {ErrorCode.INVALID_OPERATION.value}
+    assert streamed["order"][0]["status"] == "DIAGNOSED"
+
+
+def test_closing_lines_are_loaded_page_by_page(monkeypatch):
+    monkeypatch.setattr(json_controller, "CLOSE_PAGE_ORDERS", 2)
+    ts = "2025-03-01T09:00:00Z"
+    commands = [
+        {"op": "CREATE_ORDER", "ts": ts, "data": {"order_id": f"R{i}", "customer": "ACME", "vehicle": "ABC-123"}}
+        for i in range(5)
+    ] + [{"op": "CANCEL", "ts": ts, "data": {"order_id": f"R{i}"}} for i in range(5)]
+    service = make_service()
+    loaded: list[list[str]] = []
+    load_events = service.load_events
+    monkeypatch.setattr(service, "load_events", lambda ids: loaded.append(list(ids)) or load_events(ids))
+
+    body = b"".join(json.dumps(cmd).encode() + b"\n" for cmd in commands)
+    streamed = _read_lines(process_ndjson([body], service))
+    expected = process_payload({"commands": commands}, make_service())
+
+    assert loaded == [["R0", "R1"], ["R2", "R3"], ["R4"]]
+    assert streamed["order"] == expected["orders"]
+    # Each page's events in append order.
+    assert streamed["event"] == [e for page in loaded for e in expected["events"] if e["order_id"] in page]
+
+
+def test_stream_route_matches_process_ndjson(monkeypatch, commands: list[dict]):
+    monkeypatch.setattr(http_api, "STREAM_BATCH_LINES", 1)
+    body = b"".join(json.dumps(cmd).encode() + b"\n" for cmd in commands)
+    chunks = [body[i : i + 50] for i in range(0, len(body), 50)]
+    messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+
+    async def receive() -> dict:
+        return messages.pop(0)
+
+    async def respond() -> list[bytes]:
+        request = Request({"type": "http", "method": "POST", "headers": []}, receive)
+        response = await http_api.process_repair_orders_stream(request, make_service())
+        return [part async for part in response.body_iterator]
+
+    parts = asyncio.run(respond())
+
+    assert b"".join(parts) == b"".join(process_ndjson(chunks, make_service()))
+    # One closing line per trip to the threadpool.
+    assert len(parts) == b"".join(parts).count(b"\n")
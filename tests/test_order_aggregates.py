@@ -0,0 +1,57 @@
+from app.application.orders_service import OrderService
+from app.domain.errors import ErrorCode
+from app.domain.money import Money
+from app.drivers.json_controller import process_payload
+from app.infrastructure.in_memory_repos import InMemoryEventRepository, InMemoryOrderRepository
+
+
+def _command(op: str, **data) -> dict:
+    return {"op": op, "ts": "2025-03-01T09:00:00Z", "data": {"order_id": "R001", **data}}
+
+
+def _service(labor: str, *components: str) -> dict:
+    return {
+        "description": "Service",
+        "labor_estimated_cost": labor,
+        "components": [{"description": "Part", "estimated_cost": cost} for cost in components],
+    }
+
+
+def test_aggregates_follow_added_services_and_real_cost_updates():
+    orders_repo = InMemoryOrderRepository()
+    service = OrderService(orders_repo=orders_repo, events_repo=InMemoryEventRepository())
+    commands = [
+        _command("CREATE_ORDER", customer="ACME", vehicle="ABC-123"),
+        _command("ADD_SERVICE", service=_service("100.10", "50.05", "0.20")),
+        _command("ADD_SERVICE", service=_service("200.00")),
+        _command("SET_STATE_DIAGNOSED"),
+        _command("AUTHORIZE"),
+        _command("SET_STATE_IN_PROGRESS"),
+        _command("SET_REAL_COST", service_index=1, real_cost="150.00", completed=True),
+        _command("SET_REAL_COST", service_index=2, real_cost="999.00", completed=False),
+        _command("TRY_COMPLETE"),
+    ]
+
+    result = process_payload({"commands": commands}, service)
+    order = orders_repo.get_by_id("R001")
+
+    assert order.estimated_total == Money.parse("350.35")
+    assert result["orders"][0]["subtotal_estimated"] == 350.35
+    assert result["orders"][0]["authorized_amount"] == 406.41
+    assert order.real_cost_total == Money.parse("1149.00")
+    assert order.services_ready == 1
+    assert result["errors"][0]["code"] == ErrorCode.SEQUENCE_ERROR.value
+
+    commands = [
+        _command("SET_REAL_COST", service_index=2, real_cost="250.00", completed=True),
+        _command("SET_REAL_COST", service_index=1, real_cost="147.00", completed=True),
+        _command("TRY_COMPLETE"),
+    ]
+    result = process_payload({"commands": commands}, service)
+    order = orders_repo.get_by_id("R001")
+
+    assert order.real_cost_total == Money.parse("397.00")
+    assert order.services_ready == 2
+    assert result["errors"] == []
+    assert result["orders"][0]["status"] == "COMPLETED"
+    assert result["orders"][0]["real_total"] == 397.0
@@ -0,0 +1,106 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.dtos import Command
+from app.application.orders_service import OrderService
+from app.domain.entities import OrderStatus, RepairOrder
+from app.drivers.http_api import get_order_service
+from app.infrastructure.in_memory_repos import InMemoryEventRepository, InMemoryOrderRepository
+from app.infrastructure.sqlite_repos import SqliteDatabase, SqliteOrderRepository
+from main import create_app
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def orders_repo(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryOrderRepository()
+    return SqliteOrderRepository(SqliteDatabase(str(tmp_path / "orders.db")))
+
+
+def _save(repo, order_id: str, customer: str, vehicle: str, status: OrderStatus = OrderStatus.CREATED) -> None:
+    order = RepairOrder(order_id=order_id, customer=customer, vehicle=vehicle)
+    order.status = status
+    repo.save(order)
+
+
+def _ids(orders: list[RepairOrder]) -> list[str]:
+    return [order.order_id for order in orders]
+
+
+def test_find_follows_status_changes_and_combines_filters(orders_repo):
+    _save(orders_repo, "R003", "ACME", "ABC-123")
+    _save(orders_repo, "R001", "ACME", "XYZ-999")
+    _save(orders_repo, "R002", "Globex", "ABC-123")
+    _save(orders_repo, "R003", "ACME", "ABC-123", OrderStatus.WAITING_FOR_APPROVAL)
+
+    assert _ids(orders_repo.find(status=OrderStatus.CREATED)[0]) == ["R001", "R002"]
+    assert _ids(orders_repo.find(status=OrderStatus.WAITING_FOR_APPROVAL)[0]) == ["R003"]
+    assert _ids(orders_repo.find(customer="ACME")[0]) == ["R003", "R001"]
+    assert _ids(orders_repo.find(customer="ACME", vehicle="ABC-123")[0]) == ["R003"]
+    assert _ids(orders_repo.find(status=OrderStatus.CREATED, vehicle="ABC-123")[0]) == ["R002"]
+    assert orders_repo.find(customer="Initech") == ([], None)
+
+
+def test_find_paginates_with_cursor(orders_repo):
+    for i in range(5):
+        _save(orders_repo, f"R{i:03d}", "ACME", f"V{i}")
+
+    pages = []
+    cursor = None
+    while True:
+        orders, cursor = orders_repo.find(customer="ACME", cursor=cursor, limit=2)
+        pages.append(_ids(orders))
+        if cursor is None:
+            break
+
+    assert pages == [["R000", "R001"], ["R002", "R003"], ["R004"]]
+    with pytest.raises(ValueError):
+        orders_repo.find(cursor="nope")
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_parallel_batches_create_orders_in_batch_order(orders_repo, workers):
+    ts = datetime(2025, 3, 1, 9, tzinfo=timezone.utc)
+    # O5 is referenced (and rejected) before it exists, so it must still be created last.
+    commands = [Command("AUTHORIZE", ts, {"order_id": "O5"})] + [
+        Command("CREATE_ORDER", ts, {"order_id": f"O{i}", "customer": "ACME", "vehicle": f"V{i}"}) for i in range(6)
+    ]
+    sequential = OrderService(orders_repo=InMemoryOrderRepository(), events_repo=InMemoryEventRepository())
+    parallel = OrderService(orders_repo=orders_repo, events_repo=InMemoryEventRepository(), workers=workers)
+
+    sequential.execute_raw(commands)
+    parallel.execute_raw(commands)
+
+    expected = [f"O{i}" for i in range(6)]
+    assert _ids(sequential.find_orders()[0]) == _ids(parallel.find_orders()[0]) == expected
+    first_page, cursor = parallel.find_orders(limit=4)
+    assert _ids(first_page) + _ids(parallel.find_orders(cursor=cursor)[0]) == expected
+
+
+def test_order_endpoints():
+    service = OrderService(InMemoryOrderRepository(), InMemoryEventRepository())
+    app = create_app()
+    app.dependency_overrides[get_order_service] = lambda: service
+    client = TestClient(app)
+    commands = [
+        {"op": "CREATE_ORDER", "ts": "2025-03-01T09:00:00Z", "data": {"order_id": oid, "customer": c, "vehicle": v}}
+        for oid, c, v in (("R001", "ACME", "ABC-123"), ("R002", "ACME", "XYZ-999"), ("R003", "Globex", "ABC-123"))
+    ]
+    commands.append({"op": "SET_STATE_DIAGNOSED", "ts": "2025-03-01T09:10:00Z", "data": {"order_id": "R002"}})
+    client.post("/process-orders/", json={"commands": commands})
+
+    first = client.get("/orders/", params={"customer": "ACME", "limit": 1}).json()
+    second = client.get("/orders/", params={"customer": "ACME", "cursor": first["next_cursor"]}).json()
+    diagnosed = client.get("/orders/", params={"status": "DIAGNOSED"}).json()
+    detail = client.get("/orders/R002").json()
+
+    assert [o["order_id"] for o in first["orders"]] == ["R001"]
+    assert [o["order_id"] for o in second["orders"]] == ["R002"] and second["next_cursor"] is None
+    assert [o["order_id"] for o in diagnosed["orders"]] == ["R002"]
+    assert detail["order"]["status"] == "DIAGNOSED"
+    assert [e["type"] for e in detail["events"]] == ["CREATED", "DIAGNOSED"]
+    assert client.get("/orders/R999").status_code == 404
+    assert client.get("/orders/", params={"cursor": "x"}).status_code == 422
+    assert client.get("/orders/", params={"status": "UNKNOWN"}).status_code == 422
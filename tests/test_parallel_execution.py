@@ -0,0 +1,37 @@
+from app.application.dtos import CommandDTO
+from app.application.orders_service import OrderService
+from app.infrastructure.in_memory_repos import InMemoryEventRepository, InMemoryOrderRepository
+from tests.helpers import interleaved_batch
+
+
+def test_parallel_execution_matches_sequential():
+    commands = interleaved_batch(40)
+    sequential_events = InMemoryEventRepository()
+    parallel_events = InMemoryEventRepository()
+    sequential = OrderService(orders_repo=InMemoryOrderRepository(), events_repo=sequential_events)
+    parallel = OrderService(orders_repo=InMemoryOrderRepository(), events_repo=parallel_events, workers=4)
+
+    expected = sequential.execute(commands)
+    result = parallel.execute(commands)
+
+    assert result == expected
+    assert {e.type.value for e in parallel_events.get_all()} >= {"WAITING_FOR_APPROVAL", "DELIVERED"}
+    assert parallel_events.get_all() == sequential_events.get_all()
+
+
+def test_parallel_failure_commits_nothing():
+    commands = interleaved_batch(6)
+    commands.append(CommandDTO(op="ADD_SERVICE", ts="2025-03-01T09:00:00Z", data={"order_id": "R001"}))
+    orders_repo = InMemoryOrderRepository()
+    events_repo = InMemoryEventRepository()
+    parallel = OrderService(orders_repo=orders_repo, events_repo=events_repo, workers=3)
+
+    try:
+        parallel.execute(commands)
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("expected the malformed ADD_SERVICE to fail")
+
+    assert orders_repo.get_by_id("R000") is None
+    assert events_repo.get_all() == []
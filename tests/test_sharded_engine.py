@@ -0,0 +1,84 @@
+import pytest
+
+from app.application.dtos import CommandDTO
+from app.application.orders_service import OrderService
+from app.infrastructure import wire
+from app.infrastructure.in_memory_repos import InMemoryEventRepository, InMemoryOrderRepository
+from app.infrastructure.sharded_engine import ShardedEngine, ShardExecutionError
+from tests.helpers import interleaved_batch
+
+
+def test_wire_round_trips_commands():
+    commands = interleaved_batch(2)
+    positioned = list(enumerate(commands))
+
+    batch, decoded = wire.decode_commands(wire.encode_commands(3, positioned))
+
+    assert batch == 3
+    assert decoded == positioned
+
+
+def test_sharded_engine_matches_sequential_across_batches():
+    commands = interleaved_batch(30)
+    first, second = commands[: len(commands) // 2], commands[len(commands) // 2 :]
+    sequential = OrderService(orders_repo=InMemoryOrderRepository(), events_repo=InMemoryEventRepository())
+
+    with ShardedEngine(shards=3) as engine:
+        assert engine.execute(first) == sequential.execute(first)
+        assert engine.execute(second) == sequential.execute(second)
+
+
+def test_sharded_engine_reports_shard_failures():
+    create = CommandDTO(
+        op="CREATE_ORDER",
+        ts="2025-03-01T09:00:00Z",
+        data={"order_id": "R001", "customer": "ACME", "vehicle": "ABC-123"},
+    )
+    malformed = CommandDTO(op="ADD_SERVICE", ts="2025-03-01T09:05:00Z", data={"order_id": "R001"})
+
+    with ShardedEngine(shards=2) as engine:
+        with pytest.raises(ShardExecutionError, match="KeyError"):
+            engine.execute([create, malformed])
+        assert engine.execute([malformed.model_copy(update={"op": "CANCEL"})]).orders == []
+
+
+def _create(order_id: str) -> CommandDTO:
+    return CommandDTO(
+        op="CREATE_ORDER", ts="2025-03-01T09:00:00Z", data={"order_id": order_id, "customer": "ACME", "vehicle": "V"}
+    )
+
+
+def test_sharded_engine_rejects_keyed_commands():
+    with ShardedEngine(shards=2) as engine:
+        with pytest.raises(ValueError, match="idempotency_key"):
+            engine.execute([_create("R001"), _create("R002").model_copy(update={"idempotency_key": "k"})])
+        assert [order.order_id for order in engine.execute([_create("R001")]).orders] == ["R001"]
+
+
+def test_dead_shard_raises_and_breaks_the_engine():
+    with ShardedEngine(shards=2) as engine:
+        order_id = next(f"R{i:03d}" for i in range(100) if engine.shard_of(f"R{i:03d}") == 1)
+        engine._processes[1].kill()
+        engine._processes[1].join()
+
+        with pytest.raises(ShardExecutionError, match="shard 1 terminó"):
+            engine.execute([_create(order_id)])
+        with pytest.raises(ShardExecutionError, match="shard 1 terminó"):
+            engine.execute([_create("X")])
+
+
+def test_reply_of_another_batch_breaks_the_engine():
+    with ShardedEngine(shards=1) as engine:
+        engine._connections[0].send_bytes(wire.encode_commands(99, []))
+
+        with pytest.raises(ShardExecutionError, match="lote 99 en lugar del 1"):
+            engine.execute([_create("R001")])
+
+
+def test_packed_event_stamps_order_events_across_many_batches():
+    commands = interleaved_batch(10)
+    sequential = OrderService(orders_repo=InMemoryOrderRepository(), events_repo=InMemoryEventRepository())
+
+    with ShardedEngine(shards=2) as engine:
+        for cmd in commands:
+            assert engine.execute([cmd]) == sequential.execute([cmd])
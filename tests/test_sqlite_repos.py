@@ -0,0 +1,96 @@
+import pytest
+
+from app.application.dtos import CommandDTO
+from app.application.orders_service import OrderService
+from app.domain.entities import Component, Event, OrderStatus, RepairOrder, Service
+from app.domain.money import Money
+from app.drivers.json_controller import process_payload
+from app.infrastructure.in_memory_repos import InMemoryEventRepository, InMemoryOrderRepository
+from app.infrastructure.sqlite_repos import SqliteDatabase, SqliteEventRepository, SqliteOrderRepository
+
+
+@pytest.fixture
+def database(tmp_path) -> SqliteDatabase:
+    database = SqliteDatabase(str(tmp_path / "orders.db"))
+    yield database
+    database.close()
+
+
+def _sqlite_service(database: SqliteDatabase) -> OrderService:
+    return OrderService(
+        orders_repo=SqliteOrderRepository(database),
+        events_repo=SqliteEventRepository(database),
+        transaction=database,
+    )
+
+
+def test_sqlite_database_uses_wal(database: SqliteDatabase):
+    assert database.fetch_one("PRAGMA journal_mode") == ("wal",)
+
+
+def test_sqlite_order_repository_round_trip(database: SqliteDatabase):
+    orders_repo = SqliteOrderRepository(database)
+    order = RepairOrder(order_id="R001", customer="ACME", vehicle="ABC-123", status=OrderStatus.IN_PROGRESS)
+    order.services.append(
+        Service(
+            index=1,
+            description="Engine repair",
+            labor_estimated_cost=Money.parse("10000.00"),
+            real_cost=Money.parse("14674.50"),
+            completed=True,
+            components=[Component(description="Oil pump", estimated_cost=Money.parse("1500.00"))],
+        )
+    )
+
+    order.authorized_amount = Money.parse("13340.00")
+    order.estimated_total = Money.parse("11500.00")
+    order.real_cost_total = Money.parse("14674.50")
+    order.services_ready = 1
+    orders_repo.save(order)
+
+    loaded = orders_repo.get_by_id("R001")
+    assert loaded == order
+    assert isinstance(loaded.services[0].real_cost, Money)
+    assert orders_repo.get_by_id("R999") is None
+
+
+def test_sqlite_event_repository_keeps_global_order(database: SqliteDatabase):
+    events_repo = SqliteEventRepository(database)
+    for order_id, type_ in [("R001", "CREATED"), ("R002", "CREATED"), ("R003", "CREATED"), ("R001", "DIAGNOSED")]:
+        events_repo.append(Event(order_id=order_id, type=OrderStatus(type_)))
+
+    events = events_repo.get_by_order_ids(["R001", "R002"])
+
+    assert [(e.order_id, e.type.value) for e in events] == [
+        ("R001", "CREATED"),
+        ("R002", "CREATED"),
+        ("R001", "DIAGNOSED"),
+    ]
+    assert len(events_repo.get_all()) == 4
+
+
+def test_sqlite_service_matches_in_memory_and_persists(tmp_path, database: SqliteDatabase, lifecycle: dict):
+    in_memory = OrderService(orders_repo=InMemoryOrderRepository(), events_repo=InMemoryEventRepository())
+
+    result = process_payload(lifecycle, _sqlite_service(database))
+
+    assert result == process_payload(lifecycle, in_memory)
+    reopened = SqliteDatabase(str(tmp_path / "orders.db"))
+    assert SqliteOrderRepository(reopened).get_by_id("R001").status == OrderStatus.WAITING_FOR_APPROVAL
+    assert len(SqliteEventRepository(reopened).get_by_order_id("R001")) == 5
+    reopened.close()
+
+
+def test_sqlite_service_rolls_back_failed_batch(database: SqliteDatabase, lifecycle: dict):
+    payload = {
+        "commands": [
+            lifecycle["commands"][0],
+            {"op": "ADD_SERVICE", "ts": "2025-03-01T09:05:00Z", "data": {"order_id": "R001"}},
+        ]
+    }
+
+    with pytest.raises(KeyError):
+        _sqlite_service(database).execute([CommandDTO(**cmd) for cmd in payload["commands"]])
+
+    assert SqliteOrderRepository(database).get_by_id("R001") is None
+    assert SqliteEventRepository(database).get_all() == []
@@ -0,0 +1,25 @@
+from app.application.orders_service import HANDLER_TYPES
+from app.domain.entities import OrderStatus
+from app.domain.errors import ErrorCode
+from app.domain.transitions import CANCELLED_VIOLATION, TRANSITION_RULES, TransitionTable
+
+
+def test_every_op_on_an_existing_order_has_a_rule():
+    assert {rule.op for rule in TRANSITION_RULES} == set(HANDLER_TYPES) - {"CREATE_ORDER"}
+
+
+def test_compiled_table_matches_the_rules():
+    table = TransitionTable(TRANSITION_RULES)
+
+    for rule in TRANSITION_RULES:
+        for status in OrderStatus:
+            violation = table.violation(rule.op, status)
+            if status is OrderStatus.CANCELLED:
+                assert violation is CANCELLED_VIOLATION
+            elif status in rule.allowed_from:
+                assert violation is None
+            else:
+                assert violation is rule.violation
+
+    assert table.violation("DELIVER", OrderStatus.IN_PROGRESS).code is ErrorCode.SEQUENCE_ERROR
+    assert table.violation("UNKNOWN_OP", OrderStatus.CANCELLED) is None
@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from app.application.dtos import CommandDTO
+from app.application.orders_service import OrderService
+from app.drivers.json_controller import process_payload
+from app.infrastructure.in_memory_repos import InMemoryEventRepository, InMemoryOrderRepository
+
+
+class CountingOrderRepository(InMemoryOrderRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.saves = 0
+
+    def save(self, order):
+        self.saves += 1
+        return super().save(order)
+
+
+CREATE = {
+    "op": "CREATE_ORDER",
+    "ts": "2025-03-01T09:00:00Z",
+    "data": {"order_id": "R001", "customer": "ACME", "vehicle": "ABC-123"},
+}
+ADD_SERVICE = {
+    "op": "ADD_SERVICE",
+    "ts": "2025-03-01T09:05:00Z",
+    "data": {
+        "order_id": "R001",
+        "service": {"description": "Simple service", "labor_estimated_cost": "1000.00", "components": []},
+    },
+}
+MALFORMED_ADD_SERVICE = {"op": "ADD_SERVICE", "ts": "2025-03-01T09:06:00Z", "data": {"order_id": "R001"}}
+DIAGNOSE = {"op": "SET_STATE_DIAGNOSED", "ts": "2025-03-01T09:10:00Z", "data": {"order_id": "R001"}}
+
+
+def _execute_unvalidated(service: OrderService, commands: list[dict]) -> None:
+    # The drivers reject malformed commands up front; the service itself still fails on them.
+    service.execute([CommandDTO(**cmd) for cmd in commands])
+
+
+def test_batch_saves_each_order_once():
+    orders_repo = CountingOrderRepository()
+    events_repo = InMemoryEventRepository()
+    service = OrderService(orders_repo=orders_repo, events_repo=events_repo)
+
+    result = process_payload({"commands": [CREATE, ADD_SERVICE, ADD_SERVICE, DIAGNOSE]}, service)
+
+    assert orders_repo.saves == 1
+    assert len(orders_repo.get_by_id("R001").services) == 2
+    assert [e["type"] for e in result["events"]] == ["CREATED", "DIAGNOSED"]
+
+
+def test_failed_batch_leaves_repositories_untouched():
+    orders_repo = InMemoryOrderRepository()
+    events_repo = InMemoryEventRepository()
+    service = OrderService(orders_repo=orders_repo, events_repo=events_repo)
+    process_payload({"commands": [CREATE]}, service)
+
+    with pytest.raises(KeyError):
+        _execute_unvalidated(service, [ADD_SERVICE, DIAGNOSE, MALFORMED_ADD_SERVICE])
+
+    order = orders_repo.get_by_id("R001")
+    assert order.services == []
+    assert order.status.value == "CREATED"
+    assert len(events_repo.get_all()) == 1
+
+
+def test_checkpoints_keep_work_before_the_failure():
+    orders_repo = CountingOrderRepository()
+    events_repo = InMemoryEventRepository()
+    service = OrderService(orders_repo=orders_repo, events_repo=events_repo, checkpoint_every=2)
+
+    with pytest.raises(KeyError):
+        _execute_unvalidated(service, [CREATE, ADD_SERVICE, DIAGNOSE, MALFORMED_ADD_SERVICE])
+
+    order = orders_repo.get_by_id("R001")
+    assert len(order.services) == 1
+    assert order.status.value == "CREATED"
+    assert orders_repo.saves == 1
+
+
+def test_waiting_batches_run_between_two_checkpoints():
+    service = OrderService(
+        orders_repo=InMemoryOrderRepository(), events_repo=InMemoryEventRepository(), checkpoint_every=2
+    )
+    small = threading.Thread(target=service.execute, args=([CommandDTO(**CREATE)],))
+    small_committed = []
+
+    def large_batch():
+        for i in range(4):
+            if i == 2:
+                small.start()
+                while not service._lock._waiting:
+                    time.sleep(0.001)
+            if i == 3:
+                small_committed.append(service.load_orders(["R001"]) != [])
+            yield CommandDTO(**dict(CREATE, data=dict(CREATE["data"], order_id=f"L{i}")))
+
+    service.execute_raw(large_batch())
+    small.join()
+
+    # The small batch ran at the checkpoint after L1, before the large batch went on with L2.
+    assert small_committed == [True]
@@ -0,0 +1,146 @@
+import json
+
+import pytest
+
+from app.drivers.json_controller import process_ndjson, process_payload, process_payload_fast
+from tests.helpers import make_service
+
+TS = "2025-03-01T09:00:00Z"
+
+
+def _payload() -> dict:
+    commands = [
+        {"op": "CREATE_ORDER", "data": {"order_id": "R001", "customer": "ACME"}},
+        {"op": "CREATE_ORDER", "data": {"order_id": "R002", "customer": "ACME", "vehicle": "ABC-123"}},
+        {"op": "ADD_SERVICE", "data": {"order_id": "R002"}},
+        {
+            "op": "ADD_SERVICE",
+            "data": {
+                "order_id": "R002",
+                "service": {"description": "Pads", "labor_estimated_cost": "abc", "components": []},
+            },
+        },
+        {
+            "op": "ADD_SERVICE",
+            "data": {
+                "order_id": "R002",
+                "service": {"description": "Pads", "labor_estimated_cost": "100.00", "components": []},
+            },
+        },
+        {"op": "SET_STATE_DIAGNOSED", "data": {}},
+        {"op": "SET_REAL_COST", "data": {"order_id": "R002", "service_index": 1}},
+        {"op": "SET_REAL_COST", "data": {"order_id": "R002", "service_index": 3, "real_cost": "90.00"}},
+        {"op": "SET_REAL_COST", "data": {"order_id": "R002", "service_index": 0, "real_cost": "90.00"}},
+        {"op": "SET_REAL_COST", "data": {"order_id": "R002", "service_index": "1", "real_cost": 90}},
+    ]
+    return {"commands": [dict(cmd, ts=TS) for cmd in commands]}
+
+
+@pytest.mark.parametrize("process", [process_payload, process_payload_fast])
+def test_malformed_commands_are_reported_and_the_rest_runs(process):
+    result = process(_payload(), make_service())
+
+    assert [(e["op"], e["order_id"], e["code"], e["message"]) for e in result["errors"]] == [
+        ("CREATE_ORDER", "R001", "INVALID_OPERATION", "El campo 'vehicle' es obligatorio en CREATE_ORDER."),
+        ("ADD_SERVICE", "R002", "INVALID_OPERATION", "El campo 'service' es obligatorio en ADD_SERVICE."),
+        (
+            "ADD_SERVICE",
+            "R002",
+            "INVALID_AMOUNT",
+            "El campo 'labor_estimated_cost' no es un monto válido en ADD_SERVICE.",
+        ),
+        ("SET_STATE_DIAGNOSED", "", "INVALID_OPERATION", "Falta 'order_id' en los datos del comando."),
+        ("SET_REAL_COST", "R002", "INVALID_OPERATION", "El campo 'real_cost' es obligatorio en SET_REAL_COST."),
+        ("SET_REAL_COST", "R002", "INVALID_OPERATION", "El servicio 3 no existe en la orden R002."),
+        ("SET_REAL_COST", "R002", "INVALID_OPERATION", "El servicio 0 no existe en la orden R002."),
+    ]
+    assert [order["order_id"] for order in result["orders"]] == ["R002"]
+    assert [event["type"] for event in result["events"]] == ["CREATED"]
+
+
+def test_exponent_and_huge_amounts_are_invalid_amounts():
+    cost = {"order_id": "R001", "service_index": 1}
+    service = {"description": "Pads", "labor_estimated_cost": "10.00", "components": []}
+    commands = [
+        {"op": "CREATE_ORDER", "data": {"order_id": "R001", "customer": "ACME", "vehicle": "ABC-123"}},
+        {"op": "ADD_SERVICE", "data": {"order_id": "R001", "service": service}},
+        {"op": "SET_REAL_COST", "data": dict(cost, real_cost="1e400")},
+        {"op": "SET_REAL_COST", "data": dict(cost, real_cost="1000000000000000")},
+        {"op": "SET_REAL_COST", "data": dict(cost, real_cost=1e300)},
+        {"op": "REAUTHORIZE", "data": {"order_id": "R001", "new_authorized_amount": "1e200000"}},
+        {
+            "op": "ADD_SERVICE",
+            "data": {
+                "order_id": "R001",
+                "service": dict(service, components=[{"description": "X", "estimated_cost": "2E5"}]),
+            },
+        },
+    ]
+    result = process_payload_fast({"commands": [dict(cmd, ts=TS) for cmd in commands]}, make_service())
+
+    assert [(e["op"], e["code"]) for e in result["errors"]] == [
+        ("SET_REAL_COST", "INVALID_AMOUNT"),
+        ("SET_REAL_COST", "INVALID_AMOUNT"),
+        ("SET_REAL_COST", "INVALID_AMOUNT"),
+        ("REAUTHORIZE", "INVALID_AMOUNT"),
+        ("ADD_SERVICE", "INVALID_AMOUNT"),
+    ]
+    assert result["errors"][0]["message"] == "El campo 'real_cost' no es un monto válido en SET_REAL_COST."
+    assert [(order["order_id"], order["real_total"]) for order in result["orders"]] == [("R001", 0.0)]
+
+
+def test_ndjson_stream_rejects_malformed_lines_only():
+    body = b"".join(json.dumps(cmd).encode() + b"\n" for cmd in _payload()["commands"])
+    lines = [json.loads(line) for line in process_ndjson([body], make_service())]
+
+    errors = [line["error"]["message"] for line in lines if "error" in line]
+    assert len(errors) == 7
+    assert [line["order"]["order_id"] for line in lines if "order" in line] == ["R002"]
+
+
+def test_ndjson_undecodable_line_is_reported_in_place():
+    commands = [
+        {"op": "SET_STATE_DIAGNOSED", "ts": TS, "data": {"order_id": "R404"}},
+        {"op": "CREATE_ORDER", "data": {"order_id": "R001"}},
+        {"op": "CANCEL", "ts": TS, "data": {"order_id": "R405", "reason": "x"}},
+    ]
+    body = b"".join(json.dumps(cmd).encode() + b"\n" for cmd in commands)
+    lines = [json.loads(line) for line in process_ndjson([body], make_service())]
+
+    assert [(line["error"]["op"], line["error"]["message"]) for line in lines] == [
+        ("SET_STATE_DIAGNOSED", "La orden R404 no existe."),
+        ("CREATE_ORDER", "Línea NDJSON inválida: se esperaba un comando con 'op', 'ts' y 'data'."),
+        ("CANCEL", "La orden R405 no existe."),
+    ]
+
+
+@pytest.mark.parametrize("process", [process_payload, process_payload_fast])
+def test_rejections_keep_their_place_in_the_batch(process):
+    commands = [
+        {"op": "SET_STATE_DIAGNOSED", "data": {"order_id": "R404"}},
+        {"op": "CREATE_ORDER", "data": {"order_id": "R001", "customer": "ACME"}},
+        {"op": "CANCEL", "data": {"order_id": "R405", "reason": "x"}},
+    ]
+    result = process({"commands": [dict(cmd, ts=TS) for cmd in commands]}, make_service())
+
+    assert [(e["op"], e["message"]) for e in result["errors"]] == [
+        ("SET_STATE_DIAGNOSED", "La orden R404 no existe."),
+        ("CREATE_ORDER", "El campo 'vehicle' es obligatorio en CREATE_ORDER."),
+        ("CANCEL", "La orden R405 no existe."),
+    ]
+
+
+@pytest.mark.parametrize("process", [process_payload, process_payload_fast])
+def test_order_checks_take_precedence_over_field_validation(process):
+    commands = [
+        {"op": "CREATE_ORDER", "data": {"order_id": "R001", "customer": "ACME", "vehicle": "ABC-123"}},
+        {"op": "CANCEL", "data": {"order_id": "R001", "reason": "Cliente desiste"}},
+        {"op": "REAUTHORIZE", "data": {"order_id": "R001"}},
+        {"op": "REAUTHORIZE", "data": {"order_id": "R404"}},
+    ]
+    result = process({"commands": [dict(cmd, ts=TS) for cmd in commands]}, make_service())
+
+    assert [(e["order_id"], e["code"], e["message"]) for e in result["errors"]] == [
+        ("R001", "ORDER_CANCELLED", "La orden R001 está CANCELLED."),
+        ("R404", "INVALID_OPERATION", "La orden R404 no existe."),
+    ]
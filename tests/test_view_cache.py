@@ -0,0 +1,71 @@
+from app.application.orders_service import OrderService
+from app.application.view_cache import ViewCache
+from app.domain.entities import Event, OrderStatus, RepairOrder
+from app.drivers.json_controller import event_to_dict, order_to_dict, process_payload_fast, render_json
+from app.infrastructure.in_memory_repos import InMemoryEventRepository, InMemoryOrderRepository
+from app.infrastructure.sqlite_repos import SqliteDatabase, SqliteOrderRepository
+from tests.helpers import make_service
+
+
+def _cached_service(max_bytes: int = 1 << 20) -> OrderService:
+    return OrderService(
+        orders_repo=InMemoryOrderRepository(),
+        events_repo=InMemoryEventRepository(),
+        view_cache=ViewCache(order_to_dict, event_to_dict, max_bytes=max_bytes),
+    )
+
+
+def test_cached_views_match_uncached_and_follow_versions(payload):
+    cached, plain = _cached_service(), make_service()
+    # A rejected command for R001 (waiting for approval), then a change for R002.
+    retries = [
+        {"op": "AUTHORIZE", "ts": "2025-03-01T10:00:00Z", "data": {"order_id": "R001"}},
+        {"op": "DELIVER", "ts": "2025-03-01T10:01:00Z", "data": {"order_id": "R002"}},
+    ]
+
+    for batch in (payload, {"commands": retries}, {"commands": retries}):
+        misses = cached.view_cache.misses
+        result = process_payload_fast(batch, cached)
+        assert render_json(result) == render_json(process_payload_fast(batch, plain))
+
+    # The last batch changed nothing, so all its orders came from the cache.
+    assert cached.view_cache.misses == misses
+    assert [o["status"] for o in result["orders"]] == ["WAITING_FOR_APPROVAL", "DELIVERED"]
+
+
+def test_dry_run_bypasses_the_cache(payload):
+    service = _cached_service()
+    create = {"commands": payload["commands"][:1]}
+    process_payload_fast(create, service)
+    hits, misses = service.view_cache.hits, service.view_cache.misses
+    dry_batch = {"commands": [{"op": "CANCEL", "ts": "2025-03-01T10:00:00Z", "data": {"order_id": "R001"}}]}
+
+    dry = process_payload_fast(dry_batch, service, dry_run=True)
+    # Rejected (the order exists), so R001 is unchanged and served from the cache.
+    real = process_payload_fast(create, service)
+
+    assert dry["orders"][0]["status"] == "CANCELLED"
+    assert real["orders"][0]["status"] == "CREATED"
+    assert (service.view_cache.hits, service.view_cache.misses) == (hits + 1, misses)
+
+
+def test_cache_stays_within_its_byte_budget():
+    cache = ViewCache(order_to_dict, event_to_dict, max_bytes=4096)
+
+    for i in range(200):
+        order = RepairOrder(order_id=f"R{i:03d}", customer="ACME", vehicle="ABC-123")
+        cache.order_view(order)
+        cache.event_view(Event(order_id=order.order_id, type=OrderStatus.CREATED))
+
+    assert 0 < cache.size_bytes <= 4096
+    assert 0 < len(cache) < 200
+
+
+def test_commit_bumps_persisted_version(tmp_path, payload):
+    database = SqliteDatabase(str(tmp_path / "orders.db"))
+    service = OrderService(SqliteOrderRepository(database), InMemoryEventRepository(), transaction=database)
+
+    process_payload_fast({"commands": payload["commands"][:3]}, service)
+
+    # CREATE_ORDER, ADD_SERVICE and SET_STATE_DIAGNOSED in a single commit.
+    assert SqliteOrderRepository(database).get_by_id("R001").version == 1